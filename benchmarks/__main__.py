@@ -0,0 +1,101 @@
+# Python imports
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+
+# Internal imports
+from benchmarks.suite import BENCHMARKS, FOOTPRINTS, compare, run, run_footprints
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark dictdeeper.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("pattern", nargs="?", default="*", help="Only run the benchmarks matching this glob.")
+    run_parser.add_argument("--scale", type=float, default=1.0, help="Multiply the size of the data by this.")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Number of timed loops of each benchmark.")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds of each timed loop.")
+    run_parser.add_argument("--save", metavar="PATH", help="Save the results as JSON to this file.")
+    run_parser.add_argument("--baseline", metavar="PATH", help="Compare the results with the ones in this file.")
+    run_parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown ratio flagged as a regression.")
+
+    compare_parser = commands.add_parser("compare", help="Compare saved results.")
+    compare_parser.add_argument("baseline", help="Results to compare with.")
+    compare_parser.add_argument("current", help="Results to compare.")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown ratio flagged as a regression.")
+
+    memory_parser = commands.add_parser("memory", help="Measure the memory held by the memory benchmarks.")
+    memory_parser.add_argument("pattern", nargs="?", default="*", help="Only run the benchmarks matching this glob.")
+    memory_parser.add_argument("--scale", type=float, default=1.0, help="Multiply the size of the data by this.")
+
+    commands.add_parser("list", help="List the benchmarks.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join([*BENCHMARKS, *FOOTPRINTS]))
+        return 0
+
+    if args.command == "memory":
+        run_footprints(args.pattern, args.scale, report=report_footprint)
+        return 0
+
+    if args.command == "compare":
+        return report_comparison(load(args.baseline), load(args.current), args.threshold)
+
+    results = run(args.pattern, args.scale, args.repeat, args.min_time, report=report)
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "scale": args.scale,
+        "benchmarks": results,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.baseline:
+        return report_comparison(load(args.baseline), document, args.threshold)
+    return 0
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def report(name, result):
+    print(f"{name:<40} {format_seconds(result['best']):>10} (median {format_seconds(result['median'])})")
+
+
+def report_footprint(name, size):
+    print(f"{name:<40} {size / 1024:>10.1f} KiB")
+
+
+def report_comparison(baseline, current, threshold):
+    if baseline.get("scale") != current.get("scale"):
+        print(f"Warning: comparing results at scale {baseline.get('scale')} and {current.get('scale')}.")
+
+    rows = compare(baseline["benchmarks"], current["benchmarks"], threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = "REGRESSED" if regressed else ""
+        print(f"{name:<40} {format_seconds(before):>10} {format_seconds(after):>10} {ratio:>7.2f}x {flag}")
+
+    regressions = sum(regressed for *_, regressed in rows)
+    print(f"{regressions} of {len(rows)} benchmarks regressed by more than {threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+def format_seconds(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return f"{seconds * factor:.2f}{unit}"
+    return f"{seconds * 1e9:.0f}ns"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
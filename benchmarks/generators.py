@@ -0,0 +1,70 @@
+# Python imports
+import random
+from datetime import datetime, timedelta
+
+
+# Every generator is seeded, so every run of a benchmark works on exactly the same data.
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet")
+EPOCH = datetime(2024, 1, 1)
+
+
+def wide(width=1000, seed=0):
+    """A flat dict with `width` keys of mixed scalar values."""
+    rng = random.Random(seed)
+    return {f"key{i}": _scalar(rng) for i in range(width)}
+
+
+def deep(depth=50, seed=0):
+    """A chain of `depth` nested dicts, each with a few scalar siblings, and the dotted key of the innermost value."""
+    rng = random.Random(seed)
+    doc = node = {}
+    parts = []
+    for i in range(depth):
+        part = f"level{i}"
+        parts.append(part)
+        node.update({f"sibling{j}": _scalar(rng) for j in range(3)})
+        node[part] = {}
+        node = node[part]
+    node["leaf"] = "value"
+    return doc, ".".join(parts + ["leaf"])
+
+
+def long_list(length=1000, seed=0):
+    """A list of `length` flat records with a unique `id`, as returned by most APIs."""
+    rng = random.Random(seed)
+    return [_record(rng, i) for i in range(length)]
+
+
+def mixed(items=100, seed=0):
+    """A document mixing nesting, lists of records, lists of scalars and date strings."""
+    rng = random.Random(seed)
+    return {
+        "id": rng.randrange(10**6),
+        "data": {
+            "attributes": {
+                "name": rng.choice(WORDS),
+                "tags": [rng.choice(WORDS) for _ in range(10)],
+                "created": _date(rng).isoformat(),
+            },
+            "items": [dict(_record(rng, i), meta={"sku": f"sku-{i}", "dims": [i, i + 1, i + 2]}) for i in range(items)],
+        },
+        "links": {word: f"https://example.com/{word}" for word in WORDS},
+    }
+
+
+def _record(rng, i):
+    return {
+        "id": i,
+        "name": rng.choice(WORDS),
+        "price": round(rng.uniform(0, 1000), 2),
+        "active": rng.random() < 0.5,
+        "created": _date(rng).isoformat(),
+    }
+
+
+def _scalar(rng):
+    return rng.choice((rng.randrange(10**6), rng.random(), rng.choice(WORDS), rng.random() < 0.5, None))
+
+
+def _date(rng):
+    return EPOCH + timedelta(seconds=rng.randrange(365 * 24 * 3600))
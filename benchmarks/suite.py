@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+# Python imports
+import copy
+import json
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from fnmatch import fnmatch
+from statistics import median
+
+# Internal imports
+from benchmarks import generators
+from dictdeeper import (
+    CombineLists,
+    CompactDeepDict,
+    DeepDict,
+    DeepMerger,
+    FrozenDeepDict,
+    MergeDicts,
+    MergeListOfDictsByPosition,
+    MergeListsOfDictsByKey,
+    compile_key,
+)
+from dictdeeper.core import Traversor
+from dictdeeper.matcher import DictMatcher, ListMatcher
+
+
+BENCHMARKS = {}
+FOOTPRINTS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark under `name`.
+
+    The decorated function gets a `scale` multiplier for the size of its data, sets it up, and returns the
+    function that is timed.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def run(pattern="*", scale=1.0, repeat=5, min_time=0.2, report=None):
+    """
+    Time every benchmark with a name matching `pattern`, and return the seconds per call for each of them.
+
+    Each benchmark is called in a loop long enough to take at least `min_time` seconds, `repeat` times, and the
+    fastest and median loops are reported.
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if not fnmatch(name, pattern):
+            continue
+        results[name] = result = measure(setup(scale), repeat, min_time)
+        if report is not None:
+            report(name, result)
+    return results
+
+
+def measure(fn, repeat=5, min_time=0.2):
+    loops = 1
+    while True:
+        elapsed = _time(fn, loops)
+        if elapsed >= min_time or loops >= 10**7:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed] + [_time(fn, loops) for _ in range(repeat - 1)]
+    return {"best": min(timings) / loops, "median": median(timings) / loops, "loops": loops, "repeat": repeat}
+
+
+def _time(fn, loops):
+    started = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter() - started
+
+
+def footprint(name):
+    """
+    Register a memory benchmark under `name`.
+
+    The decorated function gets a `scale` multiplier for the size of its data, and returns the function whose
+    result is measured.
+    """
+
+    def register(setup):
+        FOOTPRINTS[name] = setup
+        return setup
+
+    return register
+
+
+def run_footprints(pattern="*", scale=1.0, report=None):
+    """Return the bytes allocated by every memory benchmark with a name matching `pattern`, and still in use."""
+    results = {}
+    for name, setup in FOOTPRINTS.items():
+        if not fnmatch(name, pattern):
+            continue
+        results[name] = result = measure_footprint(setup(scale))
+        if report is not None:
+            report(name, result)
+    return results
+
+
+def measure_footprint(fn):
+    tracemalloc.start()
+    try:
+        return _traced(fn())
+    finally:
+        tracemalloc.stop()
+
+
+def _traced(value):
+    # `value` is still referenced while it's measured.
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _scaled(size, scale):
+    return max(1, int(size * scale))
+
+
+@benchmark("traversal.getitem.deep")
+def _(scale):
+    doc, key = generators.deep(_scaled(50, scale))
+    traversor = Traversor(doc)
+    return lambda: traversor[key]
+
+
+@benchmark("traversal.getitem.deep.compiled")
+def _(scale):
+    doc, key = generators.deep(_scaled(50, scale))
+    traversor = Traversor(doc)
+    key = compile_key(key)
+    return lambda: traversor[key]
+
+
+@benchmark("traversal.getitem.long_list")
+def _(scale):
+    length = _scaled(1000, scale)
+    traversor = Traversor({"items": generators.long_list(length)})
+    key = f"items.{length - 1}.name"
+    return lambda: traversor[key]
+
+
+@benchmark("traversal.filter.long_list")
+def _(scale):
+    length = _scaled(1000, scale)
+    data = DeepDict({"items": generators.long_list(length)})
+    key = f"items[id={length - 1}].name"
+    return lambda: data[key]
+
+
+@benchmark("traversal.filter.long_list.indexed")
+def _(scale):
+    length = _scaled(1000, scale)
+    data = DeepDict({"items": generators.long_list(length)}, reuse=True)
+    data["items"].index_by("id", unique=True)
+    key = f"items[id={length - 1}].name"
+    return lambda: data[key]
+
+
+@benchmark("traversal.get_many.mixed")
+def _(scale):
+    data = DeepDict(generators.mixed(_scaled(100, scale)))
+    keys = ["id", "data.attributes.name", "data.attributes.created", "data.items.0.id", "data.items.-1.meta.sku"]
+    return lambda: data.get_many(keys)
+
+
+def _siblings(scale, path_cache):
+    doc, key = generators.deep(_scaled(20, scale))
+    parent = key.rsplit(".", 2)[0]
+    data = DeepDict(doc, path_cache=path_cache)
+    keys = [key] + [f"{parent}.sibling{i}" for i in range(3)]
+    return lambda: [data.get(key) for key in keys]
+
+
+@benchmark("deepdict.get.siblings")
+def _(scale):
+    return _siblings(scale, path_cache=0)
+
+
+@benchmark("deepdict.get.siblings.path_cache")
+def _(scale):
+    return _siblings(scale, path_cache=64)
+
+
+@benchmark("deepdict.items.wide")
+def _(scale):
+    data = DeepDict(generators.wide(_scaled(1000, scale)))
+    return lambda: list(data.items())
+
+
+@benchmark("deepdict.items.mixed")
+def _(scale):
+    items = [DeepDict(item) for item in generators.mixed(_scaled(100, scale))["data"]["items"]]
+    return lambda: [list(item.items()) for item in items]
+
+
+@benchmark("matcher.dict.wide")
+def _(scale):
+    doc = generators.wide(_scaled(1000, scale))
+    spec = copy.deepcopy(doc)
+    return lambda: DictMatcher(doc).matches(spec)
+
+
+@benchmark("matcher.list.ordered")
+def _(scale):
+    items = generators.long_list(_scaled(1000, scale))
+    spec = copy.deepcopy(items)
+    return lambda: ListMatcher(items).matches(spec)
+
+
+@benchmark("matcher.list.unordered")
+def _(scale):
+    items = generators.long_list(_scaled(200, scale))
+    spec = [{"id": item["id"], ...: ...} for item in reversed(items)] + [...]
+    return lambda: ListMatcher(items).matches(spec)
+
+
+@benchmark("matcher.list.unordered.scalars")
+def _(scale):
+    items = list(range(_scaled(1000, scale)))
+    spec = list(reversed(items)) + [...]
+    return lambda: ListMatcher(items).matches(spec)
+
+
+@benchmark("matcher.regex")
+def _(scale):
+    items = generators.long_list(_scaled(1000, scale))
+    spec = [{"name": re.compile("[a-z]+"), "created": re.compile(r"\d{4}-\d{2}-\d{2}T"), ...: ...}] * len(items)
+    return lambda: ListMatcher(items).matches(spec)
+
+
+@benchmark("matcher.datetime")
+def _(scale):
+    items = generators.long_list(_scaled(200, scale))
+    spec = [{"created": generators.EPOCH + timedelta(days=1), ...: ...} for _ in items]
+    matcher = ListMatcher([{"created": (generators.EPOCH + timedelta(days=1)).isoformat()} for _ in items])
+    return lambda: matcher.matches(spec)
+
+
+def _merge(strategies, a, b, mode=DeepMerger.COPY):
+    merger = DeepMerger(strategies, mode=mode)
+    return lambda: merger(a, b)
+
+
+@benchmark("merger.dicts.mixed")
+def _(scale):
+    a = generators.mixed(_scaled(100, scale), seed=1)
+    b = generators.mixed(_scaled(100, scale), seed=2)
+    return _merge([MergeDicts()], a, b)
+
+
+@benchmark("merger.dicts.mixed.share")
+def _(scale):
+    a = generators.mixed(_scaled(100, scale), seed=1)
+    b = {"data": {"attributes": {"name": "zulu"}}}
+    return _merge([MergeDicts()], a, b, mode=DeepMerger.SHARE)
+
+
+@benchmark("merger.dicts.wide")
+def _(scale):
+    a = {"doc": generators.wide(_scaled(1000, scale), seed=1)}
+    b = {"doc": generators.wide(_scaled(1000, scale), seed=2)}
+    return _merge([MergeDicts()], a, b)
+
+
+@benchmark("merger.lists_by_position")
+def _(scale):
+    a = {"items": generators.long_list(_scaled(1000, scale), seed=1)}
+    b = {"items": generators.long_list(_scaled(1000, scale), seed=2)}
+    return _merge([MergeListOfDictsByPosition(), MergeDicts()], a, b)
+
+
+@benchmark("merger.lists_by_key")
+def _(scale):
+    a = {"items": generators.long_list(_scaled(1000, scale), seed=1)}
+    b = {"items": list(reversed(generators.long_list(_scaled(1000, scale), seed=2)))}
+    return _merge([MergeListsOfDictsByKey(key=lambda idx, d: d["id"]), MergeDicts()], a, b)
+
+
+@benchmark("merger.lists_by_key.path")
+def _(scale):
+    a = {"items": generators.long_list(_scaled(1000, scale), seed=1)}
+    b = {"items": list(reversed(generators.long_list(_scaled(1000, scale), seed=2)))}
+    return _merge([MergeListsOfDictsByKey("id"), MergeDicts()], a, b)
+
+
+@benchmark("merger.combine_lists")
+def _(scale):
+    a = {"items": generators.long_list(_scaled(1000, scale), seed=1)}
+    b = {"items": generators.long_list(_scaled(1000, scale), seed=2)}
+    return _merge([CombineLists(), MergeDicts()], a, b)
+
+
+@benchmark("merger.merge_all.mixed")
+def _(scale):
+    docs = [generators.mixed(_scaled(10, scale), seed=seed) for seed in range(20)]
+    merger = DeepMerger([CombineLists(), MergeDicts()])
+    return lambda: merger.merge_all(docs)
+
+
+@benchmark("frozen.hash.json")
+def _(scale):
+    # Hashing canonical JSON, as the baseline for hashing frozen documents.
+    doc = generators.mixed(_scaled(100, scale))
+    return lambda: hash(json.dumps(doc, sort_keys=True))
+
+
+@benchmark("frozen.hash.mixed")
+def _(scale):
+    doc = generators.mixed(_scaled(100, scale))
+    return lambda: hash(FrozenDeepDict(doc))
+
+
+@benchmark("frozen.hash.derived")
+def _(scale):
+    frozen = FrozenDeepDict(generators.mixed(_scaled(100, scale)))
+    hash(frozen)
+    return lambda: hash(frozen.set("data.attributes.name", "zulu"))
+
+
+def _documents(scale):
+    # Many small documents, as kept in memory by a cache or a queue consumer.
+    return [json.dumps(generators.mixed(3, seed=seed)) for seed in range(_scaled(1000, scale))]
+
+
+def _lookups(wrap, scale):
+    data = wrap(generators.mixed(_scaled(100, scale)))
+    keys = ["id", "data.attributes.name", "data.items.-1.meta.sku", "data.items.*.id", "links.echo"]
+    return lambda: [data[key] for key in keys]
+
+
+@benchmark("compact.getitem.dict")
+def _(scale):
+    # Looking up the same keys in a `DeepDict`, as the baseline for lookups in a compact one.
+    return _lookups(DeepDict, scale)
+
+
+@benchmark("compact.getitem.compact")
+def _(scale):
+    return _lookups(CompactDeepDict, scale)
+
+
+@benchmark("compact.from_json.dict")
+def _(scale):
+    body = json.dumps(generators.mixed(_scaled(100, scale)))
+    return lambda: DeepDict.from_json(body)
+
+
+@benchmark("compact.from_json.compact")
+def _(scale):
+    body = json.dumps(generators.mixed(_scaled(100, scale)))
+    return lambda: DeepDict.from_json(body, compact=True)
+
+
+@footprint("compact.memory.json")
+def _(scale):
+    # The raw JSON, as the baseline for holding the same documents decoded.
+    documents = _documents(scale)
+    return lambda: [document.encode() for document in documents]
+
+
+@footprint("compact.memory.dict")
+def _(scale):
+    documents = _documents(scale)
+    return lambda: [json.loads(document) for document in documents]
+
+
+@footprint("compact.memory.compact")
+def _(scale):
+    documents = _documents(scale)
+    return lambda: [CompactDeepDict(document) for document in documents]
+
+
+def _python(code):
+    # Imports are cached by the interpreter, so each run needs a new one. `import.python` times the startup alone.
+    command = [sys.executable, "-c", code]
+    return lambda: subprocess.run(command, check=True)
+
+
+@benchmark("import.python")
+def _(scale):
+    return _python("pass")
+
+
+@benchmark("import.dictdeeper")
+def _(scale):
+    return _python("import dictdeeper")
+
+
+@benchmark("import.dictdeeper.deepdict")
+def _(scale):
+    return _python("from dictdeeper import DeepDict; DeepDict({'a': 1}) == {'a': ...}")
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare the `best` timings of `current` results with the ones of `baseline`.
+
+    Return `(name, baseline, current, ratio, regressed)` rows for the benchmarks found in both, where `regressed`
+    is True when `current` is slower than `baseline` by more than `threshold`.
+    """
+    rows = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["best"], result["best"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
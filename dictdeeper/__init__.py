@@ -1,9 +1,43 @@
-from dictdeeper.core import DeepDict, DeepFactory, DeepList  # noqa
+# Python imports
+from importlib import import_module
+
+# Internal imports
+from dictdeeper import exceptions
 from dictdeeper.exceptions import *  # noqa
-from dictdeeper.merger import (  # noqa
-    CombineLists,
-    DeepMerger,
-    MergeDicts,
-    MergeListOfDictsByPosition,
-    MergeListsOfDictsByKey,
-)
+
+
+# The public names are imported from their modules the first time they are used, so `import dictdeeper` stays cheap.
+_LAZY = {
+    "dictdeeper.compact": ("CompactDeepDict", "CompactDeepList"),
+    "dictdeeper.core": ("CompiledKey", "DeepDict", "DeepFactory", "DeepList", "Extractor", "Index", "compile_key"),
+    "dictdeeper.fingerprints": ("Fingerprints", "fingerprint"),
+    "dictdeeper.frozen": ("FrozenDeepDict", "FrozenDeepList"),
+    "dictdeeper.matcher": ("MatchResult", "match_many"),
+    "dictdeeper.merger": (
+        "CombineLists",
+        "DeepMerger",
+        "MergeDicts",
+        "MergeListOfDictsByPosition",
+        "MergeListsOfDictsByKey",
+    ),
+    "dictdeeper.patch": ("Operation", "apply_patch", "diff"),
+    "dictdeeper.spec": ("CompiledSpec", "compile_spec", "register_comparator"),
+}
+_MODULES = {name: module for module, names in _LAZY.items() for name in names}
+
+__all__ = [name for name in vars(exceptions) if not name.startswith("_")] + list(_MODULES)
+
+
+def __getattr__(name):
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -0,0 +1,43 @@
+# Python imports
+import argparse
+import json
+import sys
+
+# Internal imports
+from dictdeeper.query import DEFAULT_CHUNK_SIZE, QueryStats, query_jsonl
+
+
+def partial_spec(spec):
+    """Turn a JSON spec into a matcher spec where objects may have other keys than the ones given."""
+    if isinstance(spec, dict):
+        return {**{key: partial_spec(value) for key, value in spec.items()}, ...: ...}
+    if isinstance(spec, list):
+        return [partial_spec(value) for value in spec]
+    return spec
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m dictdeeper",
+        description="Print the values of dotted keys for each line of a JSON Lines file, as JSON lines.",
+    )
+    parser.add_argument("path", help="JSON Lines file to read.")
+    parser.add_argument("keys", nargs="+", help="Dotted keys to extract from each line.")
+    parser.add_argument("--match", type=json.loads, help="JSON spec the lines must match, objects may have more keys.")
+    parser.add_argument("--default", type=json.loads, default=None, help="JSON value for missing keys.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes, one per CPU by default.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Bytes read by a worker at once.")
+    parser.add_argument("--quiet", action="store_true", help="Don't report throughput on stderr.")
+    args = parser.parse_args(argv)
+
+    stats = QueryStats()
+    spec = None if args.match is None else partial_spec(args.match)
+    rows = query_jsonl(args.path, args.keys, spec, args.default, args.workers, args.chunk_size, stats)
+    for row in rows:
+        print(json.dumps(row))
+    if not args.quiet:
+        print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
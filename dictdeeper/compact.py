@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+# Python imports
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+
+# Internal imports
+from dictdeeper.core import _EVERY, Traversor, compile_key
+from dictdeeper.exceptions import DeepDictIndexError, DeepDictKeyError, DeepDictValueError
+from dictdeeper.matcher import DictMatcher, ListMatcher
+from dictdeeper.spec import CompiledSpec
+
+
+_OBJECT, _ARRAY, _STRING, _INT, _FLOAT, _TRUE, _FALSE, _NULL, _BIG_INT = range(9)
+_CONSTANTS = {_TRUE: True, _FALSE: False, _NULL: None}
+
+_INT64 = struct.Struct("q")
+_DOUBLE = struct.Struct("d")
+_INT64_RANGE = range(-(2**63), 2**63)
+
+_MISSING = object()
+
+
+class _Builder:
+    """Lay a decoded JSON value out on a tape, children after their parent."""
+
+    def __init__(self):
+        self.kinds = bytearray()
+        self.words = []
+        self.links = []
+        self.containers = []
+        self.keys = {}
+        self.strings = bytearray()
+        self.string_words = {}
+
+    def add(self, value):
+        node = len(self.kinds)
+        value_type = type(value)
+        if value_type is str:
+            self.kinds.append(_STRING)
+            self.words.append(self.string(value))
+        elif value_type is bool:
+            self.kinds.append(_TRUE if value else _FALSE)
+            self.words.append(0)
+        elif value_type is int:
+            if value in _INT64_RANGE:
+                self.kinds.append(_INT)
+                self.words.append(value)
+            else:
+                self.kinds.append(_BIG_INT)
+                self.words.append(self.string(str(value)))
+        elif value_type is float:
+            self.kinds.append(_FLOAT)
+            self.words.append(_INT64.unpack(_DOUBLE.pack(value))[0])
+        elif value is None:
+            self.kinds.append(_NULL)
+            self.words.append(0)
+        elif isinstance(value, dict):
+            self.kinds.append(_OBJECT)
+            self.words.append(0)
+            keys = [self.key(key) for key in value]
+            children = [self.add(item) for item in value.values()]
+            self.link(node, keys + children)
+        elif isinstance(value, (list, tuple)):
+            self.kinds.append(_ARRAY)
+            self.words.append(0)
+            self.link(node, [self.add(item) for item in value])
+        else:
+            raise TypeError(f"Can't store a value of type {value_type.__name__} in a compact document.")
+        return node
+
+    def link(self, node, links):
+        # Children are laid out after their parent, so its links are only known once they are, and go at the end.
+        self.containers.append(node)
+        self.words[node] = len(self.links)
+        self.links.append(len(links) // 2 if self.kinds[node] == _OBJECT else len(links))
+        self.links.extend(links)
+
+    def key(self, key):
+        if type(key) is not str:
+            raise TypeError(f"Can't store a key of type {type(key).__name__} in a compact document.")
+        return self.keys.setdefault(key, len(self.keys))
+
+    def string(self, value):
+        try:
+            return self.string_words[value]
+        except KeyError:
+            pass
+        data = value.encode("utf-8", "surrogatepass")
+        word = self.string_words[value] = len(self.strings) << 32 | len(data)
+        self.strings += data
+        return word
+
+    def build(self):
+        # Keys are numbered in sorted order, and the fields of each object sorted by key number, so that looking
+        # a key up bisects both.
+        keys = sorted(self.keys)
+        numbers = [0] * len(keys)
+        for number, key in enumerate(keys):
+            numbers[self.keys[key]] = number
+
+        size = len(self.kinds)
+        links = self.links
+        for node in self.containers:
+            start = self.words[node] + 1
+            count = links[start - 1]
+            if self.kinds[node] == _OBJECT and count:
+                middle, end = start + count, start + 2 * count
+                fields = sorted(zip([numbers[number] for number in links[start:middle]], links[middle:end]))
+                links[start:middle], links[middle:end] = zip(*fields)
+            self.words[node] += size
+        return _Tape(
+            bytes(self.kinds),
+            array("q", self.words + links),
+            tuple(sys.intern(key) for key in keys),
+            bytes(self.strings),
+        )
+
+
+class _Tape:
+    """
+    A JSON value laid out as flat arrays, without a Python object for any of the values it holds.
+
+    Each node has a kind in `kinds` and a word in `words`. The word of a scalar is the scalar itself, or where
+    its UTF-8 bytes are in `strings`, and the word of an object or array is where its links are in `words`: the
+    number of its children, then, for an object, the number of each key in `keys`, then the node of each child.
+    Keys and strings are stored once per tape, and keys are interned, so they are shared by every tape.
+
+    `keys` is sorted, and the fields of an object are sorted by key number, so keys are looked up by bisection.
+    Children are laid out in the order of the document, so sorting the fields by node gives that order back.
+    """
+
+    __slots__ = ("kinds", "words", "keys", "strings")
+
+    def __init__(self, kinds, words, keys, strings):
+        self.kinds = kinds
+        self.words = words
+        self.keys = keys
+        self.strings = strings
+
+    @classmethod
+    def encode(cls, value):
+        builder = _Builder()
+        builder.add(value)
+        return builder.build()
+
+    def string(self, word):
+        start = word >> 32
+        end = start + (word & 0xFFFFFFFF)
+        return self.strings[start:end].decode("utf-8", "surrogatepass")
+
+    def links(self, node):
+        """Return where the links of the object or array `node` start in `words`, and how many children it has."""
+        links = self.words[node]
+        return links + 1, self.words[links]
+
+    def number(self, key):
+        """Return the number of `key` in `keys`, or -1 when no object of the tape has it."""
+        keys = self.keys
+        number = bisect_left(keys, key)
+        return number if number < len(keys) and keys[number] == key else -1
+
+    def fields(self, node):
+        """Return the `(child, key number)` pairs of the object `node`, in the order of the document."""
+        start, count = self.links(node)
+        middle, end = start + count, start + 2 * count
+        return sorted(zip(self.words[middle:end], self.words[start:middle]))
+
+    def children(self, node):
+        start, count = self.links(node)
+        if self.kinds[node] == _OBJECT:
+            start += count
+        end = start + count
+        children = self.words[start:end]
+        return sorted(children) if self.kinds[node] == _OBJECT else children
+
+    def object_keys(self, node):
+        keys = self.keys
+        return [keys[number] for _, number in self.fields(node)]
+
+    def field(self, node, key):
+        """Return the node of the value at `key` of the object `node`, or -1 when it has none."""
+        number = self.number(key)
+        if number < 0:
+            return -1
+        return self._field(node, number)
+
+    def _field(self, node, number):
+        words = self.words
+        start, count = self.links(node)
+        end = start + count
+        position = bisect_left(words, number, start, end)
+        if position == end or words[position] != number:
+            return -1
+        return words[position + count]
+
+    def select(self, nodes, part, index):
+        """Return the nodes of the values at `part` of each of `nodes`, skipping those without one."""
+        kinds = self.kinds
+        number = self.number(part)
+        selected = []
+        for node in nodes:
+            kind = kinds[node]
+            if kind == _OBJECT and number >= 0:
+                node = self._field(node, number)
+                if node >= 0:
+                    selected.append(node)
+            elif kind == _ARRAY and index is not None:
+                node = self.item(node, index)
+                if node >= 0:
+                    selected.append(node)
+        return selected
+
+    def item(self, node, index):
+        """Return the node of the item at `index` of the array `node`, or -1 when it has none."""
+        start, count = self.links(node)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            return -1
+        return self.words[start + index]
+
+    def size(self, node):
+        return self.links(node)[1]
+
+    def decode(self, node):
+        """Return the value of `node`, as plain dicts, lists and scalars."""
+        kind = self.kinds[node]
+        if kind == _OBJECT:
+            keys = self.keys
+            return {keys[number]: self.decode(child) for child, number in self.fields(node)}
+        if kind == _ARRAY:
+            return [self.decode(child) for child in self.children(node)]
+        if kind == _STRING:
+            return self.string(self.words[node])
+        if kind == _INT:
+            return self.words[node]
+        if kind == _FLOAT:
+            return _DOUBLE.unpack(_INT64.pack(self.words[node]))[0]
+        if kind == _BIG_INT:
+            return int(self.string(self.words[node]))
+        return _CONSTANTS[kind]
+
+
+def CompactFactory(tape: _Tape, node):  # noqa
+    kind = tape.kinds[node]
+    if kind == _OBJECT:
+        return CompactDeepDict(tape, node)
+    if kind == _ARRAY:
+        return CompactDeepList(tape, node)
+    return tape.decode(node)
+
+
+class _ObjectView(Mapping):
+    """
+    The values of an object on a tape, decoded as they are looked up, for specs to match.
+
+    Objects within it are views too, so a partial spec only decodes the values it names.
+    """
+
+    __slots__ = ("tape", "node")
+
+    def __init__(self, tape, node):
+        self.tape = tape
+        self.node = node
+
+    def __repr__(self):
+        return repr(self.tape.decode(self.node))
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        node = self.tape.field(self.node, key) if type(key) is str else -1
+        if node < 0:
+            return default
+        return _ObjectView(self.tape, node) if self.tape.kinds[node] == _OBJECT else self.tape.decode(node)
+
+    def __contains__(self, key):
+        return type(key) is str and self.tape.field(self.node, key) >= 0
+
+    def __iter__(self):
+        return iter(self.tape.object_keys(self.node))
+
+    def __len__(self):
+        return self.tape.size(self.node)
+
+
+class _CompactValue:
+    __slots__ = ("tape", "node")
+
+    _kind = None
+
+    def __init__(self, data, node=0):
+        """Wrap the JSON in `data`, given as text or bytes, or the dicts and lists of an already decoded value."""
+        if isinstance(data, _Tape):
+            self.tape = data
+        else:
+            if isinstance(data, (str, bytes, bytearray, memoryview)):
+                data = json.loads(bytes(data) if isinstance(data, memoryview) else data)
+            self.tape = _Tape.encode(getattr(data, "wrapped_obj", data))
+        self.node = node
+        if self.tape.kinds[node] != self._kind:
+            raise ValueError(f"{self.__class__.__name__} can only wrap a JSON {self._name}.")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.wrapped_obj!r})"
+
+    @property
+    def wrapped_obj(self):
+        """The fully decoded value, decoded again on every access, so it isn't kept alongside the tape."""
+        return self.tape.decode(self.node)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_many(self, keys, default=None):
+        return [self.get(key, default) for key in keys]
+
+    def _resolve(self, key):
+        key = compile_key(key)
+        if not key.wildcard:
+            return CompactFactory(self.tape, self._walk(key, len(key.parts)))
+
+        node = self._walk(key, key.first)
+        if self.tape.kinds[node] not in (_OBJECT, _ARRAY):
+            raise DeepDictValueError(key.key_at(key.first))
+        return self._expand(node, key)
+
+    def _walk(self, key, stop):
+        tape = self.tape
+        node = self.node
+        for position, (part, index) in enumerate(zip(key.parts[:stop], key.indexes[:stop])):
+            kind = tape.kinds[node]
+            if kind == _OBJECT:
+                node = tape.field(node, part)
+                if node < 0:
+                    raise DeepDictKeyError(key.key_at(position))
+            elif kind == _ARRAY:
+                node = tape.item(node, int(part) if index is None else index)
+                if node < 0:
+                    raise DeepDictIndexError(key.key_at(position))
+            else:
+                raise DeepDictValueError(key.key_at(position))
+
+        return node
+
+    def _expand(self, node, key):
+        # Like `Traversor.expand`, but over nodes, so only the values matched are decoded. Filters need the values
+        # they test, so the values reached by then are decoded and the rest is left to `Traversor.expand`.
+        tape = self.tape
+        nodes = [node]
+        for position in range(key.first, len(key.parts)):
+            part, index = key.parts[position], key.indexes[position]
+            selector = key.filters[position]
+            if selector is _EVERY:
+                nodes = [child for node in nodes if tape.kinds[node] <= _ARRAY for child in tape.children(node)]
+            elif selector is not None:
+                return [value for node in nodes for value in Traversor.expand(tape.decode(node), key, position)]
+            else:
+                nodes = tape.select(nodes, part, index)
+        return [tape.decode(node) for node in nodes]
+
+
+class CompactDeepDict(_CompactValue, Mapping):
+    """
+    A read-only `DeepDict` over a JSON object laid out on a compact tape, creating Python objects only for the
+    values that are accessed.
+    """
+
+    __slots__ = ()
+
+    _kind = _OBJECT
+    _name = "object"
+
+    def __contains__(self, key):
+        try:
+            _ = self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __eq__(self, spec: Mapping | CompiledSpec):
+        """Convenience method to match against a spec."""
+        return DictMatcher(_ObjectView(self.tape, self.node)).matches(spec)
+
+    def check(self, spec: Mapping | CompiledSpec):
+        """Like `==`, but return False on mismatch instead of raising `MatcherError`."""
+        return DictMatcher(_ObjectView(self.tape, self.node)).check(spec)
+
+    def __iter__(self):
+        return iter(self.tape.object_keys(self.node))
+
+    def __len__(self):
+        return self.tape.size(self.node)
+
+    def __getitem__(self, key):
+        return self._resolve(key)
+
+    def keys(self):
+        return self.tape.object_keys(self.node)
+
+    def items(self):
+        keys = self.tape.keys
+        for node, number in self.tape.fields(self.node):
+            yield keys[number], CompactFactory(self.tape, node)
+
+    def values(self):
+        for node in self.tape.children(self.node):
+            yield CompactFactory(self.tape, node)
+
+
+class CompactDeepList(_CompactValue, Sequence):
+    """
+    A read-only `DeepList` over a JSON array laid out on a compact tape, like `CompactDeepDict`.
+    """
+
+    __slots__ = ()
+
+    _kind = _ARRAY
+    _name = "array"
+
+    def __contains__(self, item):
+        return self.check([item, ...])
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            node = self.tape.item(self.node, index)
+            if node < 0:
+                raise IndexError(index)
+            return CompactFactory(self.tape, node)
+
+        return self._resolve(index)
+
+    def __iter__(self):
+        for node in self.tape.children(self.node):
+            yield CompactFactory(self.tape, node)
+
+    def __eq__(self, spec: list | CompiledSpec):
+        """Convenience method to match against a spec."""
+        return ListMatcher(self.wrapped_obj).matches(spec)
+
+    def check(self, spec: list | CompiledSpec):
+        """Like `==`, but return False on mismatch instead of raising `MatcherError`."""
+        return ListMatcher(self.wrapped_obj).check(spec)
+
+    def __len__(self):
+        return self.tape.size(self.node)
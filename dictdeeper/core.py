@@ -1,36 +1,153 @@
 from __future__ import annotations
 
 # Python imports
+import json
+import operator
+import re
+from array import array
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, NamedTuple
 
 # Internal imports
-from dictdeeper.exceptions import DeepDictIndexError, DeepDictKeyError, DeepDictValueError, MatcherError
+from dictdeeper.exceptions import DeepDictIndexError, DeepDictKeyError, DeepDictValueError
 from dictdeeper.matcher import DictMatcher, ListMatcher
+from dictdeeper.spec import _HASHABLE_TYPES, CompiledSpec
 
 
-def DeepFactory(obj):  # noqa
+_MISSING = object()
+_PLAIN_TYPES = _HASHABLE_TYPES | {dict, list, tuple}
+
+
+def DeepFactory(obj, reuse=False):  # noqa
     if isinstance(obj, dict):
-        return DeepDict(obj)
+        return DeepDict(obj, reuse)
     elif isinstance(obj, (list, tuple)):
-        return DeepList(obj)
+        return DeepList(obj, reuse)
     return obj
 
 
-class DeepDict(Mapping):
-    def __init__(self, wrapped_obj):
-        assert isinstance(wrapped_obj, dict)
+class _Wrapper:
+    __slots__ = ("wrapped_obj", "fingerprints", "_wrappers", "_parent")
+
+    def __init__(self, wrapped_obj, reuse=False, fingerprints=None):
         self.wrapped_obj = wrapped_obj
+        self.fingerprints = fingerprints
+        self._wrappers = {} if reuse else None
+        self._parent = None
+
+    def _wrap(self, key, value):
+        """
+        Wrap the child `value` found at `key`.
+
+        When built with `reuse`, the wrapper is kept and returned again for as long as `key` holds the same value.
+        """
+        if not isinstance(value, (dict, list, tuple)):
+            return value
+        wrappers = self._wrappers
+        if wrappers is None:
+            return self._adopt(DeepFactory(value))
+
+        key = str(key) if isinstance(key, CompiledKey) else key
+        wrapper = wrappers.get(key)
+        if wrapper is None or wrapper.wrapped_obj is not value:
+            wrapper = wrappers[key] = self._adopt(DeepFactory(value, reuse=True))
+        return wrapper
+
+    def _adopt(self, wrapper):
+        # Writes through a child change the values holding it too, so it keeps the fingerprints of its parent,
+        # and the parent itself to reach them.
+        wrapper.fingerprints = self.fingerprints
+        wrapper._parent = self
+        return wrapper
+
+    def _ancestors(self):
+        parent = self._parent
+        while parent is not None:
+            yield parent
+            parent = parent._parent
+
+    def _matching(self):
+        return nullcontext() if self.fingerprints is None else self.fingerprints.active()
+
+    def _find_index(self, items, key):
+        """Return an up to date `Index` of `items` by `key` built by `index_by` here or on a reused wrapper."""
+        for wrapper in (self._wrappers or {}).values():
+            index = wrapper._find_index(items, key)
+            if index is not None:
+                return index
+        return None
+
+    def _invalidate_wrappers(self, values):
+        """Invalidate the reused wrappers, here and within, of any of `values` by id, after they were changed."""
+        for wrapper in (self._wrappers or {}).values():
+            if id(wrapper.wrapped_obj) in values:
+                wrapper.invalidate()
+            wrapper._invalidate_wrappers(values)
+
+
+class DeepDict(_Wrapper, Mapping):
+    """
+    Access the values nested in `wrapped_obj` with dotted keys.
+
+    With `fingerprints`, a `Fingerprints` cache, matching skips the subtrees that have the same fingerprint as
+    a fully concrete part of the spec. Writes through `set`, `delete` and `update_paths` discard the fingerprints
+    they make stale, here or through the dicts and lists returned, which share the fingerprints. Other changes in
+    place must be discarded from the cache by hand.
+
+    With `path_cache`, up to that many of the dicts and lists resolved by lookups are kept by their path, and
+    later lookups resume from the deepest one cached along their key, like siblings do from their parent.
+    Writes through `set`, `delete` and `update_paths`, here or on the dicts returned, drop them, and `invalidate`
+    must be called after other changes in place.
+    """
+
+    __slots__ = ("path_cache", "_paths")
+
+    def __init__(self, wrapped_obj, reuse=False, fingerprints=None, path_cache=0):
+        assert isinstance(wrapped_obj, dict)
+        super().__init__(wrapped_obj, reuse, fingerprints)
+        self.path_cache = path_cache
+        self._paths = OrderedDict() if path_cache else None
+
+    @classmethod
+    def from_json(cls, data: str | bytes | memoryview, lazy=False, compact=False):
+        """
+        Wrap the JSON object in `data`.
+
+        When `lazy`, `data` is kept as is and only the values on the paths accessed are ever decoded.
+        When `compact`, `data` is laid out read-only on a compact tape, and only the values accessed become Python
+        objects.
+        """
+        if lazy and compact:
+            raise ValueError("A JSON object can't be both lazy and compact.")
+        if lazy:
+            from dictdeeper.lazy import LazyDeepDict
+
+            return LazyDeepDict(data)
+        if compact:
+            from dictdeeper.compact import CompactDeepDict
+
+            return CompactDeepDict(data)
+        return cls(json.loads(bytes(data) if isinstance(data, memoryview) else data))
 
     def __contains__(self, key):
         try:
-            _ = self[key]
+            _ = self._resolve(key)
             return True
         except KeyError:
             return False
 
-    def __eq__(self, spec: Mapping):
+    def __eq__(self, spec: Mapping | CompiledSpec):
         """Convenience method to match against a spec."""
-        return DictMatcher(self.wrapped_obj).matches(spec)
+        with self._matching():
+            return DictMatcher(self.wrapped_obj).matches(spec)
+
+    def check(self, spec: Mapping | CompiledSpec):
+        """Like `==`, but return False on mismatch instead of raising `MatcherError`."""
+        with self._matching():
+            return DictMatcher(self.wrapped_obj).check(spec)
 
     def __iter__(self):
         yield from iter(self.wrapped_obj)
@@ -39,7 +156,44 @@ class DeepDict(Mapping):
         return len(self.wrapped_obj)
 
     def __getitem__(self, key):
-        return DeepFactory(Traversor(self.wrapped_obj)[key])
+        return self._wrap(key, self._resolve(key))
+
+    def _resolve(self, key):
+        paths = self._paths
+        if paths is None:
+            return Traversor(self.wrapped_obj, self._find_index)[key]
+
+        key = compile_key(key)
+        if key.wildcard or len(key.parts) == 1:
+            return Traversor(self.wrapped_obj, self._find_index)[key]
+
+        # Most lookups share their parent with a previous one, so it is looked up first.
+        stop = len(key.parts)
+        parent = key.parts[:-1]
+        node = paths.get(parent)
+        if node is not None:
+            paths.move_to_end(parent)
+        else:
+            node, start = self.wrapped_obj, 0
+            for position in range(stop - 2, 0, -1):
+                cached = paths.get(key.parts[:position])
+                if cached is not None:
+                    node, start = cached, position
+                    break
+            node = Traversor._walk(node, key, stop - 1, start)
+            self._remember(parent, node)
+        return Traversor._walk(node, key, stop, stop - 1)
+
+    def _remember(self, path, value):
+        paths = self._paths
+        paths[path] = value
+        if len(paths) > self.path_cache:
+            paths.popitem(last=False)
+
+    def invalidate(self):
+        """Drop the paths cached so far, after the wrapped dict was changed in place."""
+        if self._paths is not None:
+            self._paths.clear()
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.wrapped_obj!r})"
@@ -50,38 +204,124 @@ class DeepDict(Mapping):
         except KeyError:
             return default
 
+    def get_many(self, keys, default=None):
+        """Get the value of each key in `keys`, or `default` for missing ones, in a single walk."""
+        return Traversor(self.wrapped_obj).get_many(keys, default, factory=DeepFactory)
+
+    def set(self, key, value, create=True):
+        """Set the value at `key`, creating the dicts and lists missing along the way unless `create` is False."""
+        self._changing([key])
+        Traversor(self.wrapped_obj).update({key: value}, create)
+
+    def delete(self, key):
+        """Delete the value at `key`."""
+        self._changing([key])
+        Traversor(self.wrapped_obj).delete(key)
+
+    def update_paths(self, updates, create=True):
+        """Set the value of each key in `updates`, like `set`, in a single walk."""
+        self._changing(updates)
+        Traversor(self.wrapped_obj).update(updates, create)
+
+    def _changing(self, keys):
+        # Changing a value changes the fingerprints of all the values holding it, up to the ancestors of a child
+        # wrapper, whose cached paths it may make stale too, and the indexes of the lists holding it on all the
+        # wrappers reused from the root.
+        self.invalidate()
+        root = self
+        for root in self._ancestors():
+            root.invalidate()
+        if self.fingerprints is None and root._wrappers is None:
+            return
+        values = {id(ancestor.wrapped_obj): ancestor.wrapped_obj for ancestor in self._ancestors()}
+        for key in keys:
+            key = compile_key(key)
+            value = self.wrapped_obj
+            values[id(value)] = value
+            for part, index in zip(key.parts, key.indexes):
+                value = _child(value, part, index)
+                if value is _MISSING:
+                    break
+                values[id(value)] = value
+
+        if self.fingerprints is not None:
+            for value in values.values():
+                self.fingerprints.discard(value)
+        root._invalidate_wrappers(values)
+
     def keys(self):
         return self.wrapped_obj.keys()
 
     def items(self):
-        for key in self:
-            yield key, self[key]
+        for key, value in self.wrapped_obj.items():
+            yield key, self._wrap(key, value)
 
     def values(self):
-        for key in self:
-            yield self[key]
+        for key, value in self.wrapped_obj.items():
+            yield self._wrap(key, value)
 
 
-class DeepList(Sequence):
-    def __init__(self, wrapped_obj):
+class DeepList(_Wrapper, Sequence):
+    __slots__ = ("_indexes",)
+
+    def __init__(self, wrapped_obj, reuse=False):
         assert isinstance(wrapped_obj, (list, tuple))
-        self.wrapped_obj = wrapped_obj
+        super().__init__(wrapped_obj, reuse)
+        # Most lists are never indexed, so the dict of their indexes is only made by `index_by`.
+        self._indexes = None
 
     def __contains__(self, item):
-        try:
-            return self == [item, ...]
-        except MatcherError:
-            return False
+        # Scalars can only be equal to plain scalars, so unless the list holds values that may define their own
+        # equality, where the matcher is used, a scalar is looked for by equality, stopping at the first found.
+        if type(item) in _HASHABLE_TYPES and item == item:
+            if item in self.wrapped_obj:
+                return True
+            if _PLAIN_TYPES.issuperset(map(type, self.wrapped_obj)):
+                return False
+        return self.check([item, ...])
+
+    def index_by(self, key, unique=False):
+        """
+        Return an `Index` of the items by their value at `key`, reusing the one built by a previous call.
+
+        The index is rebuilt when the length of the list changes. Call `invalidate` after replacing or
+        updating items in place.
+        """
+        key = compile_key(key)
+        if self._indexes is None:
+            self._indexes = {}
+        index = self._indexes.get((key, unique))
+        if index is None or index.size != len(self.wrapped_obj):
+            index = self._indexes[key, unique] = Index(self.wrapped_obj, key, unique)
+        return index
+
+    def invalidate(self):
+        """Drop the indexes built so far, after the list was changed in place."""
+        self._indexes = None
+
+    def _find_index(self, items, key):
+        if items is self.wrapped_obj and self._indexes is not None:
+            for unique in (True, False):
+                index = self._indexes.get((key, unique))
+                if index is not None and index.size == len(items):
+                    return index
+        return super()._find_index(items, key)
 
     def __getitem__(self, index):
         if isinstance(index, int):
             return self.wrapped_obj[index]
 
-        return DeepFactory(Traversor(self.wrapped_obj)[index])
+        return self._wrap(index, Traversor(self.wrapped_obj, self._find_index)[index])
 
-    def __eq__(self, spec: list):
+    def __eq__(self, spec: list | CompiledSpec):
         """Convenience method to match against a spec."""
-        return ListMatcher(self.wrapped_obj).matches(spec)
+        with self._matching():
+            return ListMatcher(self.wrapped_obj).matches(spec)
+
+    def check(self, spec: list | CompiledSpec):
+        """Like `==`, but return False on mismatch instead of raising `MatcherError`."""
+        with self._matching():
+            return ListMatcher(self.wrapped_obj).check(spec)
 
     def __len__(self):
         return len(self.wrapped_obj)
@@ -89,8 +329,50 @@ class DeepList(Sequence):
     def __repr__(self):
         return f"{self.__class__.__name__}({self.wrapped_obj!r})"
 
+    def columns(self, keys, default=None, use_numpy=None):
+        """
+        Return one column per key in `keys`, with its value for each item, or `default` when it is missing.
+
+        Columns are NumPy arrays when NumPy is installed, unless `use_numpy` is False. Otherwise, columns of
+        ints or floats are `array.array`s and any other column is a list.
+        """
+        extractor = keys if isinstance(keys, Extractor) else Extractor(keys)
+        columns = [[] for _ in extractor.keys]
+        for item in self.wrapped_obj:
+            for column, value in zip(columns, extractor(item, default)):
+                column.append(value)
+
+        numpy = _numpy() if use_numpy is not False else None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is required for use_numpy=True.")
+        return [_column(values, numpy) for values in columns]
+
+
+def _column(values, numpy):
+    if numpy is not None:
+        return numpy.asarray(values)
+    if all(type(value) is int for value in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    if all(type(value) in (int, float) for value in values):
+        return array("d", values)
+    return values
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 
 class Key(str):
+    __slots__ = ("origin",)
+
     def __new__(cls, part, origin=""):
         part = super().__new__(cls, part)
         part.origin = origin
@@ -107,6 +389,8 @@ class Key(str):
 
 
 class NestedKey(str):
+    __slots__ = ("path",)
+
     SEP = "."
 
     def __new__(cls, key, origin=""):
@@ -136,38 +420,463 @@ class NestedKey(str):
             origin = f"{part:origin}"
 
 
-class Traversor:
-    def __init__(self, wrapped_obj):
-        self.wrapped_obj = wrapped_obj
+class CompiledKey:
+    """
+    A dotted key split and parsed once, so it can be reused across lookups.
 
-    def __repr__(self):
-        return f"{self.__class__.__name__}({self.wrapped_obj!r})"
+    A part may be followed by filters, like `items[status=paid]`, which become a part of their own that selects
+    the children of a list or dict for which all the filters hold, like a `*` restricted to them. Brackets that
+    don't hold conditions, like in `a[0]`, are read as part of a literal key. A `*` key is read with a `\\*` part.
+    """
+
+    __slots__ = ("key", "parts", "indexes", "filters", "first", "wildcard")
+    SEP = NestedKey.SEP
+    WILDCARD = "*"
+    ESCAPED_WILDCARD = "\\*"
+
+    def __init__(self, key):
+        if not isinstance(key, str):
+            raise TypeError(f"{self.__class__.__name__} only works with str keys.")
+
+        self.key = str(key)
+        if "[" in self.key:
+            parts, filters = self._parse(self.key)
+        else:
+            parts = self.key.split(self.SEP)
+            filters = (None,) * len(parts)
+        # A `*` part selects all the children, like a filter without conditions, and a `\*` part reads a `*` key.
+        self.filters = tuple(
+            _EVERY if part == self.WILDCARD and selector is None else selector for part, selector in zip(parts, filters)
+        )
+        self.parts = tuple(self.WILDCARD if part == self.ESCAPED_WILDCARD else part for part in parts)
+        self.indexes = tuple(self._index(part) for part in self.parts)
+        # The position of the first part that may match many values, a wildcard or a filter, if there is one.
+        self.first = next((position for position, selector in enumerate(self.filters) if selector is not None), None)
+        self.wildcard = self.first is not None
+
+    @classmethod
+    def _parse(cls, key):
+        parts, filters = [], []
+        for segment in _split(key, cls.SEP):
+            match = _SEGMENT.fullmatch(segment)
+            name, conditions = match.groups() if match is not None else (segment, "")
+            selector = cls._filter(conditions, key) if conditions else None
+            if selector is None:
+                literal = segment.split(cls.SEP)
+                parts.extend(literal)
+                filters.extend([None] * len(literal))
+                continue
+            if name:
+                parts.append(name)
+                filters.append(None)
+            parts.append(conditions)
+            filters.append(selector)
+        return tuple(parts), tuple(filters)
 
     @staticmethod
-    def _value_from_list(part, value):
+    def _filter(conditions, key):
         try:
-            value = value[int(part)]
-        except IndexError as e:
-            raise DeepDictIndexError(part) from e
-        return value
+            return Filter(Condition.parse(c, key) for c in re.findall(r"\[([^\[\]]*)\]", conditions))
+        except ValueError:
+            return None
 
     @staticmethod
-    def _value_from_dict(part, value):
+    def _index(part):
+        try:
+            return int(part)
+        except ValueError:
+            return None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.key!r})"
+
+    def __str__(self):
+        return self.key
+
+    def key_at(self, position):
+        """Build the `Key` for the part at `position`, as reported by lookup errors."""
+        return Key(self.parts[position], self.SEP.join(self.parts[:position]))
+
+
+_SEGMENT = re.compile(r"([^\[\]]*)((?:\[[^\[\]]*\])*)")
+_CONDITION = re.compile(r"\s*(?P<field>[^=!<>]+?)\s*(?P<op>==|=|!=|<=|>=|<|>)\s*(?P<value>.*?)\s*")
+_OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _split(key, sep):
+    # Separators within the brackets of a filter, like in `[price>1.5]`, don't split the key.
+    segments, start, depth = [], 0, 0
+    for position, char in enumerate(key):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == sep and depth == 0:
+            segments.append(key[start:position])
+            start = position + 1
+    segments.append(key[start:])
+    return segments
+
+
+class Condition(NamedTuple):
+    """
+    The condition `field op value` of a filter, holding for the values with any value at `field` that compares to
+    `value`.
+
+    `field` is a dotted key within each value, and `value` is a JSON scalar, like `1`, `true`, `null` or `"1"`,
+    or else a plain string. Values without `field` never match.
+    """
+
+    field: CompiledKey
+    op: str
+    value: Any
+
+    @classmethod
+    def parse(cls, condition, key=""):
+        match = _CONDITION.fullmatch(condition)
+        if match is None:
+            raise ValueError(f"Invalid filter [{condition}] in the key {key!r}.")
+        field, op, value = match.groups()
         try:
-            value = value[part]
-        except KeyError as e:
-            raise DeepDictKeyError(part) from e
+            literal = json.loads(value)
+        except ValueError:
+            literal = value
+        return cls(compile_key(field), op, literal if type(literal) in _HASHABLE_TYPES else value)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.field.key}{self.op}{self.value!r})"
+
+    def test(self, value):
+        compare, field = _OPERATORS[self.op], self.field
+        if field.wildcard:
+            values = Traversor.expand(value, field, 0)
+        else:
+            for part, index in zip(field.parts, field.indexes):
+                value = _child(value, part, index)
+                if value is _MISSING:
+                    return False
+            values = (value,)
+
+        for found in values:
+            try:
+                if compare(found, self.value):
+                    return True
+            except TypeError:
+                continue
+        return False
+
+
+class Filter:
+    """The filters of a part of a key, like `[status=paid][amount>10]`, selecting the children they all hold for."""
+
+    __slots__ = ("conditions",)
+
+    def __init__(self, conditions):
+        self.conditions = tuple(conditions)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self.conditions)!r})"
+
+    def select(self, value, indexes=None):
+        """
+        Return the children of `value` for which all the conditions hold.
+
+        `indexes`, given a list and a key, returns an up to date `Index` of the list by the key, if there is one,
+        to find the candidates of an equality without testing every item. The candidates are still tested, so an
+        index made stale by changes in place never selects items the filters don't hold for.
+        """
+        children, conditions = _children(value), self.conditions
+        if not conditions:
+            return children
+        if indexes is not None and isinstance(value, list):
+            for condition in conditions:
+                if _OPERATORS[condition.op] is not operator.eq:
+                    continue
+                index = indexes(value, condition.field)
+                if index is not None:
+                    children = [value[position] for position in index.positions.get(condition.value, ())]
+                    break
+        return [child for child in children if all(condition.test(child) for condition in conditions)]
+
+
+# The selector of `*` parts.
+_EVERY = Filter(())
+
+
+COMPILED_KEYS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=COMPILED_KEYS_CACHE_SIZE)
+def _compile_key(key):
+    return CompiledKey(key)
+
+
+def compile_key(key):
+    """Return the `CompiledKey` for `key`, reusing a cached one when possible."""
+    if isinstance(key, CompiledKey):
+        return key
+    return _compile_key(key)
+
+
+class Extractor:
+    """
+    Extract the values of many keys at once, walking the parts they share only once.
+
+    Keys with wildcards get the list of all the values they match, possibly empty, instead of the default.
+    """
+
+    def __init__(self, keys):
+        self.keys = tuple(compile_key(key) for key in keys)
+        self.collect = frozenset(position for position, key in enumerate(self.keys) if key.wildcard)
+        self.trie = {}
+        for position, key in enumerate(self.keys):
+            node = self.trie
+            for step in zip(key.parts, key.indexes, key.filters):
+                node = node.setdefault(step, {})
+            node.setdefault(None, []).append(position)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({[str(key) for key in self.keys]!r})"
+
+    def __call__(self, obj, default=None, factory=None):
+        values = [[] if position in self.collect else default for position in range(len(self.keys))]
+        self._walk(obj, self.trie, values, factory)
+        return values
+
+    def _walk(self, value, node, values, factory):
+        for step, child in node.items():
+            if step is None:
+                found = value if factory is None else factory(value)
+                for position in child:
+                    if position in self.collect:
+                        values[position].append(found)
+                    else:
+                        values[position] = found
+                continue
+
+            part, index, selector = step
+            if selector is not None:
+                for child_value in selector.select(value):
+                    self._walk(child_value, child, values, factory)
+                continue
+
+            child_value = _child(value, part, index)
+            if child_value is not _MISSING:
+                self._walk(child_value, child, values, factory)
+
+
+def _child(value, part, index):
+    if isinstance(value, dict):
+        return value.get(part, _MISSING)
+    if isinstance(value, (list, tuple)) and index is not None and -len(value) <= index < len(value):
+        return value[index]
+    return _MISSING
+
+
+def _children(value):
+    if isinstance(value, dict):
+        return value.values()
+    if isinstance(value, (list, tuple)):
         return value
+    return ()
+
+
+class Index(Mapping):
+    """
+    A hash index of the `items` of a list by their value at `key`, built in a single pass.
+
+    Indexing it by a value returns the item with that value when `unique`, or the list of items with it otherwise.
+    Items without `key`, or with a list or dict at it, are left out, and with a wildcard key, items are indexed by
+    every value matched.
+    """
+
+    def __init__(self, items, key, unique=False):
+        self.items = items
+        self.key = compile_key(key)
+        self.unique = unique
+        self.size = len(items)
+        self.positions = {}
+        for position, item in enumerate(items):
+            for value in Traversor.expand(item, self.key, 0):
+                try:
+                    positions = self.positions.setdefault(value, [])
+                except TypeError:
+                    # Lists and dicts can't be looked up, and are never equal to the scalars of a filter.
+                    continue
+                if positions and positions[-1] == position:
+                    continue
+                if unique and positions:
+                    raise ValueError(f"Duplicate value {value!r} at {self.key} for a unique index.")
+                positions.append(position)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self.key)!r}, unique={self.unique})"
+
+    def __getitem__(self, value):
+        positions = self.positions[value]
+        if self.unique:
+            return self.items[positions[0]]
+        return [self.items[position] for position in positions]
+
+    def __contains__(self, value):
+        return value in self.positions
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class Traversor:
+    """
+    Look up dotted keys in `wrapped_obj`.
+
+    `indexes`, given a list and a key, returns an up to date `Index` of the list by the key, if there is one,
+    for equality filters to use instead of testing every item.
+    """
+
+    __slots__ = ("wrapped_obj", "indexes")
+
+    def __init__(self, wrapped_obj, indexes=None):
+        self.wrapped_obj = wrapped_obj
+        self.indexes = indexes
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.wrapped_obj!r})"
 
     def __getitem__(self, key):
-        key = NestedKey(key)
-        value = self.wrapped_obj
-        for part in key:
+        """
+        Return the value at `key`.
+
+        A `*` part matches every value of a dict or list, and a filter part, like `[status=paid]`, the values for
+        which it holds, and then a list of all the values matched is returned.
+        Parts after them skip the values they don't apply to, instead of raising.
+        """
+        key = compile_key(key)
+        if not key.wildcard:
+            return self._walk(self.wrapped_obj, key, len(key.parts))
+
+        value = self._walk(self.wrapped_obj, key, key.first)
+        if not isinstance(value, (dict, list, tuple)):
+            raise DeepDictValueError(key.key_at(key.first))
+        return self.expand(value, key, key.first, self.indexes)
+
+    @staticmethod
+    def expand(value, key, start, indexes=None):
+        """Return all the values matched by the parts of `key` from `start` on, skipping those that don't apply."""
+        values = [value]
+        for part, index, selector in zip(key.parts[start:], key.indexes[start:], key.filters[start:]):
+            if selector is not None:
+                values = [child for value in values for child in selector.select(value, indexes)]
+            else:
+                values = [child for child in (_child(value, part, index) for value in values) if child is not _MISSING]
+        return values
+
+    @staticmethod
+    def _walk(value, key, stop, start=0):
+        for position, (part, index) in enumerate(zip(key.parts[start:stop], key.indexes[start:stop]), start):
             if isinstance(value, dict):
-                value = self._value_from_dict(part, value)
+                try:
+                    value = value[part]
+                except KeyError as e:
+                    raise DeepDictKeyError(key.key_at(position)) from e
             elif isinstance(value, (list, tuple)):
-                value = self._value_from_list(part, value)
+                try:
+                    value = value[int(part) if index is None else index]
+                except IndexError as e:
+                    raise DeepDictIndexError(key.key_at(position)) from e
             else:
-                raise DeepDictValueError(part)
+                raise DeepDictValueError(key.key_at(position))
 
         return value
+
+    def get_many(self, keys, default=None, factory=None):
+        extractor = keys if isinstance(keys, Extractor) else Extractor(keys)
+        return extractor(self.wrapped_obj, default, factory)
+
+    def update(self, updates, create=True):
+        """
+        Set the value of each key in `updates`, walking the parts the keys share only once.
+
+        With `create`, missing values along the way become lists when all the parts under them are indexes,
+        and dicts otherwise, and a list index equal to its length appends to the list.
+        A value is set before the values of the keys under it.
+        """
+        trie = {}
+        for key, value in updates.items():
+            key = compile_key(key)
+            if key.wildcard:
+                raise ValueError(f"Can't write to the key {key}, which may match many values.")
+            node = trie
+            for step in zip(key.parts, key.indexes):
+                node = node.setdefault(step, {})
+            node[None] = value
+        self._update(self.wrapped_obj, trie, "", create)
+
+    @classmethod
+    def _update(cls, value, node, origin, create):
+        steps = [step for step in node.items() if step[0] is not None]
+        if isinstance(value, list) and all(index is not None for (_, index), _ in steps):
+            # Appending to a list only works in order.
+            steps.sort(key=lambda step: (step[0][1] >= 0, step[0][1]))
+
+        for (part, index), child in steps:
+            key = Key(part, origin)
+            if None in child:
+                cls._put(value, part, index, child[None], key, create)
+            if len(child) > (None in child):
+                child_value = _child(value, part, index)
+                if child_value is _MISSING:
+                    child_value = [] if all(step is None or step[1] is not None for step in child) else {}
+                    cls._put(value, part, index, child_value, key, create, missing=True)
+                cls._update(child_value, child, f"{key:origin}", create)
+
+    @staticmethod
+    def _put(value, part, index, new, key, create, missing=False):
+        if isinstance(value, dict):
+            if missing and not create:
+                raise DeepDictKeyError(key)
+            value[part] = new
+        elif isinstance(value, list):
+            if index is None:
+                raise DeepDictValueError(key)
+            if index == len(value) and create:
+                value.append(new)
+                return
+            try:
+                value[index] = new
+            except IndexError as e:
+                raise DeepDictIndexError(key) from e
+        else:
+            raise DeepDictValueError(key)
+
+    def delete(self, key):
+        """Delete the value at `key`."""
+        key = compile_key(key)
+        if key.wildcard:
+            raise ValueError(f"Can't delete the key {key}, which may match many values.")
+
+        last = len(key.parts) - 1
+        value = self._walk(self.wrapped_obj, key, last)
+        part, index = key.parts[last], key.indexes[last]
+        if isinstance(value, dict):
+            try:
+                del value[part]
+            except KeyError as e:
+                raise DeepDictKeyError(key.key_at(last)) from e
+        elif isinstance(value, list) and index is not None:
+            try:
+                del value[index]
+            except IndexError as e:
+                raise DeepDictIndexError(key.key_at(last)) from e
+        else:
+            raise DeepDictValueError(key.key_at(last))
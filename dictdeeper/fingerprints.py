@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+# Python imports
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import blake2b
+
+
+DIGEST_SIZE = 16
+
+_active = ContextVar("dictdeeper_fingerprints", default=None)
+
+
+class Fingerprints:
+    """
+    Content hashes of JSON values, cached for every dict and list hashed, so shared subtrees are hashed only once.
+
+    Values that are equal have the same fingerprint, as long as their scalars also have the same types.
+    Anything but dicts, lists, str, int, float, bool and None has no fingerprint, and neither do the dicts and lists
+    holding it, so equality is never assumed for them.
+
+    The cache holds on to every dict and list hashed. Changing one of them in place makes its fingerprint, and the
+    ones of the dicts and lists holding it, stale: `discard` them, or `clear` the cache.
+    """
+
+    def __init__(self):
+        self.digests = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self.digests)} cached)"
+
+    def __getstate__(self):
+        # Cached digests are keyed by id, which means nothing in another process.
+        return {}
+
+    def __setstate__(self, state):
+        self.digests = {}
+
+    def __call__(self, value) -> bytes | None:
+        """Return the fingerprint of `value`, or None when it can't have one."""
+        if isinstance(value, (dict, list)):
+            return self._container(value)
+        token = _encode(value)
+        return None if token is None else blake2b(token, digest_size=DIGEST_SIZE).digest()
+
+    def _container(self, value):
+        entry = self.digests.get(id(value))
+        if entry is not None and entry[0] is value:
+            return entry[1]
+
+        if isinstance(value, dict):
+            tokens = []
+            for key, item in value.items():
+                key_token = _encode(key)
+                item_token = self._token(item)
+                if key_token is None or item_token is None:
+                    digest = None
+                    break
+                tokens.append(key_token + item_token)
+            else:
+                # Dicts are equal whatever the order of their keys.
+                tokens.sort()
+                digest = _digest(b"{", tokens)
+        else:
+            tokens = [self._token(item) for item in value]
+            digest = None if None in tokens else _digest(b"[", tokens)
+
+        self.digests[id(value)] = (value, digest)
+        return digest
+
+    def _token(self, value):
+        if isinstance(value, (dict, list)):
+            digest = self._container(value)
+            return None if digest is None else b"#" + digest
+        return _encode(value)
+
+    def discard(self, value):
+        """Forget the fingerprint of `value`, after it was changed in place."""
+        entry = self.digests.get(id(value))
+        if entry is not None and entry[0] is value:
+            del self.digests[id(value)]
+
+    def clear(self):
+        self.digests.clear()
+
+    @contextmanager
+    def active(self):
+        """Let matching short-circuit fully concrete specs with these fingerprints, within this context."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+
+def active_fingerprints() -> Fingerprints | None:
+    """Return the `Fingerprints` made active by `Fingerprints.active`, if any."""
+    return _active.get()
+
+
+def fingerprint(value) -> bytes | None:
+    """Return the fingerprint of `value`, without caching it."""
+    return Fingerprints()(value)
+
+
+def _digest(opening, tokens):
+    hasher = blake2b(opening, digest_size=DIGEST_SIZE)
+    for token in tokens:
+        hasher.update(token)
+    return hasher.digest()
+
+
+def _encode(value):
+    value_type = type(value)
+    if value_type is str:
+        data = value.encode("utf-8", "surrogatepass")
+        return b"s%d:" % len(data) + data
+    if value_type is int:
+        return b"i%d;" % value
+    if value_type is float:
+        # NaN isn't equal to itself.
+        return None if value != value else b"f" + repr(value).encode() + b";"
+    if value_type is bool:
+        return b"T" if value else b"F"
+    if value is None:
+        return b"N"
+    return None
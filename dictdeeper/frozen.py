@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+# Python imports
+from collections.abc import Mapping, Sequence
+
+# Internal imports
+from dictdeeper.core import Extractor, Traversor, _child, compile_key
+from dictdeeper.matcher import DictMatcher, ListMatcher
+from dictdeeper.spec import CompiledSpec
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{self.__class__.__name__} can't be changed.")
+
+
+class _FrozenDict(dict):
+    """A dict that can't be changed, caching its hash."""
+
+    __slots__ = ("cached_hash",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cached_hash = None
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+class _FrozenList(list):
+    """A list that can't be changed, caching its hash."""
+
+    __slots__ = ("cached_hash",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.cached_hash = None
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+
+_FROZEN = (_FrozenDict, _FrozenList)
+
+
+def _freeze(value):
+    # Frozen values are shared as they are, so freezing only copies what isn't frozen yet.
+    if isinstance(value, dict):
+        if type(value) is _FrozenDict:
+            return value
+        return _FrozenDict(
+            {key: _freeze(item) if isinstance(item, _CONTAINERS) else item for key, item in value.items()}
+        )
+    if isinstance(value, (list, tuple)):
+        if type(value) is _FrozenList:
+            return value
+        return _FrozenList([_freeze(item) if isinstance(item, _CONTAINERS) else item for item in value])
+    if isinstance(value, _FrozenWrapper):
+        return value.wrapped_obj
+    return value
+
+
+_CONTAINERS = (dict, list, tuple)
+
+
+def _thaw(value):
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _hash(value):
+    # Each frozen dict and list keeps its own hash, so it is shared with every value derived from it.
+    cached = value.cached_hash
+    if cached is None:
+        if isinstance(value, dict):
+            items = [(key, _hash(item) if type(item) in _FROZEN else item) for key, item in value.items()]
+            cached = hash(frozenset(items))
+        else:
+            cached = hash(tuple([_hash(item) if type(item) in _FROZEN else item for item in value]))
+        value.cached_hash = cached
+    return cached
+
+
+def _derive(root, keys):
+    """Copy `root`, and the dicts and lists along each of `keys`, so they can be changed, sharing everything else."""
+    copies = {}
+    # The ids of the copies, so the keys sharing a path with an earlier one go on through the copies it made.
+    copied = set()
+
+    def thawed(value):
+        copy = copies.get(id(value))
+        if copy is None:
+            copy = copies[id(value)] = dict(value) if isinstance(value, dict) else list(value)
+            copied.add(id(copy))
+        return copy
+
+    copy = thawed(root)
+    for key in keys:
+        key = compile_key(key)
+        node = copy
+        for part, index in zip(key.parts[:-1], key.indexes[:-1]):
+            child = _child(node, part, index)
+            if id(child) in copied:
+                node = child
+                continue
+            if type(child) not in _FROZEN:
+                break
+            child_copy = thawed(child)
+            node[part if isinstance(node, dict) else index] = child_copy
+            node = child_copy
+    return copy
+
+
+class _FrozenWrapper:
+    __slots__ = ("wrapped_obj",)
+
+    def __init__(self, wrapped_obj):
+        self.wrapped_obj = _freeze(getattr(wrapped_obj, "wrapped_obj", wrapped_obj))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({_thaw(self.wrapped_obj)!r})"
+
+    def __hash__(self):
+        return _hash(self.wrapped_obj)
+
+    def __eq__(self, other):
+        if isinstance(other, _FrozenWrapper):
+            if self.wrapped_obj is other.wrapped_obj:
+                return True
+            if _hash(self.wrapped_obj) != _hash(other.wrapped_obj):
+                return False
+            other = other.wrapped_obj
+        return self.wrapped_obj == other
+
+    def __getitem__(self, key):
+        return _wrap(Traversor(self.wrapped_obj)[key])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_many(self, keys, default=None):
+        """Get the value of each key in `keys`, or `default` for missing ones, in a single walk."""
+        extractor = keys if isinstance(keys, Extractor) else Extractor(keys)
+        return extractor(self.wrapped_obj, default, factory=_wrap)
+
+    def set(self, key, value, create=True):
+        """Return a copy with `value` set at `key`, sharing all the values it leaves unchanged."""
+        return self.update_paths({key: value}, create)
+
+    def update_paths(self, updates, create=True):
+        """Return a copy with the value of each key in `updates` set, like `set`, in a single walk."""
+        copy = _derive(self.wrapped_obj, updates)
+        Traversor(copy).update(updates, create)
+        return self.__class__(copy)
+
+    def delete(self, key):
+        """Return a copy without the value at `key`, sharing all the values it leaves unchanged."""
+        copy = _derive(self.wrapped_obj, [key])
+        Traversor(copy).delete(key)
+        return self.__class__(copy)
+
+    def thaw(self):
+        """Return a deep copy of the wrapped value, made of plain dicts and lists that can be changed."""
+        return _thaw(self.wrapped_obj)
+
+
+class FrozenDeepDict(_FrozenWrapper, Mapping):
+    """
+    A `DeepDict` that can't be changed, and so can be hashed, as a dict key or an argument of `lru_cache`.
+
+    `wrapped_obj` is copied once, and `set`, `delete` and `update_paths` return new copies that share every dict
+    and list they leave unchanged. The hash is computed on first use and kept by every dict and list within the
+    wrapped dict, so derived copies only hash the values they changed, and frozen values with different hashes
+    are told apart without comparing them. Like a tuple, it can only be hashed when all the values it holds can.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, wrapped_obj):
+        super().__init__(wrapped_obj)
+        assert isinstance(self.wrapped_obj, dict)
+
+    def __contains__(self, key):
+        try:
+            _ = Traversor(self.wrapped_obj)[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self):
+        return iter(self.wrapped_obj)
+
+    def __len__(self):
+        return len(self.wrapped_obj)
+
+    def check(self, spec: Mapping | CompiledSpec):
+        """Match against a spec, returning False on mismatch instead of raising `MatcherError`."""
+        return DictMatcher(self.wrapped_obj).check(spec)
+
+    def matches(self, spec: Mapping | CompiledSpec):
+        """Match against a spec, raising `MatcherError` on mismatch."""
+        return DictMatcher(self.wrapped_obj).matches(spec)
+
+    def keys(self):
+        return self.wrapped_obj.keys()
+
+    def items(self):
+        for key, value in self.wrapped_obj.items():
+            yield key, _wrap(value)
+
+    def values(self):
+        for value in self.wrapped_obj.values():
+            yield _wrap(value)
+
+
+class FrozenDeepList(_FrozenWrapper, Sequence):
+    """A `DeepList` that can't be changed, and so can be hashed, like `FrozenDeepDict`."""
+
+    __slots__ = ()
+
+    def __init__(self, wrapped_obj):
+        super().__init__(wrapped_obj)
+        assert isinstance(self.wrapped_obj, list)
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            return _wrap(self.wrapped_obj[index])
+        return super().__getitem__(index)
+
+    def __len__(self):
+        return len(self.wrapped_obj)
+
+    def check(self, spec: list | CompiledSpec):
+        """Match against a spec, returning False on mismatch instead of raising `MatcherError`."""
+        return ListMatcher(self.wrapped_obj).check(spec)
+
+    def matches(self, spec: list | CompiledSpec):
+        """Match against a spec, raising `MatcherError` on mismatch."""
+        return ListMatcher(self.wrapped_obj).matches(spec)
+
+
+def _wrap(value):
+    if isinstance(value, dict):
+        return FrozenDeepDict(value)
+    if isinstance(value, (list, tuple)):
+        return FrozenDeepList(value)
+    return value
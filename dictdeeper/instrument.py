@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+# Python imports
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+# Internal imports
+from dictdeeper import exceptions, matcher
+from dictdeeper.core import DeepDict, Traversor
+from dictdeeper.lazy import LazyDeepDict
+from dictdeeper.merger import Strategy, _PathKey
+from dictdeeper.spec import CompiledSpec, _Assignment
+
+
+class Stats:
+    """
+    Counters and timers collected by `collect`, by dotted name.
+
+    - `traversal.lookups`, `traversal.nodes` and `traversal.seconds`: `Traversor` lookups, the dicts and lists
+      they walked through, and the time they took.
+    - `matcher.calls` and `matcher.seconds`: calls to `check` and `matches` on a `Matcher`, and their time.
+    - `matcher.check.<Spec>` and `matcher.matches.<Spec>`: calls by type of spec node.
+    - `matcher.unordered.pairs`: items and values of unordered lists tested against each other.
+    - `exceptions.raised.<Error>`, `exceptions.raised` and `exceptions.swallowed`: errors raised, and the ones
+      caught again by `get`, `in`, `match_many` and the like.
+    - `merger.<Strategy>.tests`, `.calls`, `.merge_all` and `.seconds`: strategy tests, merges and their time.
+    """
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.as_dict()!r})"
+
+    def as_dict(self):
+        return {**self.counters, **self.timers}
+
+
+_collecting = False
+
+
+@contextmanager
+def collect(export=None):
+    """
+    Collect `Stats` about the work done within this context, and call `export(stats)` when it's done.
+
+    Nothing is instrumented outside of this context, so there is no cost when it is not used. Within it, the
+    instrumentation is process-wide, so the work of other threads is collected too, and only one collection
+    may run at a time. Work done by worker processes isn't collected.
+    """
+    global _collecting
+    if _collecting:
+        raise RuntimeError("Stats are already being collected.")
+
+    _collecting = True
+    stats = Stats()
+    patches = _Patches()
+    try:
+        _instrument(patches, stats)
+        yield stats
+    finally:
+        patches.restore()
+        _collecting = False
+
+    if export is not None:
+        export(stats)
+
+
+class _Patches:
+    def __init__(self):
+        self.originals = []
+
+    def patch(self, owner, name, wrap):
+        """Replace the attribute `name` of `owner` by `wrap(original)`, keeping static methods static."""
+        own = name in vars(owner)
+        original = vars(owner)[name] if own else getattr(owner, name)
+        if isinstance(original, staticmethod):
+            replacement = staticmethod(wrap(original.__func__))
+        else:
+            replacement = wrap(original)
+        self.originals.append((owner, name, own, original))
+        setattr(owner, name, replacement)
+
+    def restore(self):
+        for owner, name, own, original in reversed(self.originals):
+            if own:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self.originals.clear()
+
+
+def _instrument(patches, stats):
+    counters, timers = stats.counters, stats.timers
+    running = defaultdict(int)
+
+    def call_timed(timer, fn, *args, **kwargs):
+        # Recursive calls, like nested merges, are only timed once, by their outermost call.
+        if running[timer]:
+            return fn(*args, **kwargs)
+        running[timer] += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timers[timer] += time.perf_counter() - started
+            running[timer] -= 1
+
+    def counted(counter):
+        def wrap(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                counters[counter] += 1
+                return fn(*args, **kwargs)
+
+            return wrapper
+
+        return wrap
+
+    def timed(counter, timer):
+        def wrap(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                counters[counter] += 1
+                return call_timed(timer, fn, *args, **kwargs)
+
+            return wrapper
+
+        return wrap
+
+    def by_type(name, counter, timer=None):
+        # Methods are counted by the type of their instance, and only once when an override calls `super()`.
+        def wrap(fn):
+            @wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                if getattr(type(self), name) is not wrapper:
+                    return fn(self, *args, **kwargs)
+                type_name = type(self).__name__
+                counters[counter.format(type_name)] += 1
+                if timer is None:
+                    return fn(self, *args, **kwargs)
+                return call_timed(timer.format(type_name), fn, self, *args, **kwargs)
+
+            return wrapper
+
+        return wrap
+
+    def walk(fn):
+        @wraps(fn)
+        def wrapper(value, key, stop, start=0):
+            counters["traversal.nodes"] += stop - start
+            return fn(value, key, stop, start)
+
+        return wrapper
+
+    def raised(init):
+        @wraps(init)
+        def wrapper(self, *args, **kwargs):
+            if getattr(type(self), "__init__") is wrapper:
+                counters["exceptions.raised"] += 1
+                counters[f"exceptions.raised.{type(self).__name__}"] += 1
+            init(self, *args, **kwargs)
+
+        return wrapper
+
+    def swallowing(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            before = counters["exceptions.raised"]
+            result = fn(*args, **kwargs)
+            counters["exceptions.swallowed"] += counters["exceptions.raised"] - before
+            return result
+
+        return wrapper
+
+    patches.patch(Traversor, "__getitem__", timed("traversal.lookups", "traversal.seconds"))
+    patches.patch(Traversor, "_walk", walk)
+
+    patches.patch(matcher.Matcher, "check", timed("matcher.calls", "matcher.seconds"))
+    patches.patch(matcher.Matcher, "matches", timed("matcher.calls", "matcher.seconds"))
+    for spec_type in _subclasses(CompiledSpec):
+        for name in ("check", "matches"):
+            if name in vars(spec_type):
+                patches.patch(spec_type, name, by_type(name, f"matcher.{name}.{{}}"))
+    patches.patch(_Assignment, "test", counted("matcher.unordered.pairs"))
+
+    for error in _subclasses(exceptions.MatcherError) + _subclasses(KeyError):
+        if error.__module__ == exceptions.__name__:
+            patches.patch(error, "__init__", raised)
+    for owner in (DeepDict, LazyDeepDict):
+        patches.patch(owner, "get", swallowing)
+        patches.patch(owner, "__contains__", swallowing)
+    patches.patch(_PathKey, "present", swallowing)
+    patches.patch(matcher, "_match", swallowing)
+
+    for strategy_type in _subclasses(Strategy):
+        # The default `Strategy.test` is never called by `DeepMerger`, and patching it would change its dispatch.
+        if "test" in vars(strategy_type) and strategy_type is not Strategy:
+            patches.patch(strategy_type, "test", by_type("test", "merger.{}.tests"))
+        if "__call__" in vars(strategy_type):
+            patches.patch(strategy_type, "__call__", by_type("__call__", "merger.{}.calls", "merger.{}.seconds"))
+        if "merge_all" in vars(strategy_type):
+            patches.patch(strategy_type, "merge_all", by_type("merge_all", "merger.{}.merge_all", "merger.{}.seconds"))
+
+
+def _subclasses(cls):
+    found = [cls]
+    for subclass in cls.__subclasses__():
+        found.extend(_subclasses(subclass))
+    return list(dict.fromkeys(found))
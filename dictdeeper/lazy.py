@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+# Python imports
+import json
+import re
+from collections.abc import Mapping, Sequence
+
+# Internal imports
+from dictdeeper.core import Traversor, compile_key
+from dictdeeper.exceptions import DeepDictIndexError, DeepDictKeyError, DeepDictValueError
+from dictdeeper.matcher import DictMatcher, ListMatcher
+from dictdeeper.spec import CompiledSpec
+
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+_SCALAR = re.compile(rb"[^,:\]}\s]+")
+
+_QUOTE, _OPEN_OBJECT, _CLOSE_OBJECT, _OPEN_ARRAY, _CLOSE_ARRAY = b'"{}[]'
+_COLON, _COMMA = b":,"
+
+
+class _Scanner:
+    """
+    Find where the JSON values in `data` start and end, without decoding them.
+
+    Everything found is memoized by offset, so each subtree is scanned at most once however often it's accessed.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview | str):
+        if isinstance(data, str):
+            data = data.encode()
+        self.data = data
+        self.ends = {}
+        self.objects = {}
+        self.arrays = {}
+
+    def error(self, pos):
+        return ValueError(f"Invalid JSON at offset {pos}.")
+
+    def skip_whitespace(self, pos):
+        return _WHITESPACE.match(self.data, pos).end()
+
+    def expect(self, pos, char):
+        pos = self.skip_whitespace(pos)
+        if pos >= len(self.data) or self.data[pos] != char:
+            raise self.error(pos)
+        return pos + 1
+
+    def kind(self, pos):
+        if pos >= len(self.data):
+            raise self.error(pos)
+        return self.data[pos]
+
+    def end(self, pos):
+        """Return the offset right after the value starting at `pos`."""
+        try:
+            return self.ends[pos]
+        except KeyError:
+            pass
+
+        kind = self.kind(pos)
+        if kind == _QUOTE:
+            match = _STRING.match(self.data, pos)
+        elif kind in (_OPEN_OBJECT, _OPEN_ARRAY):
+            return self._end_of_container(pos)
+        else:
+            match = _SCALAR.match(self.data, pos)
+        if match is None:
+            raise self.error(pos)
+
+        end = self.ends[pos] = match.end()
+        return end
+
+    def _end_of_container(self, pos):
+        starts = []
+        match = _STRUCTURE.search(self.data, pos)
+        while match is not None:
+            start = match.start()
+            kind = self.data[start]
+            if kind == _QUOTE:
+                string = _STRING.match(self.data, start)
+                if string is None:
+                    raise self.error(start)
+                match = _STRUCTURE.search(self.data, string.end())
+                continue
+            if kind in (_OPEN_OBJECT, _OPEN_ARRAY):
+                starts.append(start)
+            else:
+                self.ends[starts.pop()] = match.end()
+                if not starts:
+                    return match.end()
+            match = _STRUCTURE.search(self.data, match.end())
+        raise self.error(pos)
+
+    def object(self, pos):
+        """Return the offsets of the values of the object starting at `pos`, by key."""
+        try:
+            return self.objects[pos]
+        except KeyError:
+            pass
+
+        offsets = {}
+        cursor = self.skip_whitespace(pos + 1)
+        if self.kind(cursor) == _CLOSE_OBJECT:
+            cursor += 1
+        while self.data[cursor - 1] != _CLOSE_OBJECT:
+            cursor = self.skip_whitespace(cursor)
+            if self.kind(cursor) != _QUOTE:
+                raise self.error(cursor)
+            key_end = self.end(cursor)
+            key = bytes(self.data[cursor:key_end])
+            key = json.loads(key) if b"\\" in key else key[1:-1].decode()
+            cursor = self.skip_whitespace(self.expect(key_end, _COLON))
+            offsets[key] = cursor
+            cursor = self.skip_whitespace(self.end(cursor))
+            if self.kind(cursor) not in (_COMMA, _CLOSE_OBJECT):
+                raise self.error(cursor)
+            cursor += 1
+
+        self.ends[pos] = cursor
+        self.objects[pos] = offsets
+        return offsets
+
+    def array(self, pos):
+        """Return the offsets of the items of the array starting at `pos`."""
+        try:
+            return self.arrays[pos]
+        except KeyError:
+            pass
+
+        offsets = []
+        cursor = self.skip_whitespace(pos + 1)
+        if self.kind(cursor) == _CLOSE_ARRAY:
+            cursor += 1
+        while self.data[cursor - 1] != _CLOSE_ARRAY:
+            cursor = self.skip_whitespace(cursor)
+            offsets.append(cursor)
+            cursor = self.skip_whitespace(self.end(cursor))
+            if self.kind(cursor) not in (_COMMA, _CLOSE_ARRAY):
+                raise self.error(cursor)
+            cursor += 1
+
+        self.ends[pos] = cursor
+        self.arrays[pos] = offsets
+        return offsets
+
+    def decode(self, pos):
+        end = self.end(pos)
+        return json.loads(bytes(self.data[pos:end]))
+
+
+def LazyFactory(scanner: _Scanner, pos):  # noqa
+    kind = scanner.kind(pos)
+    if kind == _OPEN_OBJECT:
+        return LazyDeepDict(scanner, pos)
+    if kind == _OPEN_ARRAY:
+        return LazyDeepList(scanner, pos)
+    return scanner.decode(pos)
+
+
+class _LazyValue:
+    __slots__ = ("scanner", "offset", "_wrapped_obj")
+
+    _kind = None
+
+    def __init__(self, data, offset=None):
+        self.scanner = data if isinstance(data, _Scanner) else _Scanner(data)
+        self.offset = self.scanner.skip_whitespace(0) if offset is None else offset
+        if self.scanner.kind(self.offset) != self._kind:
+            raise self.scanner.error(self.offset)
+
+    def __repr__(self):
+        start, end = self.offset, self.scanner.end(self.offset)
+        raw = bytes(self.scanner.data[start:end])
+        return f"{self.__class__.__name__}({raw!r})"
+
+    @property
+    def wrapped_obj(self):
+        """The fully decoded value, decoded on first access."""
+        try:
+            return self._wrapped_obj
+        except AttributeError:
+            self._wrapped_obj = self.scanner.decode(self.offset)
+            return self._wrapped_obj
+
+    def _resolve(self, key):
+        key = compile_key(key)
+        if not key.wildcard:
+            return LazyFactory(self.scanner, self._walk(key, len(key.parts)))
+
+        pos = self._walk(key, key.first)
+        if self.scanner.kind(pos) not in (_OPEN_OBJECT, _OPEN_ARRAY):
+            raise DeepDictValueError(key.key_at(key.first))
+        return Traversor.expand(self.scanner.decode(pos), key, key.first)
+
+    def _walk(self, key, stop):
+        scanner = self.scanner
+        pos = self.offset
+        for position, (part, index) in enumerate(zip(key.parts[:stop], key.indexes[:stop])):
+            kind = scanner.kind(pos)
+            if kind == _OPEN_OBJECT:
+                try:
+                    pos = scanner.object(pos)[part]
+                except KeyError as e:
+                    raise DeepDictKeyError(key.key_at(position)) from e
+            elif kind == _OPEN_ARRAY:
+                try:
+                    pos = scanner.array(pos)[int(part) if index is None else index]
+                except IndexError as e:
+                    raise DeepDictIndexError(key.key_at(position)) from e
+            else:
+                raise DeepDictValueError(key.key_at(position))
+
+        return pos
+
+
+class LazyDeepDict(_LazyValue, Mapping):
+    """
+    A `DeepDict` over the raw bytes of a JSON object, decoding only the values that are accessed.
+    """
+
+    __slots__ = ()
+
+    _kind = _OPEN_OBJECT
+
+    def __contains__(self, key):
+        try:
+            _ = self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __eq__(self, spec: Mapping | CompiledSpec):
+        """Convenience method to match against a spec."""
+        return DictMatcher(self.wrapped_obj).matches(spec)
+
+    def check(self, spec: Mapping | CompiledSpec):
+        """Like `==`, but return False on mismatch instead of raising `MatcherError`."""
+        return DictMatcher(self.wrapped_obj).check(spec)
+
+    def __iter__(self):
+        yield from self.scanner.object(self.offset)
+
+    def __len__(self):
+        return len(self.scanner.object(self.offset))
+
+    def __getitem__(self, key):
+        return self._resolve(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_many(self, keys, default=None):
+        return [self.get(key, default) for key in keys]
+
+    def keys(self):
+        return self.scanner.object(self.offset).keys()
+
+    def items(self):
+        for key, pos in self.scanner.object(self.offset).items():
+            yield key, LazyFactory(self.scanner, pos)
+
+    def values(self):
+        for pos in self.scanner.object(self.offset).values():
+            yield LazyFactory(self.scanner, pos)
+
+
+class LazyDeepList(_LazyValue, Sequence):
+    """
+    A `DeepList` over the raw bytes of a JSON array, decoding only the values that are accessed.
+    """
+
+    __slots__ = ()
+
+    _kind = _OPEN_ARRAY
+
+    def __contains__(self, item):
+        return self.check([item, ...])
+
+    def __getitem__(self, index):
+        if isinstance(index, int):
+            return LazyFactory(self.scanner, self.scanner.array(self.offset)[index])
+
+        return self._resolve(index)
+
+    def __iter__(self):
+        for pos in self.scanner.array(self.offset):
+            yield LazyFactory(self.scanner, pos)
+
+    def __eq__(self, spec: list | CompiledSpec):
+        """Convenience method to match against a spec."""
+        return ListMatcher(self.wrapped_obj).matches(spec)
+
+    def check(self, spec: list | CompiledSpec):
+        """Like `==`, but return False on mismatch instead of raising `MatcherError`."""
+        return ListMatcher(self.wrapped_obj).check(spec)
+
+    def __len__(self):
+        return len(self.scanner.array(self.offset))
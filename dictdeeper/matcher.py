@@ -1,30 +1,15 @@
 from __future__ import annotations
 
 # Python imports
-import decimal
-import re
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Mapping
-from unittest.mock import sentinel
-from uuid import UUID
-
-# Pip imports
-import arrow
+from collections.abc import Mapping
+from itertools import islice
+from typing import NamedTuple
 
 # Internal imports
-from dictdeeper.exceptions import (
-    MatcherDatetimeMismatch,
-    MatcherError,
-    MatcherKeysDoNotMatch,
-    MatcherLengthTooLong,
-    MatcherLengthTooShort,
-    MatcherMissingRequiredKey,
-    MatcherNoMatchFound,
-    MatcherRegexMismatch,
-    MatcherTypeMismatch,
-    MatcherValueMismatch,
-)
+from dictdeeper.exceptions import MatcherError, MatcherTypeMismatch
+from dictdeeper.parallel import imap_ordered
+from dictdeeper.spec import CompiledSpec, DictSpec, ListSpec, UnorderedListSpec, compile_spec
 
 
 class Matcher(ABC):
@@ -46,64 +31,38 @@ class Matcher(ABC):
 
     @staticmethod
     def validate_match(value, spec, key_location):
+        if isinstance(value, Matcher):
+            value = value.wrapped_obj
+        return compile_spec(spec).matches(value, key_location)
 
-        # Ellipsis: Always match.
-        if spec is ...:
-            return True
-
-        # None: Raise error if not None.
-        if spec is None and value is not None:
-            raise MatcherTypeMismatch(key_location, spec, value)
-
-        # Dict: Recursively match.
-        if isinstance(value, DictMatcher) and isinstance(spec, Mapping):
-            return value.matches(spec, location=key_location)
-
-        # List: Recursively match.
-        if isinstance(value, ListMatcher) and isinstance(spec, (list, tuple)):
-            return value.matches(spec, location=key_location)
-
-        # Regex: Match value with spec.
-        if isinstance(spec, re.Pattern):
-            if not spec.match(value):
-                raise MatcherRegexMismatch(key_location, spec, value)
-            return True
-
-        # Datetime: Normalize and compare.
-        if isinstance(spec, (arrow.Arrow, datetime)):
-            try:
-                if arrow.get(value) != arrow.get(spec):
-                    raise MatcherDatetimeMismatch(key_location, spec, value)
-            except arrow.ParserError as e:
-                raise MatcherTypeMismatch(key_location, spec, value) from e
-            return True
-
-        # UUID: Normalize for later comparison.
-        if isinstance(spec, UUID):
-            value = str(value).lower()
-            spec = str(spec)
-
-        # Decimal: Normalize for later comparison.
-        if isinstance(spec, decimal.Decimal):
-            try:
-                value = decimal.Decimal(value)
-            except Exception as e:
-                raise MatcherTypeMismatch(key_location, spec, value) from e
-
-        # Final comparison.
-        if value != spec:
-            raise MatcherValueMismatch(key_location, spec, value)
-
-        return True
-
+    @staticmethod
     @abstractmethod
+    def accepts(spec: CompiledSpec) -> bool:
+        """Whether `spec` is a spec for the kind of values this matcher wraps."""
+
+    def check(self, spec):
+        """Deeply compare `self.wrapped_obj` with `spec`, returning False on mismatch instead of raising."""
+        spec = compile_spec(spec)
+        return self.accepts(spec) and spec.check(self.wrapped_obj)
+
     def matches(self, spec, location=""):
-        """Deeply compare `self.wrapped_obj` with `spec`, including `location` with any `MatcherError` raised."""
+        """Deeply compare `self.wrapped_obj` with `spec`, including `location` with any `MatcherError` raised.
+
+        `spec` may be given already compiled with `compile_spec`, to skip compiling it again on every call.
+        """
+        spec = compile_spec(spec)
+        if not self.accepts(spec):
+            raise MatcherTypeMismatch(location, spec.spec, self.wrapped_obj)
+        return spec.check(self.wrapped_obj) or spec.matches(self.wrapped_obj, location)
 
 
 class DictMatcher(Matcher):
     wrapped_obj: dict
 
+    @staticmethod
+    def accepts(spec):
+        return isinstance(spec, DictSpec)
+
     def get_wrapped(self, key, spec, default=None):
         try:
             value = self.wrapped_obj[key]
@@ -111,58 +70,77 @@ class DictMatcher(Matcher):
             return default
         return self.wrap_value(value, spec)
 
-    def matches(self, spec: Mapping, location=""):
-        if set(self.wrapped_obj) != set(spec) and ... not in spec:
-            raise MatcherKeysDoNotMatch(location, tuple(self.wrapped_obj), tuple(spec))
-        for key in spec:
-            key_location = f"{location}.{key}" if location else str(key)
-            subspec = spec[key]
-            wrapped_value = self.get_wrapped(key, subspec, sentinel.DOES_NOT_EXIST)
-            if key is ...:
-                continue
-            if subspec is ... and wrapped_value is sentinel.DOES_NOT_EXIST:
-                raise MatcherMissingRequiredKey(key_location)
-            self.validate_match(wrapped_value, subspec, key_location)
-        return True
-
 
 class ListMatcher(Matcher):
     wrapped_obj: list
 
-    def matches(self, spec: list, location=""):
-        if isinstance(spec, list) and ... in spec:
-            return self._matches_unordered(spec, location)
-        else:
-            return self._matches_ordered(spec, location)
+    @staticmethod
+    def accepts(spec):
+        return isinstance(spec, ListSpec)
 
     def _matches_ordered(self, spec: list, location=""):
-        if len(spec) < len(self.wrapped_obj):
-            raise MatcherLengthTooShort(location, spec, self.wrapped_obj)
-        if len(spec) > len(self.wrapped_obj):
-            raise MatcherLengthTooLong(location, spec, self.wrapped_obj)
-        for index, (value, subspec) in enumerate(zip(self.wrapped_obj, spec)):
-            key_location = f"{location}.{index}" if location else str(index)
-            wrapped_value = self.wrap_value(value, subspec)
-            self.validate_match(wrapped_value, subspec, key_location)
-        return True
+        return ListSpec(spec).matches(self.wrapped_obj, location)
 
     def _matches_unordered(self, spec: list, location=""):
-        values = self.wrapped_obj.copy()
-        for subspec in spec:
-            if subspec is ...:
-                continue
-            for index, value in enumerate(values):
-                if value is sentinel.MATCH_FOUND:
-                    continue
-                value = self.wrap_value(value, subspec)
-                try:
-                    self.validate_match(value, subspec, location)
-                except MatcherError:
-                    continue
-                else:
-                    values[index] = sentinel.MATCH_FOUND
-                    break
-            else:
-                remaining_values = [value for value in values if value is not sentinel.MATCH_FOUND]
-                raise MatcherNoMatchFound(location, subspec, remaining_values)
-        return True
+        return UnorderedListSpec(spec).matches(self.wrapped_obj, location)
+
+
+class MatchResult(NamedTuple):
+    """Whether a document matched, and when it didn't, the location and `MatcherError` of the first mismatch."""
+
+    matched: bool
+    location: str | None = None
+    error: MatcherError | None = None
+
+
+def match_many(spec, documents, workers=None, chunksize=256, window=None):
+    """
+    Match every document in `documents` against `spec`, yielding a `MatchResult` for each of them, in order.
+
+    `spec` is compiled once and sent to each worker of a process pool of `workers`, or matched in this process
+    when `workers` is 1. Documents are sent to the workers in chunks of `chunksize`, with at most `window` chunks
+    in flight at once, so memory stays bounded however many documents there are.
+    """
+    spec = compile_spec(spec)
+    chunks = _chunks((_unwrap(document) for document in documents), chunksize)
+    if workers == 1:
+        _init_worker(spec)
+        results = map(_match_chunk, chunks)
+    else:
+        results = imap_ordered(_match_chunk, chunks, workers, window, initializer=_init_worker, initargs=(spec,))
+
+    for chunk in results:
+        yield from chunk
+
+
+def _unwrap(document):
+    # Wrappers are unwrapped to send only the documents themselves to the workers.
+    return getattr(document, "wrapped_obj", document)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+_worker = {}
+
+
+def _init_worker(spec):
+    _worker["spec"] = spec
+
+
+def _match_chunk(documents):
+    spec = _worker["spec"]
+    return [_match(spec, document) for document in documents]
+
+
+def _match(spec, document):
+    if spec.check(document):
+        return MatchResult(True)
+    try:
+        spec.matches(document)
+    except MatcherError as e:
+        return MatchResult(False, e.args[0] if e.args else "", e)
+    return MatchResult(True)
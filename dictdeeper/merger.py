@@ -1,13 +1,27 @@
 # Python imports
-from itertools import zip_longest
+import copy
+from functools import reduce
+from itertools import chain, islice, zip_longest
+
+# Internal imports
+from dictdeeper.core import Traversor, compile_key
 
 
 class Strategy:
+    # The `(a, b)` types this strategy can apply to, so `DeepMerger` only tests it for matching values.
+    # Strategies that declare `types` and don't override `test` are applied without being tested at all.
+    types = None
+    # Whether merging a value with an equal one always gives an equal value, so `DeepMerger` can skip the merge
+    # of subtrees with the same fingerprint.
+    idempotent = False
+
     def test(self, a, b):
         """
         Test if this strategy should be applied.
         """
-        raise NotImplementedError("Must implement test method.")
+        if self.types is None:
+            raise NotImplementedError("Must implement test method.")
+        return isinstance(a, self.types[0]) and isinstance(b, self.types[1])
 
     def __call__(self, a, b, merger):
         """
@@ -15,66 +29,297 @@ class Strategy:
         """
         raise NotImplementedError("Must implement __call__ method.")
 
+    def merge_all(self, values, merger):
+        """
+        Execute the merging strategy over all `values` at once.
+        """
+        return reduce(lambda a, b: self(a, b, merger), values)
+
 
 class MergeListOfDictsByPosition(Strategy):
+    types = (list, list)
+    idempotent = True
+
     def test(self, a, b):
-        return isinstance(a, list) and isinstance(b, list) and all(isinstance(item, dict) for item in a + b)
+        return isinstance(a, list) and isinstance(b, list) and all(isinstance(item, dict) for item in chain(a, b))
 
     def __call__(self, a, b, merger):
-        return list(merger(i, j) for i, j in zip_longest(a, b, fillvalue={}))
+        merged = [merger({} if i is None else i, {} if j is None else j) for i, j in zip_longest(a, b)]
+        return merger.reuse(a, merged)
 
 
 class MergeListsOfDictsByKey(Strategy):
-    def __init__(self, key, condition=lambda d: True):
-        self.condition = condition
+    """
+    Merge the dicts of two lists that have the same key, as returned by `key(idx, item)`.
+
+    `key` may also be a dotted key, and then only lists where every dict has it are merged by default.
+    """
+
+    types = (list, list)
+
+    def __init__(self, key, condition=None):
+        if isinstance(key, str):
+            key = _PathKey(key)
+            condition = key.present if condition is None else condition
+        self.condition = (lambda d: True) if condition is None else condition
         self.strategy = key
 
     def test(self, a, b):
         return (
             isinstance(a, list)
             and isinstance(b, list)
-            and all(isinstance(item, dict) and self.condition(item) for item in a + b)
+            and all(isinstance(item, dict) and self.condition(item) for item in chain(a, b))
         )
 
     def __call__(self, a, b, merger):
-        temp_dict = {self.strategy(idx, item): item for idx, item in enumerate(a)}
-        for idx, new_item in enumerate(b):
-            item_key = self.strategy(idx, new_item)
-            if item_key in temp_dict:
-                temp_dict[item_key] = merger(temp_dict[item_key], new_item)
-            else:
-                temp_dict[item_key] = new_item
+        return merger.reuse(a, self._merge_into({}, (a, b), merger))
+
+    def merge_all(self, values, merger):
+        """
+        Merge the dicts of all the lists in `values` through a single table of the items by key.
+
+        A `key` callable may depend on the position of the items, so it falls back to merging pairwise.
+        """
+        if not isinstance(self.strategy, _PathKey):
+            return super().merge_all(values, merger)
+        return merger.reuse(values[0], self._merge_into({}, values, merger))
+
+    def _merge_into(self, temp_dict, values, merger):
+        for position, items in enumerate(values):
+            if position == 0:
+                temp_dict.update((self.strategy(idx, item), item) for idx, item in enumerate(items))
+                continue
+            for idx, new_item in enumerate(items):
+                item_key = self.strategy(idx, new_item)
+                if item_key in temp_dict:
+                    temp_dict[item_key] = merger(temp_dict[item_key], new_item)
+                else:
+                    temp_dict[item_key] = merger.adopt(new_item)
         return list(temp_dict.values())
 
 
+class _PathKey:
+    """The value of an item at a dotted key, as a picklable key for `MergeListsOfDictsByKey`."""
+
+    def __init__(self, key):
+        self.key = compile_key(key)
+        self.stop = len(self.key.parts)
+        # Keys of a single part, like most ids, are looked up directly.
+        self.part = self.key.parts[0] if self.stop == 1 else None
+
+    def __call__(self, idx, item):
+        if self.part is not None and isinstance(item, dict):
+            return item[self.part]
+        return Traversor._walk(item, self.key, self.stop)
+
+    def present(self, item):
+        if self.part is not None and isinstance(item, dict):
+            return self.part in item
+        try:
+            Traversor._walk(item, self.key, self.stop)
+        except KeyError:
+            return False
+        return True
+
+
 class CombineLists(Strategy):
-    def test(self, a, b):
-        return isinstance(a, list) and isinstance(b, list)
+    types = (list, list)
 
     def __call__(self, a, b, merger):
+        if merger.mode == merger.INPLACE:
+            a.extend(map(merger.adopt, b))
+            return a
+        if merger.mode == merger.SHARE and not (a and b):
+            return a or b
         return a + b
 
+    def merge_all(self, values, merger):
+        if merger.mode == merger.INPLACE:
+            values[0].extend(map(merger.adopt, chain.from_iterable(values[1:])))
+            return values[0]
+        return list(chain.from_iterable(values))
+
 
 class MergeDicts(Strategy):
-    def test(self, a, b):
-        return isinstance(a, dict) and isinstance(b, dict)
+    types = (dict, dict)
+    idempotent = True
 
     def __call__(self, a, b, merger):
         return merger(a, b)
 
+    def merge_all(self, values, merger):
+        return merger.merge_all(values)
+
 
 class DeepMerger:
-    def __init__(self, strategies=(MergeDicts(),)):
-        self.strategies = strategies
+    """
+    Deeply merge `b` into `a` with the first strategy that applies to each pair of values.
+
+    The `mode` decides what happens to `a`:
+    - `COPY` copies every dict and list along the paths found in `b`, leaving `a` untouched.
+    - `SHARE` also leaves `a` untouched, but only copies what `b` actually changes, reusing `a` itself otherwise.
+    - `INPLACE` updates `a` directly, for callers who own it.
+
+    In `COPY` and `SHARE` modes, the result may share the subtrees of `a` and `b` that didn't need merging.
+    In `INPLACE` mode, the dicts and lists taken from `b` are copied, so merging into `a` again never changes `b`.
+
+    With `fingerprints`, a `Fingerprints` cache, equal dicts and lists are not merged at all, and the one from `a`
+    is kept. This requires every strategy to be idempotent, and the `COPY` or `SHARE` mode.
+    """
+
+    COPY = "copy"
+    SHARE = "share"
+    INPLACE = "inplace"
+    MODES = (COPY, SHARE, INPLACE)
+
+    def __init__(self, strategies=(MergeDicts(),), mode=COPY, fingerprints=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown merge mode {mode!r}, expected one of {self.MODES}.")
+        self.strategies = tuple(strategies)
+        self.mode = mode
+        if fingerprints is not None and not all(strategy.idempotent for strategy in self.strategies):
+            raise ValueError("Fingerprints can only skip merges when every strategy is idempotent.")
+        if fingerprints is not None and mode == self.INPLACE:
+            raise ValueError(
+                "Fingerprints can't be used in INPLACE mode, which changes the dicts and lists they cache."
+            )
+        self.fingerprints = fingerprints
+        self._dispatch_table = {}
 
     def __call__(self, a: dict, b: dict):
-        result = a.copy()
+        if self.mode == self.COPY:
+            result = a.copy()
+            for k, v in b.items():
+                result[k] = self.merge_values(result.get(k, None), v)
+            return result
+
+        result = a
         for k, v in b.items():
-            result[k] = self.merge_values(result.get(k, None), v)
+            a_val = a.get(k, None)
+            merged = self.merge_values(a_val, v)
+            if merged is a_val and k in a:
+                continue
+            if result is a and self.mode == self.SHARE:
+                result = a.copy()
+            result[k] = merged
         return result
 
-    def merge_values(self, a_val, b_val):
+    def merge_all(self, dicts, workers=None, chunksize=64):
+        """
+        Merge all `dicts`, with the same result as merging them one after the other.
+
+        Each key is merged once, across all the values found for it. When all those values have the same type
+        and a strategy applies to them without being tested, it merges them all at once.
+
+        With `workers`, chunks of `chunksize` dicts are merged in a process pool, then the partial results are
+        merged the same way until one is left. This only gives the same result when the strategies are
+        associative, and requires the merger to be picklable.
+        """
+        if workers:
+            return self._merge_all_in_pool(dicts, workers, chunksize)
+
+        first = None
+        values_by_key = {}
+        for d in dicts:
+            if first is None:
+                first = d
+            for k, v in d.items():
+                values_by_key.setdefault(k, []).append(v)
+
+        if first is None:
+            return {}
+
+        result = first if self.mode == self.INPLACE else {}
+        for k, values in values_by_key.items():
+            result[k] = self._merge_all_values(values, from_first=k in first)
+        return result
+
+    def _merge_all_values(self, values, from_first):
+        if len(values) > 1:
+            value_type = type(values[0])
+            candidates = self.dispatch(value_type, value_type)
+            if (
+                candidates
+                and not candidates[0][1]
+                and (from_first or not self.dispatch(type(None), value_type))
+                and all(type(value) is value_type for value in values)
+            ):
+                if not from_first:
+                    # Only the first dict may be changed in place, so a value from another one is merged into a copy.
+                    values = [self.adopt(values[0]), *islice(values, 1, None)]
+                return candidates[0][0].merge_all(values, merger=self)
+
+        result = values[0] if from_first else self.merge_values(None, values[0])
+        for value in islice(values, 1, None):
+            result = self.merge_values(result, value)
+        return result
+
+    def _merge_all_in_pool(self, dicts, workers, chunksize):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as executor:
+            partials = list(executor.map(self.merge_all, _chunks(dicts, chunksize)))
+            while len(partials) > 1:
+                partials = list(executor.map(self.merge_all, _chunks(partials, max(chunksize, 2))))
+        return partials[0] if partials else {}
+
+    def reuse(self, original: list, merged: list):
+        """
+        Return the `merged` items of the `original` list the way the merge mode expects.
+        """
+        if self.mode == self.COPY:
+            return merged
+        if len(merged) == len(original) and all(m is o for m, o in zip(merged, original)):
+            return original
+        if self.mode == self.INPLACE:
+            original[:] = merged
+            return original
+        return merged
+
+    def adopt(self, value):
+        """
+        Return `value`, taken from `b`, the way the merge mode expects: a deep copy in `INPLACE` mode.
+        """
+        if self.mode == self.INPLACE and isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def dispatch(self, a_type, b_type):
+        """Return the `(strategy, needs_test)` pairs that may apply to values of `a_type` and `b_type`."""
+        try:
+            return self._dispatch_table[a_type, b_type]
+        except KeyError:
+            pass
+
+        candidates = []
         for strategy in self.strategies:
-            if strategy.test(a_val, b_val):
+            types = strategy.types
+            if types is not None and not (issubclass(a_type, types[0]) and issubclass(b_type, types[1])):
+                continue
+            needs_test = types is None or type(strategy).test is not Strategy.test
+            candidates.append((strategy, needs_test))
+            if not needs_test:
+                break
+
+        candidates = self._dispatch_table[a_type, b_type] = tuple(candidates)
+        return candidates
+
+    def merge_values(self, a_val, b_val):
+        if self.fingerprints is not None and self._same_fingerprint(a_val, b_val):
+            return a_val
+        for strategy, needs_test in self.dispatch(type(a_val), type(b_val)):
+            if not needs_test or strategy.test(a_val, b_val):
                 return strategy(a_val, b_val, merger=self)
-        return b_val
+        return self.adopt(b_val)
+
+    def _same_fingerprint(self, a_val, b_val):
+        if type(a_val) is not type(b_val) or not isinstance(a_val, (dict, list)):
+            return False
+        digest = self.fingerprints(a_val)
+        return digest is not None and digest == self.fingerprints(b_val)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,28 @@
+# Python imports
+import os
+from collections import deque
+
+
+def imap_ordered(fn, iterable, workers=None, window=None, initializer=None, initargs=()):
+    """
+    Map `fn` over `iterable` in a process pool, yielding the results in order.
+
+    At most `window` items are in flight at once, twice the number of workers by default,
+    so memory stays bounded however long `iterable` is.
+    """
+    # `concurrent.futures.process` pulls in `multiprocessing`, so it is only imported when a pool is needed.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    window = window or 2 * workers
+    executor = ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs)
+    try:
+        pending = deque()
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+# Python imports
+import copy
+from typing import Any, NamedTuple
+
+# Internal imports
+from dictdeeper.merger import MergeListsOfDictsByKey
+
+
+ADD = "add"
+REMOVE = "remove"
+CHANGE = "change"
+
+
+class Operation(NamedTuple):
+    """
+    One change between two documents, at the dotted `path` matcher errors report.
+
+    `keys` holds the dict keys and list positions of `path`, as `apply_patch` follows them.
+    An `add` to a list inserts at its position, and a `remove` deletes it.
+    """
+
+    op: str
+    path: str
+    old: Any
+    new: Any
+    keys: tuple
+
+
+def diff(a, b, key=None, fingerprint=None):
+    """
+    Return the list of operations that turn `a` into `b`.
+
+    Subtrees that are the same object, or that have the same `fingerprint(value)` when given, are skipped.
+    With `key`, a callable or dotted key as for `MergeListsOfDictsByKey`, lists of dicts are aligned by key
+    instead of by position. Lists where the items that remain aren't in the same order are changed as a whole.
+    """
+    aligner = key if key is None or isinstance(key, MergeListsOfDictsByKey) else MergeListsOfDictsByKey(key)
+    ops = []
+    _Differ(aligner, fingerprint, ops).diff(a, b, "", ())
+    return ops
+
+
+class _Differ:
+    def __init__(self, aligner, fingerprint, ops):
+        self.aligner = aligner
+        self.fingerprint = fingerprint
+        self.ops = ops
+
+    def diff(self, a, b, path, keys):
+        if a is b:
+            return
+        if isinstance(a, dict) and isinstance(b, dict):
+            if not self.same(a, b):
+                self.diff_dicts(a, b, path, keys)
+        elif isinstance(a, list) and isinstance(b, list):
+            if self.same(a, b):
+                return
+            if self.aligner is not None and self.aligner.test(a, b):
+                self.diff_lists_by_key(a, b, path, keys)
+            else:
+                self.diff_lists(a, b, path, keys)
+        elif type(a) is not type(b) or a != b:
+            self.ops.append(Operation(CHANGE, path, a, b, keys))
+
+    def same(self, a, b):
+        if self.fingerprint is None:
+            return False
+        # Subtrees holding values that can't be fingerprinted have no digest, and must still be compared.
+        digest = self.fingerprint(a)
+        return digest is not None and digest == self.fingerprint(b)
+
+    def diff_dicts(self, a, b, path, keys):
+        for k, a_val in a.items():
+            if k not in b:
+                self.ops.append(Operation(REMOVE, _join(path, k), a_val, None, keys + (k,)))
+        for k, b_val in b.items():
+            if k in a:
+                self.diff(a[k], b_val, _join(path, k), keys + (k,))
+            else:
+                self.ops.append(Operation(ADD, _join(path, k), None, b_val, keys + (k,)))
+
+    def diff_lists(self, a, b, path, keys):
+        for index, (a_val, b_val) in enumerate(zip(a, b)):
+            self.diff(a_val, b_val, _join(path, index), keys + (index,))
+        for index in range(len(a) - 1, len(b) - 1, -1):
+            self.ops.append(Operation(REMOVE, _join(path, index), a[index], None, keys + (index,)))
+        for index in range(len(a), len(b)):
+            self.ops.append(Operation(ADD, _join(path, index), None, b[index], keys + (index,)))
+
+    def diff_lists_by_key(self, a, b, path, keys):
+        key = self.aligner.strategy
+        try:
+            a_keys = {key(idx, item): idx for idx, item in enumerate(a)}
+            b_keys = {key(idx, item): idx for idx, item in enumerate(b)}
+        except TypeError:
+            # Keys that are lists or dicts can't be aligned.
+            return self.diff_lists(a, b, path, keys)
+        if len(a_keys) != len(a) or len(b_keys) != len(b):
+            # Keys that aren't unique can't be aligned.
+            return self.diff_lists(a, b, path, keys)
+
+        kept = [item_key for item_key in a_keys if item_key in b_keys]
+        if kept != [item_key for item_key in b_keys if item_key in a_keys]:
+            self.ops.append(Operation(CHANGE, path, a, b, keys))
+            return
+
+        for item_key, index in reversed(a_keys.items()):
+            if item_key not in b_keys:
+                self.ops.append(Operation(REMOVE, _join(path, index), a[index], None, keys + (index,)))
+        for item_key, index in b_keys.items():
+            if item_key not in a_keys:
+                self.ops.append(Operation(ADD, _join(path, index), None, b[index], keys + (index,)))
+        for item_key in kept:
+            index = b_keys[item_key]
+            self.diff(a[a_keys[item_key]], b[index], _join(path, index), keys + (index,))
+
+
+def _join(path, key):
+    return f"{path}.{key}" if path else str(key)
+
+
+def apply_patch(obj, ops, inplace=False):
+    """
+    Apply the operations returned by `diff` to `obj`, and return the result.
+
+    Unless `inplace`, `obj` is deep-copied first. The values in `ops` are inserted as they are.
+    """
+    if not inplace:
+        obj = copy.deepcopy(obj)
+
+    for op in ops:
+        if not op.keys:
+            obj = op.new
+            continue
+
+        parent = obj
+        for k in op.keys[:-1]:
+            parent = parent[k]
+        last = op.keys[-1]
+        if op.op == REMOVE:
+            del parent[last]
+        elif op.op == ADD and isinstance(parent, list):
+            parent.insert(last, op.new)
+        else:
+            parent[last] = op.new
+    return obj
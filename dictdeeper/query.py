@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+# Python imports
+import json
+import mmap
+import time
+from dataclasses import dataclass
+
+# Internal imports
+from dictdeeper.core import Extractor
+from dictdeeper.parallel import imap_ordered
+from dictdeeper.spec import compile_spec
+
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class QueryStats:
+    lines: int = 0
+    matched: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def lines_per_second(self):
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self):
+        return self.bytes / self.seconds / 1024 / 1024 if self.seconds else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.matched}/{self.lines} lines matched in {self.seconds:.2f}s "
+            f"({self.lines_per_second:,.0f} lines/s, {self.megabytes_per_second:,.1f} MiB/s)"
+        )
+
+
+def query_jsonl(path, keys, spec=None, default=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    """
+    Yield the values of `keys` for every line of the JSON Lines file at `path` that matches `spec`, in order.
+
+    The file is memory-mapped and split into chunks of about `chunk_size` bytes on line boundaries.
+    Each chunk is read by a process pool of `workers`, or in this process when `workers` is 1.
+    Pass a `QueryStats` as `stats` to get the throughput of the query.
+    """
+    started = time.perf_counter()
+    stats = QueryStats() if stats is None else stats
+    extractor = keys if isinstance(keys, Extractor) else Extractor(keys)
+    spec = None if spec is None else compile_spec(spec)
+    initargs = (extractor, spec, default)
+    chunks = ((path, start, end) for start, end in _chunks(path, chunk_size))
+
+    if workers == 1:
+        _init_worker(*initargs)
+        results = map(_query_chunk, chunks)
+    else:
+        results = imap_ordered(_query_chunk, chunks, workers, initializer=_init_worker, initargs=initargs)
+
+    try:
+        for rows, lines, size in results:
+            stats.lines += lines
+            stats.matched += len(rows)
+            stats.bytes += size
+            stats.seconds = time.perf_counter() - started
+            yield from rows
+    finally:
+        if workers == 1:
+            _close_worker()
+
+
+def _chunks(path, chunk_size):
+    with open(path, "rb") as f, _mmap(f) as mm:
+        size = len(mm)
+        start = 0
+        while start < size:
+            end = mm.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            yield start, end
+            start = end
+
+
+def _mmap(f):
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can't be memory-mapped.
+        return memoryview(b"")
+
+
+_worker = {}
+
+
+def _init_worker(extractor, spec, default):
+    _worker.update(extractor=extractor, spec=spec, default=default, files={})
+
+
+def _close_worker():
+    # The files mapped by the chunks read in this process are closed once the query is done with them.
+    for mapping in _worker.pop("files", {}).values():
+        if isinstance(mapping, memoryview):
+            mapping.release()
+        else:
+            mapping.close()
+
+
+def _query_chunk(chunk):
+    path, start, end = chunk
+    extractor, spec, default, files = _worker["extractor"], _worker["spec"], _worker["default"], _worker["files"]
+    if path not in files:
+        with open(path, "rb") as f:
+            files[path] = _mmap(f)
+
+    rows = []
+    lines = 0
+    for line in files[path][start:end].splitlines():
+        if not line.strip():
+            continue
+        lines += 1
+        document = json.loads(line)
+        if spec is None or spec.check(document):
+            rows.append(extractor(document, default))
+    return rows, lines, end - start
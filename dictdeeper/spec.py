@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+# Python imports
+import decimal
+import re
+from collections.abc import Mapping
+from datetime import datetime
+from functools import cached_property
+from itertools import chain, islice
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+# Internal imports
+from dictdeeper.exceptions import (
+    MatcherDatetimeMismatch,
+    MatcherKeysDoNotMatch,
+    MatcherLengthTooLong,
+    MatcherLengthTooShort,
+    MatcherMissingRequiredKey,
+    MatcherNoMatchFound,
+    MatcherRegexMismatch,
+    MatcherTypeMismatch,
+    MatcherValueMismatch,
+)
+from dictdeeper.fingerprints import active_fingerprints, fingerprint
+
+
+if TYPE_CHECKING:
+    # Pip imports
+    import arrow
+
+
+class _Sentinel:
+    """A unique marker that keeps its identity when pickled, like `unittest.mock.sentinel` without its import."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"<{self.name}>"
+
+    def __reduce__(self):
+        return self.name
+
+
+_HASHABLE_TYPES = frozenset((str, int, float, bool, type(None)))
+_ITSELF = _Sentinel("_ITSELF")
+_DOES_NOT_EXIST = _Sentinel("_DOES_NOT_EXIST")
+
+
+class CompiledSpec:
+    """A matcher spec turned into a tree of checks, ready to be matched against many values."""
+
+    def __init__(self, spec):
+        self.spec = spec
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.spec!r})"
+
+    def matches(self, value, location=""):
+        """Deeply compare `value` with the spec, including `location` with any `MatcherError` raised.
+
+        Containers only build locations for the values that fail `check`, so the diagnostic walk is cheap
+        when it is run again after a failed `check`.
+        """
+        if value != self.spec:
+            raise MatcherValueMismatch(location, self.spec, value)
+        return True
+
+    def check(self, value):
+        """Deeply compare `value` with the spec, without raising any `MatcherError`."""
+        return not value != self.spec
+
+    @cached_property
+    def digest(self):
+        """The fingerprint of the spec, when it is fully concrete, so any value with the same one matches it."""
+        return fingerprint(self.spec)
+
+    def _same_fingerprint(self, value):
+        fingerprints = active_fingerprints()
+        return fingerprints is not None and self.digest is not None and fingerprints(value) == self.digest
+
+
+class EqualSpec(CompiledSpec):
+    pass
+
+
+class AnySpec(CompiledSpec):
+    def matches(self, value, location=""):
+        return True
+
+    def check(self, value):
+        return True
+
+
+class NoneSpec(CompiledSpec):
+    def matches(self, value, location=""):
+        if value is not None:
+            raise MatcherTypeMismatch(location, self.spec, value)
+        return True
+
+    def check(self, value):
+        return value is None
+
+
+class DictSpec(CompiledSpec):
+    def __init__(self, spec: Mapping):
+        super().__init__(spec)
+        self.keys = set(spec)
+        self.partial = ... in self.keys
+        self.items = tuple((key, str(key), compile_spec(spec[key])) for key in spec if key is not ...)
+
+    def matches(self, value, location=""):
+        if not isinstance(value, Mapping):
+            return super().matches(value, location)
+        if not self.partial and value.keys() != self.keys:
+            raise MatcherKeysDoNotMatch(location, tuple(value), tuple(self.spec))
+        for key, name, subspec in self.items:
+            subvalue = value.get(key, _DOES_NOT_EXIST)
+            if subvalue is not _DOES_NOT_EXIST and subspec.check(subvalue):
+                continue
+            key_location = f"{location}.{name}" if location else name
+            if subvalue is _DOES_NOT_EXIST and isinstance(subspec, AnySpec):
+                raise MatcherMissingRequiredKey(key_location)
+            subspec.matches(subvalue, key_location)
+        return True
+
+    def check(self, value):
+        if not isinstance(value, Mapping):
+            return super().check(value)
+        if self._same_fingerprint(value):
+            return True
+        if not self.partial and value.keys() != self.keys:
+            return False
+        for key, _, subspec in self.items:
+            subvalue = value.get(key, _DOES_NOT_EXIST)
+            if subvalue is _DOES_NOT_EXIST and isinstance(subspec, AnySpec):
+                return False
+            if not subspec.check(subvalue):
+                return False
+        return True
+
+
+class ListSpec(CompiledSpec):
+    def __init__(self, spec: list | tuple):
+        super().__init__(spec)
+        self.items = tuple(compile_spec(subspec) for subspec in spec)
+
+    def matches(self, value, location=""):
+        if not isinstance(value, (list, tuple)):
+            return super().matches(value, location)
+        if len(self.items) < len(value):
+            raise MatcherLengthTooShort(location, self.spec, value)
+        if len(self.items) > len(value):
+            raise MatcherLengthTooLong(location, self.spec, value)
+        for index, (subvalue, subspec) in enumerate(zip(value, self.items)):
+            if not subspec.check(subvalue):
+                subspec.matches(subvalue, f"{location}.{index}" if location else str(index))
+        return True
+
+    def check(self, value):
+        if not isinstance(value, (list, tuple)):
+            return super().check(value)
+        if self._same_fingerprint(value):
+            return True
+        if len(self.items) != len(value):
+            return False
+        return all(subspec.check(subvalue) for subvalue, subspec in zip(value, self.items))
+
+
+class UnorderedListSpec(ListSpec):
+    def __init__(self, spec: list):
+        super().__init__([subspec for subspec in spec if subspec is not ...])
+        self.spec = spec
+        self.probes = tuple(self._probe(subspec) for subspec in self.items)
+
+    @staticmethod
+    def _probe(subspec):
+        """Return a `(field, value)` pair that any value matching `subspec` must have, when it is hashable."""
+        if isinstance(subspec, (EqualSpec, NoneSpec)) and type(subspec.spec) in _HASHABLE_TYPES:
+            return _ITSELF, subspec.spec
+        if isinstance(subspec, DictSpec):
+            for key, _, field_spec in subspec.items:
+                if isinstance(field_spec, (EqualSpec, NoneSpec)) and type(field_spec.spec) in _HASHABLE_TYPES:
+                    return key, field_spec.spec
+        return None
+
+    def matches(self, value, location=""):
+        if not isinstance(value, (list, tuple)):
+            return CompiledSpec.matches(self, value, location)
+        assignment = _Assignment(self, value)
+        unmatched = assignment.run()
+        if unmatched is not None:
+            remaining_values = [subvalue for subvalue, owner in zip(value, assignment.owners) if owner is None]
+            raise MatcherNoMatchFound(location, self.items[unmatched].spec, remaining_values)
+        return True
+
+    def check(self, value):
+        if not isinstance(value, (list, tuple)):
+            return CompiledSpec.check(self, value)
+        if len(self.items) > len(value):
+            return False
+        return _Assignment(self, value).run() is None
+
+
+class _Assignment:
+    """Maximum bipartite matching between the items of an `UnorderedListSpec` and the values of a list.
+
+    Items with a hashable probe only look at the values found in the matching bucket. An item that can't
+    take a free value tries to take one away from another item, as long as that item can move to another
+    value, so a valid match is never missed because of the order of the items.
+    """
+
+    def __init__(self, spec: UnorderedListSpec, values):
+        self.spec = spec
+        self.values = values
+        self.owners = [None] * len(values)
+        self.first_free = 0
+        self.buckets = {}
+        self.cursors = {}
+        self.candidates = {}
+
+    def run(self):
+        """Assign a distinct value to every item, returning the index of the first item left without one."""
+        for item in range(len(self.spec.items)):
+            if not self._assign_free(item) and not self._augment(item):
+                return item
+        return None
+
+    def test(self, item, index):
+        return self.spec.items[item].check(self.values[index])
+
+    def _bucket(self, field):
+        """Group the indexes of values by their hashable `field`, apart from those that must be tested one by one."""
+        try:
+            return self.buckets[field]
+        except KeyError:
+            pass
+
+        hits, others = {}, []
+        for index, value in enumerate(self.values):
+            if field is not _ITSELF:
+                if not isinstance(value, Mapping):
+                    if type(value) not in _HASHABLE_TYPES and not isinstance(value, (list, tuple)):
+                        others.append(index)
+                    continue
+                value = value.get(field, _DOES_NOT_EXIST)
+                if value is _DOES_NOT_EXIST:
+                    continue
+            if type(value) in _HASHABLE_TYPES:
+                hits.setdefault(value, []).append(index)
+            elif not isinstance(value, (Mapping, list, tuple)):
+                others.append(index)
+
+        self.buckets[field] = hits, others
+        return hits, others
+
+    def _assign_free(self, item):
+        """Greedily assign the first free value matching `item`."""
+        probe = self.spec.probes[item]
+        if probe is None:
+            while self.first_free < len(self.owners) and self.owners[self.first_free] is not None:
+                self.first_free += 1
+            indexes = range(self.first_free, len(self.owners))
+        else:
+            hits, others = self._bucket(probe[0])
+            hits = hits.get(probe[1], ())
+            cursor = self.cursors.get(probe, 0)
+            while cursor < len(hits) and self.owners[hits[cursor]] is not None:
+                cursor += 1
+            self.cursors[probe] = cursor
+            indexes = chain(islice(hits, cursor, None), others)
+
+        for index in indexes:
+            if self.owners[index] is None and self.test(item, index):
+                self.owners[index] = item
+                return True
+        return False
+
+    def _candidates(self, item):
+        try:
+            return self.candidates[item]
+        except KeyError:
+            pass
+
+        probe = self.spec.probes[item]
+        if probe is None:
+            indexes = range(len(self.values))
+        else:
+            hits, others = self._bucket(probe[0])
+            indexes = sorted(chain(hits.get(probe[1], ()), others))
+        candidates = self.candidates[item] = [index for index in indexes if self.test(item, index)]
+        return candidates
+
+    def _augment(self, root):
+        """Look for a chain of items that can each move to another value, freeing one for `root`."""
+        parents = {root: None}
+        visited = set()
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            for index in self._candidates(item):
+                if index in visited:
+                    continue
+                visited.add(index)
+                owner = self.owners[index]
+                if owner is None:
+                    while item is not None:
+                        self.owners[index] = item
+                        item, index = parents[item] or (None, None)
+                    return True
+                if owner not in parents:
+                    parents[owner] = item, index
+                    stack.append(owner)
+        return False
+
+
+class RegexSpec(CompiledSpec):
+    def matches(self, value, location=""):
+        if not isinstance(value, (str, bytes)):
+            raise MatcherTypeMismatch(location, self.spec, value)
+        if not self.spec.match(value):
+            raise MatcherRegexMismatch(location, self.spec, value)
+        return True
+
+    def check(self, value):
+        return isinstance(value, (str, bytes)) and self.spec.match(value) is not None
+
+
+class DatetimeSpec(CompiledSpec):
+    def __init__(self, spec: arrow.Arrow | datetime):
+        import arrow
+
+        super().__init__(spec)
+        # Kept here so `arrow` is only imported once, when the spec is compiled.
+        self.parse = arrow.get
+        self.parser_error = arrow.ParserError
+        self.normalized = self.parse(spec)
+
+    def matches(self, value, location=""):
+        try:
+            if self.parse(value) != self.normalized:
+                raise MatcherDatetimeMismatch(location, self.spec, value)
+        except self.parser_error as e:
+            raise MatcherTypeMismatch(location, self.spec, value) from e
+        return True
+
+    def check(self, value):
+        try:
+            return self.parse(value) == self.normalized
+        except self.parser_error:
+            return False
+
+
+class UUIDSpec(CompiledSpec):
+    def __init__(self, spec: UUID):
+        super().__init__(spec)
+        self.normalized = str(spec)
+
+    def matches(self, value, location=""):
+        value = str(value).lower()
+        if value != self.normalized:
+            raise MatcherValueMismatch(location, self.normalized, value)
+        return True
+
+    def check(self, value):
+        return str(value).lower() == self.normalized
+
+
+class DecimalSpec(CompiledSpec):
+    def matches(self, value, location=""):
+        try:
+            value = decimal.Decimal(value)
+        except Exception as e:
+            raise MatcherTypeMismatch(location, self.spec, value) from e
+        return super().matches(value, location)
+
+    def check(self, value):
+        try:
+            value = decimal.Decimal(value)
+        except Exception:
+            return False
+        return super().check(value)
+
+
+def compile_spec(spec) -> CompiledSpec:
+    """Compile `spec` once, so it can be matched against many values without being inspected again."""
+    try:
+        comparator = _DISPATCH[type(spec)]
+    except KeyError:
+        comparator = _DISPATCH[type(spec)] = _resolve(type(spec))
+    return comparator(spec)
+
+
+def register_comparator(spec_type, comparator):
+    """
+    Compile the specs of `spec_type`, and of its subclasses, with `comparator`.
+
+    `comparator` is called with the spec and returns a `CompiledSpec`, usually by being a subclass of it that
+    normalizes the spec once in `__init__`, and compares values with it in `check` and `matches`.
+    `spec_type` may also be the dotted name of a class, like `"arrow.arrow.Arrow"`, where the class is defined,
+    so its module doesn't need to be imported before one of its values is used as a spec.
+    """
+    _COMPARATORS[spec_type] = comparator
+    _DISPATCH.clear()
+
+
+def _resolve(spec_type):
+    # The closest registered class in the MRO wins, then registered abstract classes, like `Mapping`, the latest first.
+    for cls in spec_type.__mro__[:-1]:
+        comparator = _COMPARATORS.get(cls) or _COMPARATORS.get(f"{cls.__module__}.{cls.__qualname__}")
+        if comparator is not None:
+            return comparator
+    for registered, comparator in reversed(_COMPARATORS.items()):
+        if isinstance(registered, type) and issubclass(spec_type, registered):
+            return comparator
+    return EqualSpec
+
+
+def _compiled(spec):
+    return spec
+
+
+def _list_spec(spec):
+    if any(subspec is ... for subspec in spec):
+        return UnorderedListSpec(spec)
+    return ListSpec(spec)
+
+
+_COMPARATORS = {
+    CompiledSpec: _compiled,
+    type(...): AnySpec,
+    type(None): NoneSpec,
+    dict: DictSpec,
+    Mapping: DictSpec,
+    list: _list_spec,
+    tuple: ListSpec,
+    re.Pattern: RegexSpec,
+    datetime: DatetimeSpec,
+    "arrow.arrow.Arrow": DatetimeSpec,
+    UUID: UUIDSpec,
+    decimal.Decimal: DecimalSpec,
+}
+# The comparator of each type of spec compiled so far, so compiling a spec costs a single lookup.
+_DISPATCH = {}
@@ -0,0 +1,76 @@
+# Python imports
+import json
+
+# Pip imports
+import pytest
+
+# Internal imports
+from benchmarks import generators
+from benchmarks.__main__ import main
+from benchmarks.suite import BENCHMARKS, FOOTPRINTS, compare, run, run_footprints
+
+
+class TestGenerators:
+    def test_deterministic(self):
+        assert generators.mixed(seed=1) == generators.mixed(seed=1)
+        assert generators.mixed(seed=1) != generators.mixed(seed=2)
+        assert generators.long_list(10) == generators.long_list(10)
+
+    def test_shapes(self):
+        assert len(generators.wide(50)) == 50
+        doc, key = generators.deep(5)
+        assert key.count(".") == 5
+        assert [item["id"] for item in generators.long_list(3)] == [0, 1, 2]
+
+
+class TestSuite:
+    def test_run_all(self):
+        results = run(scale=0.01, repeat=1, min_time=0)
+        assert list(results) == list(BENCHMARKS)
+        assert all(result["best"] > 0 for result in results.values())
+
+    def test_pattern(self):
+        assert list(run("merger.dicts.*", scale=0.01, repeat=1, min_time=0)) == [
+            "merger.dicts.mixed",
+            "merger.dicts.mixed.share",
+            "merger.dicts.wide",
+        ]
+
+    def test_footprints(self):
+        results = run_footprints(scale=0.01)
+        assert list(results) == list(FOOTPRINTS)
+        assert results["compact.memory.json"] < results["compact.memory.compact"] < results["compact.memory.dict"]
+
+    def test_compare(self):
+        baseline = {"a": {"best": 1.0}, "b": {"best": 1.0}, "c": {"best": 1.0}}
+        current = {"a": {"best": 1.05}, "b": {"best": 1.5}, "d": {"best": 1.0}}
+        assert compare(baseline, current, threshold=0.1) == [("a", 1.0, 1.05, 1.05, False), ("b", 1.0, 1.5, 1.5, True)]
+
+
+class TestMain:
+    @pytest.fixture
+    def saved(self, tmp_path, capsys):
+        path = tmp_path / "results.json"
+        argv = ["run", "traversal.*", "--scale=0.01", "--repeat=1", "--min-time=0", f"--save={path}"]
+        assert main(argv) == 0
+        return path
+
+    def test_run(self, saved, capsys):
+        results = json.loads(saved.read_text())
+        assert results["scale"] == 0.01
+        assert set(results["benchmarks"]) == {name for name in BENCHMARKS if name.startswith("traversal.")}
+        assert "traversal.getitem.deep" in capsys.readouterr().out
+
+    def test_memory(self, capsys):
+        assert main(["memory", "compact.*", "--scale=0.01"]) == 0
+        assert "compact.memory.dict" in capsys.readouterr().out
+
+    def test_compare(self, saved, tmp_path, capsys):
+        assert main(["compare", str(saved), str(saved)]) == 0
+        slower = json.loads(saved.read_text())
+        for result in slower["benchmarks"].values():
+            result["best"] *= 2
+        slower_path = tmp_path / "slower.json"
+        slower_path.write_text(json.dumps(slower))
+        assert main(["compare", str(saved), str(slower_path), "--threshold=0.5"]) == 1
+        assert "REGRESSED" in capsys.readouterr().out
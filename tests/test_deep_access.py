@@ -1,11 +1,24 @@
-# Pip imports
+# Python imports
+from array import array
 from unittest import mock
 
+# Pip imports
 import pytest
 
 # Internal imports
 from dictdeeper import DeepDictIndexError, DeepDictKeyError, DeepDictValueError
-from dictdeeper.core import DeepDict, DeepList
+from dictdeeper.core import (
+    CompiledKey,
+    Condition,
+    DeepDict,
+    DeepList,
+    Extractor,
+    Index,
+    Key,
+    NestedKey,
+    Traversor,
+    compile_key,
+)
 
 
 @pytest.fixture
@@ -38,6 +51,8 @@ class TestDeepAccess:
         assert "5" not in data
         assert "index0" in data["3"]
         assert "index123" not in data["3"]
+        assert {"id": 2, "name": "bar", "shapes": ...} in data["4"]
+        assert {"id": 4, "name": "bar", "shapes": ...} not in data["4"]
 
     def test_deep_contains(self, data):
         assert "1.a" not in data
@@ -138,3 +153,562 @@ class TestDeepAccess:
 
     def test_keys(self, data):
         assert list(data.keys()) == ["1", "2", "3", "4"]
+
+    def test_items_with_dotted_keys(self):
+        data = DeepDict({"a.b": {"c": 1}, "d": [1]})
+        assert dict(data.items()) == {"a.b": {"c": 1}, "d": [1]}
+        assert [type(value) for value in data.values()] == [DeepDict, DeepList]
+
+    def test_iteration_does_not_traverse(self, data):
+        with mock.patch("dictdeeper.core.Traversor") as traversor:
+            assert len(list(data.items())) == len(list(data.values())) == 4
+        traversor.assert_not_called()
+
+
+class TestWrappers:
+    @pytest.mark.parametrize(
+        "obj",
+        [DeepDict({}), DeepList([]), Key("a"), NestedKey("a.b"), compile_key("a.b"), Traversor({})],
+    )
+    def test_slots(self, obj):
+        assert not hasattr(obj, "__dict__")
+
+    def test_children_are_not_reused_by_default(self, raw_data):
+        data = DeepDict(raw_data)
+        assert data["2"] is not data["2"]
+
+    def test_reuse(self, raw_data):
+        data = DeepDict(raw_data, reuse=True)
+        assert data["2"] is data["2"]
+        assert data["2"]["b"] is data["2"]["b"]
+        assert data["2.b"] is data[compile_key("2.b")]
+        assert data["3"] is dict(data.items())["3"]
+        assert data["4"]["0"] is data["4"]["0"]
+
+    def test_reuse_follows_changes(self, raw_data):
+        data = DeepDict(raw_data, reuse=True)
+        child = data["2"]
+        raw_data["2"] = {"a": "B"}
+        assert data["2"] is not child
+        assert data["2.a"] == "B"
+
+
+class TestPathCache:
+    @pytest.fixture
+    def data(self, raw_data):
+        return DeepDict(raw_data, path_cache=3)
+
+    def test_lookups(self, data):
+        assert data["2.b.i"] == "I"
+        assert data["2.b.ii"] == "II"
+        assert data["4.1.shapes.1"] == "triangle"
+        assert data["1"] == "one"
+        assert data["4.*.id"] == [1, 2, 3]
+        assert "2.b.iii" not in data
+        assert data.get("2.b.iii.x") is None
+
+    def test_siblings_resume_from_their_parent(self, data, raw_data):
+        assert data["2.b.i"] == "I"
+        assert list(data._paths) == [("2", "b")]
+        with mock.patch.object(Traversor, "_walk", wraps=Traversor._walk) as walk:
+            assert data["2.b.ii"] == "II"
+        walk.assert_called_once_with(raw_data["2"]["b"], compile_key("2.b.ii"), 3, 2)
+
+    def test_resume_from_deepest_prefix(self, data, raw_data):
+        assert data["4.1.name"] == "bar"
+        with mock.patch.object(Traversor, "_walk", wraps=Traversor._walk) as walk:
+            assert data["4.1.shapes.0"] == "circle"
+        assert walk.call_args_list[0] == mock.call(raw_data["4"][1], compile_key("4.1.shapes.0"), 3, 2)
+
+    def test_bounded(self, data):
+        for key in ("2.b.i", "4.0.id", "4.1.id", "4.2.id"):
+            _ = data[key]
+        assert list(data._paths) == [("4", "0"), ("4", "1"), ("4", "2")]
+        _ = data["4.0.id"]
+        _ = data["2.a"]
+        assert list(data._paths) == [("4", "2"), ("4", "0"), ("2",)]
+
+    def test_errors(self, data):
+        _ = data["2.b.i"]
+        with pytest.raises(DeepDictKeyError) as e:
+            _ = data["2.b.x"]
+        assert repr(e.value.args) == "(Key(origin='2.b', part='x'),)"
+        with pytest.raises(DeepDictValueError) as e:
+            _ = data["2.b.i.x"]
+        assert repr(e.value.args) == "(Key(origin='2.b.i', part='x'),)"
+
+    def test_writes_invalidate(self, data):
+        assert data["2.b.i"] == "I"
+        data.set("2.b", {"i": "one"})
+        assert data["2.b.i"] == "one"
+        data.update_paths({"2.b": {"i": 1}})
+        assert data["2.b.i"] == 1
+        data.delete("2.b")
+        assert "2.b.i" not in data
+
+    @pytest.mark.parametrize("reuse", [False, True])
+    def test_writes_through_children_invalidate(self, raw_data, reuse):
+        data = DeepDict(raw_data, reuse=reuse, path_cache=3)
+        assert data["2.b.i"] == "I"
+        data["2"].set("b", {"i": "one"})
+        assert data["2.b.i"] == "one"
+        data["4"]["1"].set("shapes", ["star"])
+        assert data["4.1.shapes.0"] == "star"
+        data["4"]["1"].delete("shapes")
+        assert "4.1.shapes.0" not in data
+
+    def test_invalidate(self, data, raw_data):
+        assert data["2.b.i"] == "I"
+        raw_data["2"]["b"] = {"i": "one"}
+        assert data["2.b.i"] == "I"
+        data.invalidate()
+        assert data["2.b.i"] == "one"
+
+    def test_disabled_by_default(self, raw_data):
+        data = DeepDict(raw_data)
+        assert data["2.b.i"] == "I"
+        assert data._paths is None
+        data.invalidate()
+
+
+class TestCompiledKey:
+    def test_parts(self):
+        key = CompiledKey("4.1.shapes")
+        assert key.parts == ("4", "1", "shapes")
+        assert key.indexes == (4, 1, None)
+        assert str(key) == "4.1.shapes"
+        assert repr(key) == "CompiledKey('4.1.shapes')"
+
+    def test_only_str_keys(self):
+        with pytest.raises(TypeError):
+            CompiledKey(1)
+
+    def test_compile_key_is_cached(self):
+        key = compile_key("2.b.ii")
+        assert compile_key("2.b.ii") is key
+        assert compile_key(key) is key
+
+    def test_key_at(self):
+        key = CompiledKey("2.b.iii")
+        assert repr(key.key_at(0)) == "Key(origin='', part='2')"
+        assert repr(key.key_at(2)) == "Key(origin='2.b', part='iii')"
+
+    def test_lookup(self, raw_data):
+        data = DeepDict(raw_data)
+        assert data[compile_key("4.1.shapes.1")] == "triangle"
+        assert data.get(compile_key("2.b.ii")) == "II"
+        assert data.get(compile_key("2.c"), mock.sentinel.DEFAULT) is mock.sentinel.DEFAULT
+        assert compile_key("3.1") in data
+        assert data["3"][compile_key("1")] == "index1"
+
+    def test_lookup_error(self, raw_data):
+        with pytest.raises(DeepDictIndexError) as e:
+            _ = DeepDict(raw_data)[compile_key("3.3")]
+        assert repr(e.value.args) == "(Key(origin='3', part='3'),)"
+
+
+class TestGetMany:
+    @pytest.fixture
+    def data(self, raw_data):
+        return DeepDict(raw_data)
+
+    def test_get_many(self, data):
+        values = data.get_many(["1", "2.a", "2.b.ii", "3.1", "4.1.shapes.1"])
+        assert values == ["one", "A", "II", "index1", "triangle"]
+
+    def test_get_many_wraps_values(self, data):
+        assert [type(value) for value in data.get_many(["2", "3", "4.0", "1"])] == [DeepDict, DeepList, DeepDict, str]
+
+    def test_get_many_missing(self, data):
+        values = data.get_many(["2.c", "2.b.ii.foo", "3.3", "3.x", "5", "2.a"], mock.sentinel.DEFAULT)
+        assert values == [mock.sentinel.DEFAULT] * 5 + ["A"]
+
+    def test_get_many_repeated_and_nested_keys(self, data):
+        assert data.get_many(["2.a", "2", "2.a"]) == ["A", {"a": "A", "b": {"i": "I", "ii": "II"}}, "A"]
+
+    def test_extractor(self, raw_data, data):
+        extractor = Extractor(["4.0.id", "4.2.name", "4.-1.id"])
+        assert extractor(raw_data) == [1, "baz", 3]
+        assert data.get_many(extractor) == [1, "baz", 3]
+        assert extractor({}, default=0) == [0, 0, 0]
+        assert repr(extractor) == "Extractor(['4.0.id', '4.2.name', '4.-1.id'])"
+
+
+class TestWildcard:
+    @pytest.fixture
+    def data(self, raw_data):
+        return DeepDict(raw_data)
+
+    def test_list_wildcard(self, data):
+        assert data["4.*.id"] == [1, 2, 3]
+        assert data["4"]["*.name"] == ["foo", "bar", "baz"]
+        assert data["4.*.shapes.*"] == ["square", "circle", "circle", "triangle", "triangle", "square"]
+        assert data["4.*.shapes.0"] == ["square", "circle", "triangle"]
+
+    def test_dict_wildcard(self, data):
+        assert data["2.b.*"] == ["I", "II"]
+        assert data["*.a"] == ["A"]
+        assert isinstance(data["3.*"], DeepList)
+
+    def test_skips_values_that_do_not_apply(self, data):
+        assert data["4.*.missing"] == []
+        assert data["*.0"] == ["index0", {"id": 1, "name": "foo", "shapes": ["square", "circle"]}]
+
+    def test_errors_before_wildcard(self, data):
+        with pytest.raises(DeepDictKeyError):
+            _ = data["5.*"]
+        with pytest.raises(DeepDictValueError) as e:
+            _ = data["1.*"]
+        assert repr(e.value.args) == "(Key(origin='1', part='*'),)"
+        assert data.get("5.*.id", mock.sentinel.DEFAULT) is mock.sentinel.DEFAULT
+
+    def test_get_many(self, data):
+        assert data.get_many(["4.*.id", "1", "5.*"]) == [[1, 2, 3], "one", []]
+
+    def test_escaped_wildcard(self):
+        data = DeepDict({"*": 1, "a": {"*": [2], "b": 3}})
+        assert data[r"\*"] == 1
+        assert data[r"a.\*.0"] == 2
+        assert data["a.*"] == [[2], 3]
+        assert data.get_many([r"a.\*", "a.*"]) == [[2], [[2], 3]]
+        assert not compile_key(r"a.\*").wildcard
+        data.set(r"a.\*", 4)
+        assert data["a"] == {"*": 4, "b": 3}
+
+
+class TestFilter:
+    @pytest.fixture
+    def data(self, raw_data):
+        raw_data["4"][1]["price"] = 2.5
+        raw_data["4"][2]["price"] = 10
+        return DeepDict(raw_data, reuse=True)
+
+    def test_equal(self, data):
+        assert data["4[name=bar].id"] == [2]
+        assert data["4[id=2].name"] == ["bar"]
+        assert data["4[id='2']"] == []
+        assert data['4[name="bar"].id'] == [2]
+        assert data["4[name=qux]"] == []
+
+    @pytest.mark.parametrize(
+        "key, ids",
+        [
+            ("4[id!=2].id", [1, 3]),
+            ("4[price<3].id", [2]),
+            ("4[price<=2.5].id", [2]),
+            ("4[price>2.5].id", [3]),
+            ("4[price>=2.5].id", [2, 3]),
+            ("4[price>a].id", []),
+            ("4[shapes.*=square].id", [1, 3]),
+            ("4[shapes.0=circle][id>=2].id", [2]),
+        ],
+    )
+    def test_operators(self, data, key, ids):
+        assert data[key] == ids
+
+    def test_dicts_and_wildcards(self, data):
+        assert data["2[a=A]"] == []
+        assert data["2[i=I].ii"] == ["II"]
+        assert data["*[id=3].name"] == ["baz"]
+        assert DeepDict({"a": {"x": {"n": 1}, "y": {"n": 2}}})["a[n>1]"] == [{"n": 2}]
+        assert DeepList([{"n": 1}, {"n": 2}])["[n=2].n"] == [2]
+
+    def test_parsed_once(self):
+        key = compile_key("data.items[status=paid][amount>1.5].amount")
+        assert key.parts == ("data", "items", "[status=paid][amount>1.5]", "amount")
+        assert key.filters[2].conditions == (
+            Condition(compile_key("status"), "=", "paid"),
+            Condition(compile_key("amount"), ">", 1.5),
+        )
+        assert key.first == 2
+        assert key.wildcard
+        assert compile_key("data.items[status=paid]") is compile_key("data.items[status=paid]")
+
+    @pytest.mark.parametrize("key", ["a[b", "a[b=1]]", "a[b]", "a[=1]", "a[b>]c", "a[0]", "x.a[b.c]", "x[y=1]z"])
+    def test_literal_brackets(self, key):
+        compiled = compile_key(key)
+        assert compiled.parts == tuple(key.split("."))
+        assert not compiled.wildcard
+
+    def test_literal_key_with_brackets(self):
+        data = DeepDict({"a[0]": 1, "b": {"c[d]": [2]}})
+        assert data["a[0]"] == 1
+        assert data["b.c[d].0"] == 2
+        assert "a[1]" not in data
+        assert data.get("a[1]") is None
+        with pytest.raises(DeepDictKeyError):
+            _ = data["a[1]"]
+
+    def test_errors_before_filter(self, data):
+        with pytest.raises(DeepDictValueError) as e:
+            _ = data["1[a=1]"]
+        assert repr(e.value.args) == "(Key(origin='1', part='[a=1]'),)"
+
+    def test_can_not_write(self, data):
+        with pytest.raises(ValueError):
+            data.set("4[id=1].name", "x")
+        with pytest.raises(ValueError):
+            data.delete("4[id=1]")
+
+    def test_uses_index(self, data):
+        data["4"].index_by("name", unique=True)
+        with mock.patch.object(Condition, "test", autospec=True, return_value=True) as test:
+            assert data["4[name=bar][id>1].id"] == [2]
+        assert [call.args[0].field for call in test.call_args_list] == [compile_key("name"), compile_key("id")]
+
+    def test_index_changed_in_place_selects_no_mismatch(self, data):
+        items = data["4"]
+        items.index_by("name")
+        items.wrapped_obj[1]["name"] = "qux"
+        assert data["4[name=bar].id"] == []
+
+    def test_stale_index_is_not_used(self, data):
+        items = data["4"]
+        items.index_by("name")
+        items.wrapped_obj.append({"id": 4, "name": "bar"})
+        assert data["4[name=bar].id"] == [2, 4]
+
+    def test_get_many(self, data):
+        assert data.get_many(["4[price>1].id", "4[id=1].name", "1"]) == [[2, 3], ["foo"], "one"]
+
+    def test_index_by_filtered_key(self):
+        index = Index([{"tags": [{"k": "a", "v": 1}, {"k": "b", "v": 2}]}], "tags[k=b].v")
+        assert list(index) == [2]
+
+
+class TestColumns:
+    @pytest.fixture
+    def items(self):
+        return DeepList(
+            [
+                {"id": 1, "price": 1.5, "meta": {"sku": "a"}},
+                {"id": 2, "price": 2, "meta": {}},
+                {"id": 3, "price": 3.25, "meta": {"sku": "c"}},
+            ]
+        )
+
+    def test_columns(self, items):
+        ids, prices, skus = items.columns(["id", "price", "meta.sku"], use_numpy=False)
+        assert ids == array("q", [1, 2, 3])
+        assert prices == array("d", [1.5, 2.0, 3.25])
+        assert skus == ["a", None, "c"]
+
+    def test_default(self, items):
+        ids, skus = items.columns(["id", "meta.sku"], default="", use_numpy=False)
+        assert skus == ["a", "", "c"]
+        ids, missing = items.columns(["id", "missing"], default=0, use_numpy=False)
+        assert missing == array("q", [0, 0, 0])
+
+    def test_mixed(self):
+        values, big = DeepList([{"a": 1, "b": 2**70}, {"a": True, "b": 1}]).columns(["a", "b"], use_numpy=False)
+        assert values == [1, True]
+        assert big == [2**70, 1]
+
+    def test_empty(self):
+        assert DeepList([]).columns(["a"], use_numpy=False) == [array("q")]
+
+    def test_numpy(self, items):
+        numpy = pytest.importorskip("numpy")
+        ids, skus = items.columns(["id", "meta.sku"])
+        assert isinstance(ids, numpy.ndarray)
+        assert ids.tolist() == [1, 2, 3]
+        assert skus.tolist() == ["a", None, "c"]
+
+
+class TestIndex:
+    @pytest.fixture
+    def items(self, raw_data):
+        return DeepDict(raw_data)["4"]
+
+    def test_unique(self, items):
+        index = items.index_by("id", unique=True)
+        assert index[2] == {"id": 2, "name": "bar", "shapes": ["circle", "triangle"]}
+        assert 3 in index
+        assert 4 not in index
+        assert index.get(4) is None
+        assert list(index) == [1, 2, 3]
+        assert repr(index) == "Index('id', unique=True)"
+
+    def test_multi(self, items):
+        index = items.index_by("shapes.0")
+        assert [item["id"] for item in index["triangle"]] == [3]
+        assert [item["id"] for item in index["circle"]] == [2]
+        with pytest.raises(KeyError):
+            _ = index["hexagon"]
+
+    def test_wildcard(self, items):
+        index = items.index_by("shapes.*")
+        assert [item["id"] for item in index["square"]] == [1, 3]
+        assert len(index) == 3
+
+    def test_missing_keys_are_left_out(self):
+        index = Index([{"a": 1}, {"b": 2}, "x", {"a": 1}], "a")
+        assert dict(index) == {1: [{"a": 1}, {"a": 1}]}
+
+    def test_unhashable_values_are_left_out(self):
+        index = Index([{"a": [1]}, {"a": {"b": 1}}, {"a": 1}], "a", unique=True)
+        assert dict(index) == {1: {"a": 1}}
+
+    def test_built_on_demand(self):
+        items = DeepList([{"id": 1}])
+        assert items._indexes is None
+        assert items["[id=1]"] == [{"id": 1}]
+        assert items._indexes is None
+
+    def test_duplicates(self):
+        with pytest.raises(ValueError):
+            Index([{"a": 1}, {"a": 1}], "a", unique=True)
+        assert len(Index([{"a": [1, 1]}], "a.*", unique=True)) == 1
+
+    def test_reused_until_length_changes(self):
+        items = DeepList([{"id": 1}])
+        index = items.index_by("id")
+        assert items.index_by(compile_key("id")) is index
+        items.wrapped_obj.append({"id": 2})
+        assert 2 in items.index_by("id")
+
+    def test_invalidate(self):
+        items = DeepList([{"id": 1}])
+        assert 1 in items.index_by("id", unique=True)
+        items.wrapped_obj[0] = {"id": 2}
+        items.invalidate()
+        assert 2 in items.index_by("id", unique=True)
+
+
+class TestListContains:
+    def test_scalars(self):
+        items = DeepList(["a", 1, None, {"b": 2}, [3]])
+        assert "a" in items
+        assert None in items
+        assert 1.0 in items
+        assert "b" not in items
+        assert 3 not in items
+        assert {"b": 2} in items
+
+    def test_scans_scalars(self):
+        items = DeepList(["a", "b", {"c": 1}])
+        with mock.patch.object(DeepList, "check") as check:
+            assert "b" in items
+            assert "c" not in items
+        check.assert_not_called()
+
+    def test_updated_with_length(self):
+        items = DeepList(["a"])
+        assert "b" not in items
+        items.wrapped_obj.append("b")
+        assert "b" in items
+
+    def test_updated_in_place(self):
+        items = DeepList([1, 2])
+        assert 3 not in items
+        items.wrapped_obj[0] = 3
+        assert 3 in items
+        assert items.check([3, ...])
+
+    def test_custom_equality_falls_back_to_matcher(self):
+        class Anything:
+            def __eq__(self, other):
+                return True
+
+        assert "a" in DeepList([Anything()])
+        items = DeepList(["a", object()])
+        with mock.patch.object(DeepList, "check", return_value=False) as check:
+            assert "a" in items
+            assert "b" not in items
+        check.assert_called_once_with(["b", ...])
+
+    def test_nan(self):
+        nan = float("nan")
+        assert nan not in DeepList([nan])
+
+
+class TestWrite:
+    @pytest.fixture
+    def data(self, raw_data):
+        return DeepDict(raw_data)
+
+    def test_set(self, data, raw_data):
+        data.set("2.b.ii", "two")
+        data.set("4.1.shapes.0", "hexagon")
+        data.set("2.c", "C")
+        assert raw_data["2"] == {"a": "A", "b": {"i": "I", "ii": "two"}, "c": "C"}
+        assert raw_data["4"][1]["shapes"] == ["hexagon", "triangle"]
+
+    def test_set_creates_missing(self):
+        data = DeepDict({})
+        data.set("a.b.0.c", 1)
+        data.set("a.b.1", 2)
+        data.set("a.1.x", 3)
+        assert data.wrapped_obj == {"a": {"b": [{"c": 1}, 2], "1": {"x": 3}}}
+
+    def test_set_without_create(self, data):
+        with pytest.raises(DeepDictKeyError) as e:
+            data.set("2.c.d", 1, create=False)
+        assert repr(e.value.args) == "(Key(origin='2', part='c'),)"
+        with pytest.raises(DeepDictIndexError):
+            data.set("3.3", "index3", create=False)
+        data.set("2.c", 1, create=False)
+        assert data["2.c"] == 1
+
+    def test_set_errors(self, data):
+        with pytest.raises(DeepDictIndexError) as e:
+            data.set("3.4", "index4")
+        assert repr(e.value.args) == "(Key(origin='3', part='4'),)"
+        with pytest.raises(DeepDictValueError):
+            data.set("1.a", "A")
+        with pytest.raises(DeepDictValueError):
+            data.set("3.x", "X")
+        with pytest.raises(ValueError):
+            data.set("4.*.id", 0)
+
+    def test_update_paths(self, data, raw_data):
+        data.update_paths({"2.a": "a", "2.b.i": "i", "3.3": "index3", "4.0.id": 0, "5.1": "y", "5.0": "x"})
+        assert raw_data["2"] == {"a": "a", "b": {"i": "i", "ii": "II"}}
+        assert raw_data["3"] == ["index0", "index1", "index2", "index3"]
+        assert raw_data["4"][0]["id"] == 0
+        assert raw_data["5"] == ["x", "y"]
+
+    def test_update_paths_sets_parents_first(self):
+        data = DeepDict({})
+        data.update_paths({"a.b": 1, "a": {"c": 2}})
+        assert data.wrapped_obj == {"a": {"c": 2, "b": 1}}
+
+    def test_update_paths_walks_once(self, data):
+        with mock.patch.object(Traversor, "_put", wraps=Traversor._put) as put:
+            data.update_paths({f"6.{i}": i for i in range(3)})
+        assert put.call_count == 4
+        assert data["6"] == [0, 1, 2]
+
+    def test_delete(self, data, raw_data):
+        data.delete("2.b.i")
+        data.delete("3.0")
+        data.delete("4.-1")
+        assert raw_data["2"]["b"] == {"ii": "II"}
+        assert raw_data["3"] == ["index1", "index2"]
+        assert [item["id"] for item in raw_data["4"]] == [1, 2]
+
+    def test_delete_errors(self, data):
+        with pytest.raises(DeepDictKeyError):
+            data.delete("2.c")
+        with pytest.raises(DeepDictKeyError):
+            data.delete("2.c.d")
+        with pytest.raises(DeepDictIndexError):
+            data.delete("3.3")
+        with pytest.raises(DeepDictValueError):
+            data.delete("1.a")
+        with pytest.raises(ValueError):
+            data.delete("3.*")
+
+    def test_writes_invalidate_indexes_of_reused_wrappers(self):
+        data = DeepDict({"l": [{"id": 1}], "d": {"l": [{"id": 2}, {"id": 3}]}}, reuse=True)
+        data["l"].index_by("id")
+        data["d"]["l"].index_by("id")
+        data.set("l.0.id", 5)
+        assert data["l[id=1]"] == []
+        assert data["l[id=5]"] == [{"id": 5}]
+        data.update_paths({"d.l.0.id": 4})
+        assert data["d"]["l[id=4]"] == [{"id": 4}]
+        data.delete("d.l.1.id")
+        assert data["d"]["l[id=3]"] == []
+        data["d"]["l"]["0"].set("id", 6)
+        assert data["d"]["l[id=6]"] == [{"id": 6}]
@@ -0,0 +1,199 @@
+# Python imports
+import json
+import re
+import sys
+from unittest import mock
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import (
+    CompactDeepDict,
+    CompactDeepList,
+    DeepDict,
+    DeepDictIndexError,
+    DeepDictKeyError,
+    DeepDictValueError,
+    MatcherKeysDoNotMatch,
+    MatcherValueMismatch,
+)
+from dictdeeper.compact import _ObjectView
+
+
+@pytest.fixture
+def raw_data():
+    return {
+        "1": "one",
+        "2": {
+            "a": "A",
+            "b": {
+                "i": "I",
+                "ii": "II",
+            },
+        },
+        "3": ["index0", "index1", "index2"],
+        "4": [
+            {"id": 1, "name": "foo", "shapes": ["square", "circle"]},
+            {"id": 2, "name": "bar", "shapes": ["circle", "triangle"]},
+            {"id": 3, "name": 'b"a{z}', "shapes": ["triangle", "square"]},
+        ],
+        "5": {"t": True, "f": False, "n": None, "x": -1.5e3, "escé": "é", "big": 2**70, "min": -(2**63)},
+    }
+
+
+class TestCompactDeepDict:
+    @pytest.fixture(params=[bytes, memoryview, lambda data: data.decode(), lambda data: json.loads(data)])
+    def data(self, request, raw_data):
+        return CompactDeepDict(request.param(json.dumps(raw_data).encode()))
+
+    def test_from_json(self, raw_data):
+        body = json.dumps(raw_data).encode()
+        assert isinstance(DeepDict.from_json(body, compact=True), CompactDeepDict)
+        assert DeepDict.from_json(body, compact=True).wrapped_obj == raw_data
+        with pytest.raises(ValueError):
+            DeepDict.from_json(body, lazy=True, compact=True)
+
+    def test_deep_getitem(self, data):
+        assert data["1"] == "one"
+        assert data["2.a"] == "A"
+        assert data["2.b.ii"] == "II"
+        assert data["3.0"] == "index0"
+        assert data["3"][1] == "index1"
+        assert data["3"][-1] == "index2"
+        assert data["3"]["-1"] == "index2"
+        assert data["4.1.shapes.1"] == "triangle"
+        assert data["4.2.name"] == 'b"a{z}'
+        assert data["4"]["1.id"] == 2
+        assert data["5.t"] is True
+        assert data["5.f"] is False
+        assert data["5.n"] is None
+        assert data["5.x"] == -1500.0
+        assert data["5"]["escé"] == "é"
+        assert data["5.big"] == 2**70
+        assert data["5.min"] == -(2**63)
+
+    def test_wildcard_and_filter(self, data):
+        assert data["4.*.id"] == [1, 2, 3]
+        assert data["4.*.shapes.-1"] == ["circle", "triangle", "square"]
+        assert data["2.b.*"] == ["I", "II"]
+        assert data["*.a"] == ["A"]
+        assert data["4[id=2].name"] == ["bar"]
+        assert data["4[id>1].shapes.0"] == ["circle", "triangle"]
+        assert CompactDeepDict({"*": 1, "a": {"*": 2}})[r"a.\*"] == 2
+        with pytest.raises(DeepDictValueError):
+            _ = data["1.*"]
+
+    def test_wrappers(self, data):
+        assert isinstance(data["2"], CompactDeepDict)
+        assert isinstance(data["3"], CompactDeepList)
+        assert isinstance(data["4.0"], CompactDeepDict)
+        assert data["4.0"].tape is data.tape
+
+    def test_errors(self, data):
+        with pytest.raises(DeepDictKeyError) as e:
+            _ = data["2.b.iii.x"]
+        assert repr(e.value.args) == "(Key(origin='2.b', part='iii'),)"
+
+        with pytest.raises(DeepDictIndexError) as e:
+            _ = data["3.3"]
+        assert repr(e.value.args) == "(Key(origin='3', part='3'),)"
+
+        with pytest.raises(DeepDictValueError) as e:
+            _ = data["2.b.ii.foo"]
+        assert repr(e.value.args) == "(Key(origin='2.b.ii', part='foo'),)"
+
+        with pytest.raises(IndexError):
+            _ = data["3"][3]
+
+    def test_get(self, data):
+        assert data.get("2.b.ii") == "II"
+        assert data.get("2.c", mock.sentinel.DEFAULT) is mock.sentinel.DEFAULT
+        assert data.get_many(["1", "3.1", "6"], 0) == ["one", "index1", 0]
+        assert "2.a" in data
+        assert "2.c" not in data
+
+    def test_mapping(self, data, raw_data):
+        assert list(data) == list(raw_data)
+        assert list(data.keys()) == list(raw_data)
+        assert len(data) == 5
+        assert len(data["3"]) == 3
+        assert list(data["3"]) == raw_data["3"]
+        assert dict(data["2.b"].items()) == {"i": "I", "ii": "II"}
+        assert list(data["2.b"].values()) == ["I", "II"]
+
+    def test_match(self, data, raw_data):
+        assert data == raw_data
+        assert data["4"] == [{"name": re.compile("ba."), ...: ...}, ...]
+        assert data.check({"1": "one", "2": {"b": {"i": "I", ...: ...}, ...: ...}, ...: ...})
+        assert not data.check({"1": "one"})
+        assert "index1" in data["3"]
+
+        with pytest.raises(MatcherValueMismatch):
+            assert data == {"1": "ONE", ...: ...}
+        with pytest.raises(MatcherKeysDoNotMatch):
+            assert data["2"] == {"a": "A"}
+
+    def test_match_decodes_named_values(self, data):
+        with mock.patch.object(type(data.tape), "decode", autospec=True, side_effect=type(data.tape).decode) as decode:
+            assert data.check({"2": {"a": "A", ...: ...}, ...: ...})
+        assert [call.args[1] for call in decode.call_args_list] == [data.tape.field(data["2"].node, "a")]
+
+    def test_wrapped_obj(self, data, raw_data):
+        assert data.wrapped_obj == raw_data
+        assert data["4.0"].wrapped_obj == raw_data["4"][0]
+        assert data.wrapped_obj is not data.wrapped_obj
+
+    def test_repr(self):
+        assert repr(CompactDeepDict('{"a": [1, 2]}')) == "CompactDeepDict({'a': [1, 2]})"
+        assert repr(CompactDeepDict('{"a": [1, 2]}')["a"]) == "CompactDeepList([1, 2])"
+        assert repr(_ObjectView(CompactDeepDict('{"a": 1}').tape, 0)) == "{'a': 1}"
+
+
+class TestTape:
+    def test_shared_strings(self):
+        data = CompactDeepDict({"a": "x", "b": ["x", {"a": "x"}]})
+        assert data.tape.keys == ("a", "b")
+        assert data.tape.strings == b"x"
+
+    def test_order_of_keys(self):
+        doc = {"b": 1, "a": {"z": 2, "c": [3]}, "é": None, "A": True, "": {}}
+        data = CompactDeepDict(doc)
+        assert data.tape.keys == ("", "A", "a", "b", "c", "z", "é")
+        assert list(data) == list(doc)
+        assert list(data["a"].keys()) == ["z", "c"]
+        assert [key for key, _ in data.items()] == list(doc)
+        assert list(data.values())[:1] == [1]
+        assert data["*"] == [1, {"z": 2, "c": [3]}, None, True, {}]
+        assert list(data.wrapped_obj) == list(doc)
+
+    def test_large_object(self):
+        doc = {f"key{i}": i for i in range(2000)}
+        data = CompactDeepDict(doc)
+        assert all(data[key] == value for key, value in doc.items())
+        assert "key2000" not in data
+        assert "a" not in data and "zzz" not in data
+
+    def test_interned_keys(self):
+        key = "".join(["shared", "key"])
+        assert CompactDeepDict({key: 1}).tape.keys[0] is sys.intern("sharedkey")
+
+    def test_unicode(self):
+        data = CompactDeepDict(json.dumps({"é": "\ud800 ☃"}))
+        assert data["é"] == "\ud800 ☃"
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            CompactDeepDict("[1, 2]")
+        with pytest.raises(ValueError):
+            CompactDeepList({"a": 1})
+        with pytest.raises(ValueError):
+            CompactDeepDict('{"a": 1,}')
+        with pytest.raises(TypeError):
+            CompactDeepDict({1: "a"})
+        with pytest.raises(TypeError):
+            CompactDeepDict({"a": {1, 2}})
+
+    def test_from_wrapper(self, raw_data):
+        assert CompactDeepDict(DeepDict(raw_data)).wrapped_obj == raw_data
+        assert CompactDeepList([{"a": (1, 2)}]).wrapped_obj == [{"a": [1, 2]}]
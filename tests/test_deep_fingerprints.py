@@ -0,0 +1,178 @@
+# Python imports
+import copy
+import pickle
+import re
+from decimal import Decimal
+from unittest import mock
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import (
+    CombineLists,
+    DeepDict,
+    DeepMerger,
+    Fingerprints,
+    MatcherError,
+    MergeDicts,
+    MergeListOfDictsByPosition,
+    compile_spec,
+    diff,
+    fingerprint,
+)
+from dictdeeper.spec import DictSpec, EqualSpec
+
+
+@pytest.fixture
+def doc():
+    return {"a": {"b": [1, 2.5, "x", None, True], "c": {"d": "e"}}, "f": [{"g": 1}]}
+
+
+class TestFingerprint:
+    def test_equal_values(self, doc):
+        assert fingerprint(doc) == fingerprint(copy.deepcopy(doc))
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+        assert len(fingerprint(doc)) == 16
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [
+            ({"a": 1}, {"a": True}),
+            ({"a": 1}, {"a": 1.0}),
+            ({"a": "1"}, {"a": 1}),
+            ({"1": 1}, {1: 1}),
+            ([1, 2], [2, 1]),
+            ([[1], 2], [[1, 2]]),
+            ({"a": "b:c"}, {"a:b": "c"}),
+            ([], {}),
+        ],
+    )
+    def test_different_values(self, a, b):
+        assert fingerprint(a) != fingerprint(b)
+
+    @pytest.mark.parametrize("value", [float("nan"), Decimal(1), (1, 2), {"a": [object()]}, {(1,): 1}])
+    def test_no_fingerprint(self, value):
+        assert fingerprint(value) is None
+
+    def test_cached_by_subtree(self, doc):
+        fingerprints = Fingerprints()
+        digest = fingerprints(doc)
+        expected = fingerprint(doc["a"]["c"])
+        assert len(fingerprints.digests) == 6
+        with mock.patch("dictdeeper.fingerprints._digest") as digest_mock:
+            assert fingerprints(doc) == digest
+            assert fingerprints(doc["a"]["c"]) == expected
+        digest_mock.assert_not_called()
+
+    def test_discard(self, doc):
+        fingerprints = Fingerprints()
+        digest = fingerprints(doc)
+        doc["f"][0]["g"] = 2
+        assert fingerprints(doc) == digest
+        for value in (doc, doc["f"], doc["f"][0]):
+            fingerprints.discard(value)
+        assert fingerprints(doc) == fingerprint(doc) != digest
+        fingerprints.clear()
+        assert fingerprints.digests == {}
+
+    def test_pickle(self, doc):
+        fingerprints = Fingerprints()
+        fingerprints(doc)
+        assert pickle.loads(pickle.dumps(fingerprints)).digests == {}
+
+
+class TestFingerprintMatch:
+    def test_concrete_spec(self, doc):
+        assert compile_spec(doc).digest == fingerprint(doc)
+        assert compile_spec({"a": 1, ...: ...}).digest is None
+        assert compile_spec({"a": re.compile("x")}).digest is None
+        assert compile_spec([1, ...]).digest is None
+
+    def test_match_by_fingerprint(self, doc):
+        data = DeepDict(doc, fingerprints=Fingerprints())
+        spec = compile_spec({"a": copy.deepcopy(doc["a"]), ...: ...})
+        with mock.patch.object(EqualSpec, "check") as check:
+            assert data == spec
+            assert data.check(spec)
+        check.assert_not_called()
+
+    def test_mismatch_walks(self, doc):
+        data = DeepDict(doc, fingerprints=Fingerprints())
+        assert data.check({"a": {"b": [1, 2.5, "x", None, 1], "c": {"d": "e"}}, ...: ...})
+        assert not data.check({"a": {"b": [], "c": {"d": "e"}}, ...: ...})
+        with pytest.raises(MatcherError):
+            _ = data == {"a": {"b": [], "c": {"d": "e"}}, ...: ...}
+
+    def test_inactive_without_fingerprints(self, doc):
+        with mock.patch.object(DictSpec, "digest", new_callable=mock.PropertyMock) as digest:
+            assert DeepDict(doc).check(copy.deepcopy(doc))
+        digest.assert_not_called()
+
+    def test_writes_discard_fingerprints(self, doc):
+        data = DeepDict(doc, fingerprints=Fingerprints())
+        spec = compile_spec(copy.deepcopy(doc))
+        assert data.check(spec)
+        data.set("a.c.d", "E")
+        assert not data.check(spec)
+        data.update_paths({"a.c.d": "e", "f.0.g": 2})
+        assert not data.check(spec)
+        data.set("f.0.g", 1)
+        assert data.check(spec)
+        data.delete("a.c.d")
+        assert not data.check(spec)
+
+    @pytest.mark.parametrize("reuse", [False, True])
+    def test_writes_through_children_discard_fingerprints(self, doc, reuse):
+        data = DeepDict(doc, reuse=reuse, fingerprints=Fingerprints())
+        spec = compile_spec(copy.deepcopy(doc))
+        assert data.check(spec)
+        child = data["a"]
+        assert child.fingerprints is data.fingerprints
+        child.set("c.d", "E")
+        assert not data.check(spec)
+        child.set("c.d", "e")
+        assert data.check(spec)
+        data["f"]["0"].set("g", 2)
+        assert not data.check(spec)
+        assert not data["f"].check([{"g": 1}])
+
+
+class TestFingerprintMerge:
+    @pytest.fixture
+    def merger(self):
+        return DeepMerger([MergeListOfDictsByPosition(), MergeDicts()], fingerprints=Fingerprints())
+
+    def test_equal_subtrees_are_not_merged(self, merger, doc):
+        other = copy.deepcopy(doc)
+        other["z"] = 1
+        with mock.patch.object(MergeListOfDictsByPosition, "__call__") as merge_lists:
+            merged = merger(doc, other)
+        merge_lists.assert_not_called()
+        assert merged == dict(doc, z=1)
+        assert merged["a"] is doc["a"]
+
+    def test_different_subtrees_are_merged(self, merger, doc):
+        other = copy.deepcopy(doc)
+        other["f"][0]["h"] = 2
+        assert merger(doc, other)["f"] == [{"g": 1, "h": 2}]
+
+    def test_requires_idempotent_strategies(self):
+        with pytest.raises(ValueError):
+            DeepMerger([CombineLists(), MergeDicts()], fingerprints=Fingerprints())
+
+    def test_rejects_inplace(self):
+        with pytest.raises(ValueError):
+            DeepMerger([MergeDicts()], mode=DeepMerger.INPLACE, fingerprints=Fingerprints())
+
+
+class TestFingerprintDiff:
+    def test_diff(self, doc):
+        other = copy.deepcopy(doc)
+        other["f"][0]["g"] = 2
+        fingerprints = Fingerprints()
+        assert diff(doc, other, fingerprint=fingerprints) == diff(doc, other)
+
+    def test_without_digest(self):
+        a, b = {"a": {"x": Decimal(1)}}, {"a": {"x": Decimal(2)}}
+        assert diff(a, b, fingerprint=Fingerprints()) == diff(a, b) != []
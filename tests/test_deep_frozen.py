@@ -0,0 +1,176 @@
+# Python imports
+import copy
+import pickle
+from datetime import datetime
+from functools import lru_cache
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import DeepDict, DeepDictKeyError, FrozenDeepDict, FrozenDeepList, MatcherError
+
+
+@pytest.fixture
+def doc():
+    return {"a": {"b": [1, {"c": 2}], "d": {"e": "f"}}, "g": [{"id": 1}, {"id": 2}]}
+
+
+@pytest.fixture
+def frozen(doc):
+    return FrozenDeepDict(doc)
+
+
+class TestAccess:
+    def test_dotted_keys(self, frozen):
+        assert frozen["a.b.1.c"] == 2
+        assert frozen["g.*.id"] == FrozenDeepList([1, 2])
+        assert frozen["g[id=2]"] == FrozenDeepList([{"id": 2}])
+        assert isinstance(frozen["a"], FrozenDeepDict)
+        assert isinstance(frozen["a"]["b"], FrozenDeepList)
+        assert isinstance(frozen["g"][0], FrozenDeepDict)
+        assert frozen.get("a.x") is None
+        assert "a.d.e" in frozen
+        assert "a.d.x" not in frozen
+        assert frozen.get_many(["a.d.e", "a.x", "g.*.id"]) == ["f", None, [1, 2]]
+        assert dict(frozen.items())["a"] == {"b": [1, {"c": 2}], "d": {"e": "f"}}
+        with pytest.raises(DeepDictKeyError):
+            _ = frozen["a.x"]
+
+    def test_match(self, frozen):
+        assert frozen.check({"a": {"b": [1, ...], ...: ...}, ...: ...})
+        assert frozen["g"].check([{"id": 2}, ...])
+        with pytest.raises(MatcherError):
+            frozen.matches({"a": 1, ...: ...})
+
+    def test_copied_once(self, doc, frozen):
+        doc["a"]["d"]["e"] = "x"
+        assert frozen["a.d.e"] == "f"
+        assert FrozenDeepDict(DeepDict(doc))["a.d.e"] == "x"
+        assert FrozenDeepDict(frozen).wrapped_obj is frozen.wrapped_obj
+
+    def test_read_only(self, frozen):
+        with pytest.raises(TypeError):
+            frozen.wrapped_obj["a"] = 1
+        with pytest.raises(TypeError):
+            frozen["a"].wrapped_obj.update(x=1)
+        with pytest.raises(TypeError):
+            frozen["a.b"].wrapped_obj.append(1)
+
+    def test_thaw(self, doc, frozen):
+        thawed = frozen.thaw()
+        assert thawed == doc
+        assert type(thawed["a"]["b"]) is list
+        thawed["a"]["b"].append(3)
+        assert len(frozen["a.b"]) == 2
+
+    def test_repr(self):
+        assert repr(FrozenDeepDict({"a": [1]})) == "FrozenDeepDict({'a': [1]})"
+        assert repr(FrozenDeepList([{"a": 1}])) == "FrozenDeepList([{'a': 1}])"
+
+
+class TestDerive:
+    def test_set(self, frozen):
+        derived = frozen.set("a.b.1.c", 3)
+        assert derived["a.b.1.c"] == 3
+        assert frozen["a.b.1.c"] == 2
+        assert derived["a.d"].wrapped_obj is frozen["a.d"].wrapped_obj
+        assert derived["g"].wrapped_obj is frozen["g"].wrapped_obj
+        assert derived["a.b.0"] == 1
+
+    def test_update_paths(self, frozen):
+        derived = frozen.update_paths({"a.d.x": [1], "h.0": {"i": 1}, "g.2": {"id": 3}})
+        assert derived.thaw() == {
+            "a": {"b": [1, {"c": 2}], "d": {"e": "f", "x": [1]}},
+            "g": [{"id": 1}, {"id": 2}, {"id": 3}],
+            "h": [{"i": 1}],
+        }
+        assert derived["a.b"].wrapped_obj is frozen["a.b"].wrapped_obj
+        with pytest.raises(TypeError):
+            derived["h.0"].wrapped_obj["i"] = 2
+        with pytest.raises(DeepDictKeyError):
+            frozen.set("x.y", 1, create=False)
+
+        frozen = FrozenDeepDict({"a": {"b": {"x": 1}, "c": {"y": 2}}, "d": {"z": 3}})
+        derived = frozen.update_paths({"a.b.x": 10, "a.c.y": 20})
+        assert derived.thaw() == {"a": {"b": {"x": 10}, "c": {"y": 20}}, "d": {"z": 3}}
+        assert frozen["a.b.x"] == 1
+        assert derived["d"].wrapped_obj is frozen["d"].wrapped_obj
+        with pytest.raises(TypeError):
+            derived["a.b"].wrapped_obj["x"] = 1
+
+    def test_set_frozen_value(self, frozen):
+        derived = frozen.set("x", frozen["a.d"])
+        assert derived["x"].wrapped_obj is frozen["a.d"].wrapped_obj
+
+    def test_delete(self, frozen):
+        derived = frozen.delete("g.0")
+        assert derived["g"] == FrozenDeepList([{"id": 2}])
+        assert len(frozen["g"]) == 2
+        assert derived["g.0"].wrapped_obj is frozen["g.1"].wrapped_obj
+
+    def test_list(self):
+        frozen = FrozenDeepList([{"a": 1}, {"b": 2}])
+        derived = frozen.set("0.a", 2)
+        assert derived == FrozenDeepList([{"a": 2}, {"b": 2}])
+        assert derived[1].wrapped_obj is frozen[1].wrapped_obj
+
+
+class TestHash:
+    def test_equal(self, doc, frozen):
+        other = FrozenDeepDict(copy.deepcopy(doc))
+        assert frozen == other
+        assert hash(frozen) == hash(other)
+        assert frozen == doc
+        assert frozen != FrozenDeepDict({})
+        assert frozen.set("a.b.0", 1) == frozen
+        assert frozen.set("a.b.0", 2) != frozen
+        assert FrozenDeepDict({"a": 1}) == FrozenDeepDict({"a": 1.0})
+        assert FrozenDeepList([1, [2]]) == FrozenDeepList((1, (2,)))
+
+    def test_order_of_keys(self):
+        assert hash(FrozenDeepDict({"a": 1, "b": {"c": 2, "d": 3}})) == hash(
+            FrozenDeepDict({"b": {"d": 3, "c": 2}, "a": 1})
+        )
+
+    def test_cached(self, frozen):
+        hash(frozen)
+        assert frozen["a.d"].wrapped_obj.cached_hash is not None
+        derived = frozen.set("a.b.1.c", 3)
+        assert derived.wrapped_obj.cached_hash is None
+        assert derived["a.d"].wrapped_obj.cached_hash == frozen["a.d"].wrapped_obj.cached_hash
+        assert hash(derived) != hash(frozen)
+
+    def test_different_hashes_are_not_compared(self, doc, frozen):
+        other = FrozenDeepDict(copy.deepcopy(doc))
+        other.wrapped_obj.cached_hash = hash(frozen) + 1
+        assert frozen != other
+
+    def test_dict_key(self, doc, frozen):
+        cache = {frozen: "cached"}
+        assert cache[FrozenDeepDict(copy.deepcopy(doc))] == "cached"
+        assert FrozenDeepDict({}) not in cache
+
+    def test_lru_cache(self, doc, frozen):
+        calls = []
+
+        @lru_cache(maxsize=None)
+        def ids(document):
+            calls.append(document)
+            return list(document["g.*.id"])
+
+        assert ids(frozen) == ids(FrozenDeepDict(copy.deepcopy(doc))) == [1, 2]
+        assert len(calls) == 1
+
+    def test_non_json_values(self):
+        frozen = FrozenDeepDict({"at": datetime(2024, 1, 1), "tags": [{1, 2}]})
+        with pytest.raises(TypeError):
+            hash(frozen)
+        assert hash(FrozenDeepDict({"at": datetime(2024, 1, 1)})) == hash(FrozenDeepDict({"at": datetime(2024, 1, 1)}))
+
+    def test_pickle_and_copy(self, frozen):
+        for other in (pickle.loads(pickle.dumps(frozen)), copy.deepcopy(frozen), copy.copy(frozen)):
+            assert other == frozen
+            assert hash(other) == hash(frozen)
+            with pytest.raises(TypeError):
+                other.wrapped_obj["x"] = 1
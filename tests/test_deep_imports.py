@@ -0,0 +1,61 @@
+# Python imports
+import pickle
+import subprocess
+import sys
+from datetime import datetime
+
+# Pip imports
+import arrow
+import pytest
+
+# Internal imports
+import dictdeeper
+from dictdeeper.spec import _DOES_NOT_EXIST, DatetimeSpec, compile_spec
+
+
+def imported(code):
+    """Run `code` in a new interpreter, and return the modules it imported."""
+    command = [sys.executable, "-c", f"import sys; {code}; print(' '.join(sys.modules))"]
+    return set(subprocess.run(command, check=True, capture_output=True, text=True).stdout.split())
+
+
+class TestImports:
+    def test_import_is_cheap(self):
+        modules = imported("import dictdeeper")
+        assert "dictdeeper.core" not in modules
+        assert not {"arrow", "unittest", "concurrent.futures.process"} & modules
+
+    def test_datetime_support_is_loaded_when_needed(self):
+        modules = imported("from dictdeeper import DeepDict; DeepDict({'a': '1'}) == {'a': '1', ...: ...}")
+        assert "dictdeeper.spec" in modules
+        assert not {"arrow", "unittest"} & modules
+        assert "arrow" in imported(
+            "import datetime; from dictdeeper import compile_spec; compile_spec(datetime.datetime(2024, 1, 1))"
+        )
+
+    @pytest.mark.parametrize("name", ["DeepDict", "MergeDicts", "diff", "match_many", "MatcherError"])
+    def test_lazy_attributes(self, name):
+        assert name in dictdeeper.__all__
+        assert name in dir(dictdeeper)
+        assert getattr(dictdeeper, name).__name__ == name
+
+    def test_submodules(self):
+        import dictdeeper.fingerprints as fingerprints_module
+        import dictdeeper.patch as patch_module
+
+        assert fingerprints_module.Fingerprints is dictdeeper.Fingerprints
+        assert patch_module.diff is dictdeeper.diff
+        assert dictdeeper.fingerprints is fingerprints_module
+        assert callable(dictdeeper.fingerprint)
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            dictdeeper.Nope
+
+    def test_arrow_spec(self):
+        assert isinstance(compile_spec(arrow.get(2024, 1, 1)), DatetimeSpec)
+        assert compile_spec(datetime(2024, 1, 1)).check("2024-01-01T00:00:00+00:00")
+
+    def test_sentinel(self):
+        assert pickle.loads(pickle.dumps(_DOES_NOT_EXIST)) is _DOES_NOT_EXIST
+        assert repr(_DOES_NOT_EXIST) == "<_DOES_NOT_EXIST>"
@@ -0,0 +1,138 @@
+# Python imports
+from unittest import mock
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import (
+    CombineLists,
+    DeepDict,
+    DeepMerger,
+    MatcherError,
+    MatcherKeysDoNotMatch,
+    MergeDicts,
+    MergeListsOfDictsByKey,
+    match_many,
+)
+from dictdeeper import matcher as matcher_module
+from dictdeeper.core import Traversor
+from dictdeeper.instrument import Stats, collect
+from dictdeeper.spec import DictSpec
+
+
+@pytest.fixture
+def data():
+    return DeepDict({"a": {"b": [1, {"c": 2}]}, "items": [{"id": 1}, {"id": 2}]})
+
+
+class TestCollect:
+    def test_traversal(self, data):
+        with collect() as stats:
+            assert data["a.b.1.c"] == 2
+            assert data["a"]["b"] == [1, {"c": 2}]
+        assert stats.counters["traversal.lookups"] == 3
+        assert stats.counters["traversal.nodes"] == 4 + 1 + 1
+        assert stats.timers["traversal.seconds"] > 0
+
+    def test_matcher(self, data):
+        with collect() as stats:
+            assert data == {"a": {"b": [1, ...]}, ...: ...}
+            assert data["items"] == [{"id": 2}, {"id": 1}, ...]
+        assert stats.counters["matcher.calls"] == 2
+        assert stats.counters["matcher.check.DictSpec"] == 4
+        assert stats.counters["matcher.check.UnorderedListSpec"] == 2
+        assert stats.counters["matcher.unordered.pairs"] == 3
+        assert "matcher.validate_match" not in stats.counters
+        assert stats.timers["matcher.seconds"] > 0
+
+    def test_exceptions(self, data):
+        with collect() as stats:
+            assert data.get("a.x") is None
+            assert "a.b.5" not in data
+            with pytest.raises(MatcherError):
+                _ = data == {"a": 1}
+        assert stats.counters["exceptions.raised"] == 3
+        assert stats.counters["exceptions.raised.DeepDictKeyError"] == 1
+        assert stats.counters["exceptions.raised.DeepDictIndexError"] == 1
+        assert stats.counters["exceptions.raised.MatcherKeysDoNotMatch"] == 1
+        assert stats.counters["exceptions.swallowed"] == 2
+
+    def test_match_many(self):
+        with collect() as stats:
+            results = list(match_many({"a": 1}, [{"a": 1}, {"a": 2}, {"b": 1}], workers=1))
+        assert [result.matched for result in results] == [True, False, False]
+        assert stats.counters["exceptions.raised"] == stats.counters["exceptions.swallowed"] == 2
+
+    def test_merger(self):
+        merger = DeepMerger([MergeListsOfDictsByKey("id"), CombineLists(), MergeDicts()])
+        with collect() as stats:
+            merger({"l": [{"id": 1}], "x": {"y": {}}, "c": [1]}, {"l": [{"id": 1, "z": 1}], "x": {"y": {}}, "c": [2]})
+        assert stats.counters["merger.MergeListsOfDictsByKey.tests"] == 2
+        assert stats.counters["merger.MergeListsOfDictsByKey.calls"] == 1
+        assert stats.counters["merger.CombineLists.calls"] == 1
+        assert stats.counters["merger.MergeDicts.calls"] == 2
+        assert "merger.MergeDicts.tests" not in stats.counters
+        assert 0 < stats.timers["merger.MergeDicts.seconds"]
+
+    def test_nested_timers_count_once(self):
+        merger = DeepMerger()
+        a = b = {"x": {"y": {"z": {}}}}
+        with mock.patch("time.perf_counter", side_effect=range(100)), collect() as stats:
+            merger(a, b)
+        assert stats.counters["merger.MergeDicts.calls"] == 3
+        assert stats.timers["merger.MergeDicts.seconds"] == 1
+
+    def test_merge_all(self):
+        with collect() as stats:
+            DeepMerger([CombineLists(), MergeDicts()]).merge_all([{"a": [1]}, {"a": [2]}, {"a": [3]}])
+        assert stats.counters["merger.CombineLists.merge_all"] == 1
+
+    def test_export(self, data):
+        export = mock.Mock()
+        with collect(export=export) as stats:
+            _ = data["a"]
+        export.assert_called_once_with(stats)
+        assert stats.as_dict()["traversal.lookups"] == 1
+
+    def test_no_nesting(self):
+        with collect():
+            with pytest.raises(RuntimeError):
+                with collect():
+                    pass
+
+    def test_restored(self, data):
+        originals = (
+            Traversor.__getitem__,
+            Traversor.__dict__["_walk"],
+            DictSpec.check,
+            DeepDict.get,
+            MergeDicts.__call__,
+            matcher_module._match,
+        )
+        with collect():
+            assert Traversor.__getitem__ is not originals[0]
+        assert (
+            Traversor.__getitem__,
+            Traversor.__dict__["_walk"],
+            DictSpec.check,
+            DeepDict.get,
+            MergeDicts.__call__,
+            matcher_module._match,
+        ) == originals
+        assert "__init__" not in vars(MatcherKeysDoNotMatch)
+
+    def test_restored_on_error(self):
+        with pytest.raises(ValueError):
+            with collect():
+                raise ValueError
+        assert "__init__" not in vars(MatcherKeysDoNotMatch)
+        with collect():
+            pass
+
+    def test_stats(self):
+        stats = Stats()
+        stats.counters["a"] += 1
+        stats.timers["b"] += 0.5
+        assert stats.as_dict() == {"a": 1, "b": 0.5}
+        assert repr(stats) == "Stats({'a': 1, 'b': 0.5})"
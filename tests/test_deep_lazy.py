@@ -0,0 +1,142 @@
+# Python imports
+import json
+import re
+from unittest import mock
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import DeepDictIndexError, DeepDictKeyError, DeepDictValueError, MatcherValueMismatch
+from dictdeeper.core import DeepDict
+from dictdeeper.lazy import LazyDeepDict, LazyDeepList
+
+
+@pytest.fixture
+def raw_data():
+    return {
+        "1": "one",
+        "2": {
+            "a": "A",
+            "b": {
+                "i": "I",
+                "ii": "II",
+            },
+        },
+        "3": ["index0", "index1", "index2"],
+        "4": [
+            {"id": 1, "name": "foo", "shapes": ["square", "circle"]},
+            {"id": 2, "name": "bar", "shapes": ["circle", "triangle"]},
+            {"id": 3, "name": 'b"a{z}', "shapes": ["triangle", "square"]},
+        ],
+        "5": {"t": True, "f": False, "n": None, "x": -1.5e3, "esc\u00e9": "\u00e9"},
+    }
+
+
+class TestLazyDeepDict:
+    @pytest.fixture(params=[bytes, memoryview, lambda data: data.decode()])
+    def data(self, request, raw_data):
+        return LazyDeepDict(request.param(json.dumps(raw_data, indent=2).encode()))
+
+    def test_from_json(self, raw_data):
+        body = json.dumps(raw_data).encode()
+        assert isinstance(DeepDict.from_json(body, lazy=True), LazyDeepDict)
+        assert DeepDict.from_json(body) == raw_data
+        assert DeepDict.from_json(memoryview(body)) == raw_data
+
+    def test_deep_getitem(self, data):
+        assert data["1"] == "one"
+        assert data["2.a"] == "A"
+        assert data["2.b.ii"] == "II"
+        assert data["3.0"] == "index0"
+        assert data["3"][1] == "index1"
+        assert data["3"]["-1"] == "index2"
+        assert data["4.1.shapes.1"] == "triangle"
+        assert data["4.2.name"] == 'b"a{z}'
+        assert data["4"]["1.id"] == 2
+        assert data["5.t"] is True
+        assert data["5.f"] is False
+        assert data["5.n"] is None
+        assert data["5.x"] == -1500.0
+        assert data["5"]["escé"] == "é"
+
+    def test_wildcard(self, data):
+        assert data["4.*.id"] == [1, 2, 3]
+        assert data["2.b.*"] == ["I", "II"]
+        with pytest.raises(DeepDictValueError):
+            _ = data["1.*"]
+
+    def test_wrappers(self, data):
+        assert isinstance(data["2"], LazyDeepDict)
+        assert isinstance(data["3"], LazyDeepList)
+        assert isinstance(data["4.0"], LazyDeepDict)
+
+    def test_errors(self, data):
+        with pytest.raises(DeepDictKeyError) as e:
+            _ = data["2.b.iii.x"]
+        assert repr(e.value.args) == "(Key(origin='2.b', part='iii'),)"
+
+        with pytest.raises(DeepDictIndexError) as e:
+            _ = data["3.3"]
+        assert repr(e.value.args) == "(Key(origin='3', part='3'),)"
+
+        with pytest.raises(DeepDictValueError) as e:
+            _ = data["2.b.ii.foo"]
+        assert repr(e.value.args) == "(Key(origin='2.b.ii', part='foo'),)"
+
+    def test_get(self, data):
+        assert data.get("2.b.ii") == "II"
+        assert data.get("2.c", mock.sentinel.DEFAULT) is mock.sentinel.DEFAULT
+        assert data.get_many(["1", "3.1", "6"], 0) == ["one", "index1", 0]
+        assert "2.a" in data
+        assert "2.c" not in data
+
+    def test_mapping(self, data, raw_data):
+        assert list(data) == list(raw_data)
+        assert list(data.keys()) == list(raw_data)
+        assert len(data) == 5
+        assert len(data["3"]) == 3
+        assert list(data["3"]) == raw_data["3"]
+        assert dict(data["2.b"].items()) == {"i": "I", "ii": "II"}
+        assert list(data["2.b"].values()) == ["I", "II"]
+
+    def test_match(self, data, raw_data):
+        assert data == raw_data
+        assert data["4"] == [{"name": re.compile("ba."), ...: ...}, ...]
+        assert data.check({"1": "one", ...: ...})
+        assert "index1" in data["3"]
+
+        with pytest.raises(MatcherValueMismatch):
+            assert data == {"1": "ONE", ...: ...}
+
+    def test_wrapped_obj(self, data, raw_data):
+        assert data.wrapped_obj == raw_data
+        assert data["4.0"].wrapped_obj == raw_data["4"][0]
+
+    def test_only_decodes_requested(self):
+        data = LazyDeepDict(b'{"skipped": {"a": [1, 2, {"b": "}"}]}, "broken": [1, 2 "x"], "wanted": {"x": 1}}')
+        assert data["wanted.x"] == 1
+        assert data.get("skipped.a.2.b") == "}"
+        with pytest.raises(ValueError):
+            _ = data["broken.1"]
+
+    def test_memoized_by_offset(self):
+        data = LazyDeepDict(b'{"a": {"b": [1, 2, 3]}, "c": 1}')
+        assert data["a.b.2"] == 3
+        scanner = data.scanner
+        assert set(scanner.objects) == {0, 6}
+        assert set(scanner.arrays) == {12}
+        assert data["a"]["b"]["0"] == 1
+        assert data["a"].scanner is scanner
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            LazyDeepDict(b"[1, 2]")
+        with pytest.raises(ValueError):
+            _ = LazyDeepDict(b'{"a": 1,}')["b"]
+        with pytest.raises(ValueError):
+            _ = LazyDeepDict(b'{"a": [1, 2}')["a"]
+
+    def test_repr(self):
+        assert repr(LazyDeepDict(b' {"a": [1, 2]}')) == "LazyDeepDict(b'{\"a\": [1, 2]}')"
+        assert repr(LazyDeepDict(b'{"a": [1, 2]}')["a"]) == "LazyDeepList(b'[1, 2]')"
@@ -3,16 +3,22 @@ import datetime
 import decimal
 import re
 from decimal import Decimal
+from ipaddress import IPv4Address, IPv4Network, ip_address, ip_network
+from types import MappingProxyType
+from unittest import mock
 from uuid import UUID
 
 # Pip imports
 import arrow
 import pytest
 
+from dictdeeper import spec as spec_module
+
 # Internal imports
-from dictdeeper.core import DeepDict
+from dictdeeper.core import DeepDict, DeepList
 from dictdeeper.exceptions import (
     MatcherDatetimeMismatch,
+    MatcherError,
     MatcherKeysDoNotMatch,
     MatcherLengthTooLong,
     MatcherLengthTooShort,
@@ -22,7 +28,16 @@ from dictdeeper.exceptions import (
     MatcherTypeMismatch,
     MatcherValueMismatch,
 )
-from dictdeeper.matcher import DictMatcher
+from dictdeeper.matcher import DictMatcher, ListMatcher, MatchResult, Matcher, match_many
+from dictdeeper.spec import (
+    CompiledSpec,
+    DatetimeSpec,
+    DictSpec,
+    EqualSpec,
+    UnorderedListSpec,
+    compile_spec,
+    register_comparator,
+)
 
 
 @pytest.fixture
@@ -105,6 +120,18 @@ class TestDeepMatcher:
             ...: ...,
         }
 
+    def test_check(self, data, raw_data):
+        assert data.check(raw_data)
+        assert data.check({"2": {"b": {"ii": re.compile("I+"), ...: ...}, ...: ...}, ...: ...})
+        assert not data.check({"1": ..., "2": ..., "3": ..., "5": ...})
+        assert not data.check({"foo": ..., ...: ...})
+        assert not data.check({"3": ["index4", ...], ...: ...})
+        assert not data.check({"3": ["a", "b"], ...: ...})
+        assert DeepDict(raw_data).check({"1": "one", ...: ...})
+        assert not DeepDict(raw_data).check({"1": "ONE", ...: ...})
+        assert DeepList(raw_data["3"]).check(["index1", ...])
+        assert not DeepList(raw_data["3"]).check(["index1"])
+
     def test_keys_do_not_match(self, data):
 
         with pytest.raises(MatcherKeysDoNotMatch) as e:
@@ -132,6 +159,13 @@ class TestDeepMatcher:
             assert data == {"1": pattern, ...: ...}
         assert e.value.args == ("1", pattern, "one")
 
+    def test_regex_type_mismatch(self):
+        pattern = re.compile("xyz")
+
+        with pytest.raises(MatcherTypeMismatch) as e:
+            assert DeepDict({"1": None}) == {"1": pattern}
+        assert e.value.args == ("1", pattern, None)
+
     def test_value_mismatch(self, data):
 
         with pytest.raises(MatcherValueMismatch) as e:
@@ -219,3 +253,214 @@ class TestDeepMatcher:
             ],  # [4]
             ...: ...,  # [2]
         }
+
+    def test_spec_of_another_kind(self, raw_data):
+        with pytest.raises(MatcherTypeMismatch) as e:
+            DictMatcher(raw_data).matches(["1", ...])
+        assert e.value.args == ("", ["1", ...], raw_data)
+        assert not DictMatcher(raw_data).check(["1", ...])
+        assert not ListMatcher(raw_data["3"]).check({"0": "index0"})
+        with pytest.raises(MatcherTypeMismatch):
+            DictMatcher(raw_data["3"]).matches(raw_data["3"])
+
+    def test_helpers(self, data, raw_data):
+        assert isinstance(Matcher.wrap_value(raw_data["2"], {}), DictMatcher)
+        assert isinstance(Matcher.wrap_value(raw_data["3"], []), ListMatcher)
+        assert Matcher.wrap_value(raw_data["3"], ...) is raw_data["3"]
+        assert data.get_wrapped("2", {}).wrapped_obj is raw_data["2"]
+        assert data.get_wrapped("5", {}, mock.sentinel.DEFAULT) is mock.sentinel.DEFAULT
+        assert Matcher.validate_match(data.get_wrapped("2", {}), raw_data["2"], "2")
+        items = ListMatcher(raw_data["3"])
+        assert items._matches_ordered(["index0", "index1", "index2"])
+        assert items._matches_unordered(["index2", ...])
+        with pytest.raises(MatcherNoMatchFound):
+            items._matches_unordered(["index3", ...])
+
+
+class TestCompiledSpec:
+    def test_compile_is_idempotent(self):
+        spec = compile_spec({"1": ...})
+        assert isinstance(spec, CompiledSpec)
+        assert compile_spec(spec) is spec
+
+    def test_precomputed(self):
+        spec = compile_spec({"1": ..., "created": arrow.get("2024-01-11T13:11:11-06:00"), ...: ...})
+        assert isinstance(spec, DictSpec)
+        assert spec.keys == {"1", "created", ...}
+        assert spec.partial
+        assert isinstance(spec.items[1][2], DatetimeSpec)
+        assert spec.items[1][2].normalized == arrow.get("2024-01-11T19:11:11Z")
+        assert isinstance(compile_spec(["a", ...]), UnorderedListSpec)
+
+    def test_reused_across_documents(self, raw_data):
+        spec = compile_spec({"1": re.compile("^.n.$"), "3": [..., "index2"], ...: ...})
+        assert DeepDict(raw_data) == spec
+        assert DictMatcher(raw_data) == spec
+        assert DeepDict({"1": "ana", "3": ["index2"]}) == spec
+
+        with pytest.raises(MatcherRegexMismatch) as e:
+            assert DeepDict({"1": "one!", "3": []}) == spec
+        assert e.value.args == ("1", spec.items[0][2].spec, "one!")
+
+    def test_deep_list(self, raw_data):
+        spec = compile_spec([{"id": 1, ...: ...}, ...])
+        assert DeepList(raw_data["4"]) == spec
+
+        with pytest.raises(MatcherValueMismatch) as e:
+            assert DeepList(raw_data["3"]) == compile_spec(["index0", "index1", "ayy!"])
+        assert e.value.args == ("2", "ayy!", "index2")
+
+    def test_mismatched_container(self):
+        with pytest.raises(MatcherValueMismatch) as e:
+            assert DeepDict({"a": "not a dict"}) == compile_spec({"a": {"b": 1}})
+        assert e.value.args == ("a", {"b": 1}, "not a dict")
+
+
+class NetworkSpec(CompiledSpec):
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.normalized = ip_network(spec)
+
+    def matches(self, value, location=""):
+        if not self.check(value):
+            raise MatcherValueMismatch(location, self.spec, value)
+        return True
+
+    def check(self, value):
+        try:
+            return ip_address(value) in self.normalized
+        except ValueError:
+            return False
+
+
+class TestComparators:
+    @pytest.fixture(autouse=True)
+    def registry(self):
+        with mock.patch.dict(spec_module._COMPARATORS), mock.patch.dict(spec_module._DISPATCH):
+            yield
+
+    def test_register(self):
+        register_comparator(IPv4Network, NetworkSpec)
+        assert DeepDict({"ip": "10.0.0.7"}) == {"ip": ip_network("10.0.0.0/24")}
+        with pytest.raises(MatcherValueMismatch) as e:
+            assert DeepDict({"ip": "10.0.1.7"}) == {"ip": ip_network("10.0.0.0/24")}
+        assert e.value.args == ("ip", ip_network("10.0.0.0/24"), "10.0.1.7")
+
+    def test_normalized_once(self):
+        register_comparator(IPv4Network, NetworkSpec)
+        spec = compile_spec([ip_network("10.0.0.0/8"), ...])
+        with mock.patch(f"{__name__}.ip_network") as normalize:
+            assert DeepList(["10.1.2.3"]) == spec
+        normalize.assert_not_called()
+
+    def test_subclasses(self):
+        class Network(IPv4Network):
+            pass
+
+        register_comparator(IPv4Network, NetworkSpec)
+        assert isinstance(compile_spec(Network("10.0.0.0/8")), NetworkSpec)
+        assert isinstance(compile_spec(IPv4Address("10.0.0.1")), EqualSpec)
+
+    def test_closest_in_mro_wins(self):
+        class Tag(str):
+            pass
+
+        register_comparator(str, NetworkSpec)
+        register_comparator(Tag, EqualSpec)
+        assert isinstance(compile_spec("10.0.0.0/8"), NetworkSpec)
+        assert isinstance(compile_spec(Tag("10.0.0.0/8")), EqualSpec)
+
+    def test_dotted_name(self):
+        register_comparator("ipaddress.IPv4Network", NetworkSpec)
+        assert isinstance(compile_spec(ip_network("10.0.0.0/8")), NetworkSpec)
+
+    def test_abstract_classes(self):
+        assert isinstance(compile_spec(MappingProxyType({"a": 1})), DictSpec)
+
+    def test_dispatch_is_cached_per_type(self):
+        compile_spec(ip_network("10.0.0.0/8"))
+        assert spec_module._DISPATCH[IPv4Network] is EqualSpec
+        register_comparator(IPv4Network, NetworkSpec)
+        assert IPv4Network not in spec_module._DISPATCH
+        assert isinstance(compile_spec(ip_network("10.0.0.0/8")), NetworkSpec)
+
+
+class TestUnorderedListMatch:
+    def test_does_not_miss_match_taken_by_earlier_item(self):
+        assert DeepList(["ab", "ac"]) == [re.compile("a"), "ab", ...]
+        assert DeepList([{"id": 1, "a": 1}, {"id": 1}]) == [{"id": 1, ...: ...}, {"id": 1, "a": 1}, ...]
+
+    def test_no_match_reports_values_left(self):
+        with pytest.raises(MatcherNoMatchFound) as e:
+            assert DeepList(["ab", "ac"]) == [re.compile("a"), "ab", "ad", ...]
+        assert e.value.args == ("", "ad", [])
+
+        with pytest.raises(MatcherNoMatchFound) as e:
+            assert DeepList(["a", "a", "b"]) == ["a", "a", "a", ...]
+        assert e.value.args == ("", "a", ["b"])
+
+    def test_duplicates(self):
+        assert DeepList(["a", "b", "a"]) == ["a", "a", ...]
+        assert DeepList([None, 1, None]) == [None, None, 1, ...]
+
+    def test_hashable_buckets_keep_equality(self):
+        assert DeepList([1.0, True, Decimal("2")]) == [True, 1, 2, ...]
+        assert DeepList([{"id": 1.0, "x": "y"}, {"id": Decimal("2")}]) == [{"id": 2}, {"id": 1, ...: ...}, ...]
+
+    def test_tuple(self):
+        assert DeepList(("a", "b")) == ["b", ...]
+
+    def test_many_line_items(self):
+        items = [{"id": index, "amount": str(index)} for index in range(2000)]
+        spec = [{"id": index, "amount": Decimal(index)} for index in reversed(range(2000))]
+        assert DeepList(items) == spec + [...]
+
+    def test_check(self):
+        spec = compile_spec([{"id": 2, ...: ...}, ...])
+        assert spec.check([{"id": 1}, {"id": 2, "name": "bar"}])
+        assert not spec.check([{"id": 1}, {"id": 3}])
+        assert not spec.check("not a list")
+
+
+class TestMatchMany:
+    @pytest.fixture
+    def spec(self):
+        return {"id": ..., "name": re.compile("ba."), "tags": ["a", ...], ...: ...}
+
+    @pytest.fixture
+    def documents(self):
+        return [{"id": i, "name": ["bar", "foo"][i % 2], "tags": ["b", "a"] if i % 3 else ["c"]} for i in range(40)]
+
+    def expected(self, spec, documents):
+        results = []
+        for document in documents:
+            try:
+                results.append(DeepDict(document) == spec)
+            except MatcherError as e:
+                results.append(e.args[0])
+        return results
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_match_many(self, spec, documents, workers):
+        results = list(match_many(spec, documents, workers=workers, chunksize=3))
+        assert [r.matched or r.location for r in results] == self.expected(spec, documents)
+
+    def test_results(self, spec):
+        documents = [{"id": 1, "name": "bar", "tags": ["a"]}, {"name": "bar", "tags": ["a"]}, DeepDict({"id": 1})]
+        matched, missing, wrapped = match_many(spec, documents, workers=1)
+        assert matched == MatchResult(True)
+        assert missing.location == "id"
+        assert isinstance(missing.error, MatcherMissingRequiredKey)
+        assert not wrapped.matched
+        assert wrapped.location == "name"
+
+    def test_pool_errors(self, spec):
+        (result,) = match_many(compile_spec(spec), [{"id": 1, "name": "foo", "tags": []}], workers=2)
+        assert result.location == "name"
+        assert isinstance(result.error, MatcherRegexMismatch)
+
+    def test_lazy(self, spec):
+        documents = ({"id": i, "name": "bar", "tags": ["a"]} for i in range(10))
+        results = match_many(spec, documents, workers=1, chunksize=2)
+        assert next(results).matched
+        assert all(result.matched for result in results)
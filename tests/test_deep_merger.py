@@ -1,3 +1,7 @@
+# Python imports
+import copy
+import functools
+
 # Pip imports
 import pytest
 
@@ -49,11 +53,192 @@ class TestDeepMerge:
         }
 
 
+class TestMergeModes:
+    @pytest.fixture
+    def strategies(self):
+        return [
+            MergeListsOfDictsByKey(key=lambda idx, d: d["id"], condition=lambda d: "id" in d),
+            MergeListOfDictsByPosition(),
+            CombineLists(),
+            MergeDicts(),
+        ]
+
+    @pytest.fixture
+    def a(self):
+        return {
+            "1": "one",
+            "2": {"a": "A", "b": {"i": "I"}},
+            "3": ["i0"],
+            "4": [{"id": 1, "a": "i"}, {"id": 2, "a": "i"}],
+            "5": [{"x": 1}],
+        }
+
+    @pytest.fixture
+    def b(self):
+        return {"2": {"a": "B"}, "3": ["i1"], "4": [{"id": 2, "b": "ii"}], "5": [{}, {"y": 2}], "6": "six"}
+
+    @pytest.fixture
+    def expected(self):
+        return {
+            "1": "one",
+            "2": {"a": "B", "b": {"i": "I"}},
+            "3": ["i0", "i1"],
+            "4": [{"id": 1, "a": "i"}, {"id": 2, "a": "i", "b": "ii"}],
+            "5": [{"x": 1}, {"y": 2}],
+            "6": "six",
+        }
+
+    @pytest.mark.parametrize("mode", DeepMerger.MODES)
+    def test_same_result(self, strategies, a, b, expected, mode):
+        assert DeepMerger(strategies, mode=mode)(a, b) == expected
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            DeepMerger(mode="nope")
+
+    def test_share_reuses_untouched_subtrees(self, strategies, a, b, expected):
+        original = copy.deepcopy(a)
+        result = DeepMerger(strategies, mode=DeepMerger.SHARE)(a, b)
+        assert a == original
+        assert result is not a
+        assert result["2"] is not a["2"]
+        assert result["2"]["b"] is a["2"]["b"]
+        assert result["4"][0] is a["4"][0]
+        assert result["5"][0] is a["5"][0]
+
+    def test_share_returns_a_when_unchanged(self, strategies, a):
+        merger = DeepMerger(strategies, mode=DeepMerger.SHARE)
+        assert merger(a, {}) is a
+        assert merger(a, {"1": "one", "2": {"b": {}}, "3": [], "5": [{}]}) is a
+
+    def test_inplace_updates_a(self, strategies, a, b, expected):
+        nested, items = a["2"], a["4"]
+        result = DeepMerger(strategies, mode=DeepMerger.INPLACE)(a, b)
+        assert result is a
+        assert a == expected
+        assert a["2"] is nested
+        assert a["4"] is items
+
+    def test_inplace_copies_b(self):
+        merger = DeepMerger([MergeListsOfDictsByKey("id"), CombineLists(), MergeDicts()], mode=DeepMerger.INPLACE)
+        a = {}
+        docs = [{"x": [1], "n": {"y": 1}, "l": [{"id": 1}]}, {"x": [2], "n": {"z": 2}, "l": [{"id": 1, "v": 2}]}]
+        original = copy.deepcopy(docs)
+        for doc in docs:
+            merger(a, doc)
+        assert a == {"x": [1, 2], "n": {"y": 1, "z": 2}, "l": [{"id": 1, "v": 2}]}
+        assert docs == original
+
+
+class TestMergeAll:
+    @pytest.fixture
+    def docs(self):
+        return [
+            {"1": "one", "2": {"a": "A"}, "3": ["i0"], "4": [{"id": 1, "a": "i"}]},
+            {"2": {"b": "B"}, "3": ["i1"], "5": {"x": 1}},
+            {"1": "ONE", "2": {"a": "AA", "c": {"d": "D"}}, "4": [{"id": 1, "b": "ii"}, {"id": 2}]},
+            {"3": "not a list", "5": {"y": 2}},
+            {"3": ["i2"], "4": [{"id": 2, "c": "iii"}], "5": None},
+        ]
+
+    @pytest.mark.parametrize(
+        "strategies",
+        [
+            [MergeDicts()],
+            [CombineLists(), MergeDicts()],
+            [MergeListsOfDictsByKey(key=lambda idx, d: d["id"]), CombineLists(), MergeDicts()],
+            [MergeListOfDictsByPosition(), MergeDicts()],
+        ],
+    )
+    @pytest.mark.parametrize("mode", DeepMerger.MODES)
+    def test_same_as_reduce(self, docs, strategies, mode):
+        expected = functools.reduce(DeepMerger(strategies), copy.deepcopy(docs))
+        result = DeepMerger(strategies, mode=mode).merge_all(iter(copy.deepcopy(docs)))
+        assert result == expected
+        assert list(result) == list(expected)
+
+    def test_does_not_change_inputs(self, docs):
+        original = copy.deepcopy(docs)
+        DeepMerger([CombineLists(), MergeDicts()]).merge_all(docs)
+        assert docs == original
+
+    def test_inplace_updates_first(self, docs):
+        first = docs[0]
+        assert DeepMerger([CombineLists(), MergeDicts()], mode=DeepMerger.INPLACE).merge_all(docs) is first
+
+    @pytest.mark.parametrize(
+        "strategies",
+        [
+            [CombineLists(), MergeDicts()],
+            [MergeListsOfDictsByKey("id"), MergeDicts()],
+            [MergeListOfDictsByPosition(), MergeDicts()],
+        ],
+    )
+    def test_inplace_only_changes_first(self, strategies):
+        docs = [{"k": 1}, {"x": [{"id": 1}], "n": {"a": {"b": 1}}}, {"x": [{"id": 1, "c": 2}], "n": {"a": {"d": 2}}}]
+        original = copy.deepcopy(docs[1:])
+        DeepMerger(strategies, mode=DeepMerger.INPLACE).merge_all(docs)
+        assert docs[1:] == original
+
+    def test_empty(self):
+        assert DeepMerger().merge_all([]) == {}
+
+    def test_in_pool(self):
+        docs = [{"n": {str(i % 7): [i]}, "last": i} for i in range(50)]
+        merger = DeepMerger([CombineLists(), MergeDicts()])
+        expected = functools.reduce(merger, docs)
+        assert merger.merge_all(docs, workers=2, chunksize=4) == expected
+        assert merger.merge_all([], workers=2) == {}
+
+
+class TestDispatch:
+    @pytest.fixture
+    def strategies(self):
+        return (
+            MergeListsOfDictsByKey(key=lambda idx, d: d["id"], condition=lambda d: "id" in d),
+            MergeListOfDictsByPosition(),
+            CombineLists(),
+            MergeDicts(),
+        )
+
+    def test_dispatch_by_types(self, strategies):
+        by_key, by_position, combine, dicts = strategies
+        merger = DeepMerger(strategies)
+        assert merger.dispatch(list, list) == ((by_key, True), (by_position, True), (combine, False))
+        assert merger.dispatch(dict, dict) == ((dicts, False),)
+        assert merger.dispatch(str, str) == ()
+        assert merger.dispatch(type(None), dict) == ()
+        assert merger.dispatch(str, str) is merger.dispatch(str, str)
+
+    def test_untyped_strategy_is_always_tested(self):
+        class Concat(Strategy):
+            def test(self, a, b):
+                return isinstance(a, str) and isinstance(b, str)
+
+            def __call__(self, a, b, merger):
+                return a + b
+
+        concat = Concat()
+        merger = DeepMerger([concat, MergeDicts()])
+        assert merger.dispatch(int, int) == ((concat, True),)
+        assert merger({"a": "x", "b": 1, "c": {"d": "y"}}, {"a": "z", "b": 2, "c": {"d": "w"}}) == {
+            "a": "xz",
+            "b": 2,
+            "c": {"d": "yw"},
+        }
+
+
 class TestStrategy:
     def test_test_raises(self):
         with pytest.raises(NotImplementedError):
             Strategy().test({}, {})
 
+    def test_test_by_types(self):
+        assert MergeDicts().test({}, {})
+        assert not MergeDicts().test({}, [])
+        assert CombineLists().test([], [])
+        assert not CombineLists().test(None, [])
+
     def test_call_raises(self):
         with pytest.raises(NotImplementedError):
             Strategy()({}, {}, None)
@@ -136,3 +321,30 @@ class TestMergeDicts:
 
     def test_merge_nested_values(self, merger):
         assert merger({"2": {"a": "A"}}, {"2": {"a": "B"}}) == {"2": {"a": "B"}}
+
+
+class TestMergeByPath:
+    def test_merge_by_path(self):
+        merger = DeepMerger([MergeListsOfDictsByKey("meta.id"), CombineLists(), MergeDicts()])
+        a = {"items": [{"meta": {"id": 1}, "a": "i"}, {"meta": {"id": 2}, "a": "i"}]}
+        b = {"items": [{"meta": {"id": 2}, "b": "ii"}, {"meta": {"id": 3}}]}
+        assert merger(a, b) == {
+            "items": [{"meta": {"id": 1}, "a": "i"}, {"meta": {"id": 2}, "a": "i", "b": "ii"}, {"meta": {"id": 3}}]
+        }
+
+    def test_items_without_path_are_not_merged_by_key(self):
+        merger = DeepMerger([MergeListsOfDictsByKey("id"), CombineLists(), MergeDicts()])
+        assert merger({"items": [{"id": 1}]}, {"items": [{"x": 1}]}) == {"items": [{"id": 1}, {"x": 1}]}
+
+    @pytest.mark.parametrize("mode", DeepMerger.MODES)
+    def test_merge_all(self, mode):
+        docs = [{"items": [{"id": i % 3, str(i): i}, {"id": 10 + i}]} for i in range(6)]
+        merger = DeepMerger([MergeListsOfDictsByKey("id"), CombineLists(), MergeDicts()], mode=mode)
+        expected = functools.reduce(DeepMerger(merger.strategies), copy.deepcopy(docs))
+        strategy = merger.strategies[0]
+        assert strategy.merge_all([doc["items"] for doc in docs], merger) == expected["items"]
+
+    def test_in_pool(self):
+        docs = [{"items": [{"id": i % 5, str(i): i}]} for i in range(20)]
+        merger = DeepMerger([MergeListsOfDictsByKey("id"), MergeDicts()])
+        assert merger.merge_all(docs, workers=2, chunksize=4) == functools.reduce(merger, docs)
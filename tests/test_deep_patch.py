@@ -0,0 +1,137 @@
+# Python imports
+import copy
+from unittest import mock
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import DeepDict, MergeListsOfDictsByKey, apply_patch, diff
+from dictdeeper.patch import ADD, CHANGE, REMOVE, Operation
+
+
+@pytest.fixture
+def a():
+    return {
+        "1": "one",
+        "2": {"a": "A", "b": {"i": "I"}},
+        "3": ["index0", "index1", "index2"],
+        "4": [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}, {"id": 3, "name": "baz"}],
+    }
+
+
+@pytest.fixture
+def b(a):
+    b = copy.deepcopy(a)
+    b["1"] = "ONE"
+    del b["2"]["b"]
+    b["2"]["c"] = "C"
+    b["3"] = ["index0", "index1"]
+    b["4"] = [{"id": 2, "name": "BAR"}, {"id": 3, "name": "baz"}, {"id": 4, "name": "qux"}]
+    b["5"] = 5
+    return b
+
+
+class TestDiff:
+    def test_same(self, a):
+        assert diff(a, a) == []
+        assert diff(a, copy.deepcopy(a)) == []
+
+    def test_operations(self, a, b):
+        assert [(op.op, op.path) for op in diff(a, b)] == [
+            (CHANGE, "1"),
+            (REMOVE, "2.b"),
+            (ADD, "2.c"),
+            (REMOVE, "3.2"),
+            (CHANGE, "4.0.id"),
+            (CHANGE, "4.0.name"),
+            (CHANGE, "4.1.id"),
+            (CHANGE, "4.1.name"),
+            (CHANGE, "4.2.id"),
+            (CHANGE, "4.2.name"),
+            (ADD, "5"),
+        ]
+
+    def test_operation_values(self, a, b):
+        ops = diff(a, b)
+        assert ops[0] == Operation(CHANGE, "1", "one", "ONE", ("1",))
+        assert ops[1] == Operation(REMOVE, "2.b", {"i": "I"}, None, ("2", "b"))
+        assert ops[3] == Operation(REMOVE, "3.2", "index2", None, ("3", 2))
+
+    def test_types(self):
+        assert diff({"a": 1}, {"a": True}) == [Operation(CHANGE, "a", 1, True, ("a",))]
+        assert diff({"a": [1]}, {"a": {"0": 1}}) == [Operation(CHANGE, "a", [1], {"0": 1}, ("a",))]
+        assert diff([1], {"a": 1}) == [Operation(CHANGE, "", [1], {"a": 1}, ())]
+
+    def test_aligned_by_key(self, a, b):
+        assert [(op.op, op.path) for op in diff(a, b, key="id") if op.path.startswith("4")] == [
+            (REMOVE, "4.0"),
+            (ADD, "4.2"),
+            (CHANGE, "4.0.name"),
+        ]
+        by_callable = diff(a, b, key=lambda idx, item: item["id"])
+        by_strategy = diff(a, b, key=MergeListsOfDictsByKey("id"))
+        assert by_callable == by_strategy == diff(a, b, key="id")
+
+    def test_reordered_by_key(self):
+        a = [{"id": 1}, {"id": 2}]
+        b = [{"id": 2}, {"id": 1}]
+        assert diff(a, b, key="id") == [Operation(CHANGE, "", a, b, ())]
+
+    def test_not_aligned(self):
+        a = [{"id": 1}, {"id": 1}]
+        b = [{"id": 1}, {"x": 1}]
+        assert [(op.op, op.path) for op in diff(a, b, key="id")] == [(REMOVE, "1.id"), (ADD, "1.x")]
+
+    def test_unhashable_keys_not_aligned(self):
+        a = {"l": [{"id": [1]}]}
+        b = {"l": [{"id": [2]}]}
+        assert [(op.op, op.path) for op in diff(a, b, key="id")] == [(CHANGE, "l.0.id.0")]
+        assert apply_patch(a, diff(a, b, key="id")) == b
+
+    def test_shared_subtrees_are_skipped(self, a):
+        b = dict(a, **{"1": "ONE"})
+        with mock.patch("dictdeeper.patch._Differ.diff_dicts", autospec=True, side_effect=lambda *args: None) as d:
+            diff(a, b)
+        assert d.call_count == 1
+
+    def test_fingerprint(self, a):
+        b = copy.deepcopy(a)
+        b["2"]["a"] = "B"
+        assert diff(a, b, fingerprint=lambda value: len(value)) == []
+        assert len(diff(a, b, fingerprint=repr)) == 1
+
+
+class TestApplyPatch:
+    @pytest.mark.parametrize("key", [None, "id"])
+    def test_round_trip(self, a, b, key):
+        original = copy.deepcopy(a)
+        assert apply_patch(a, diff(a, b, key=key)) == b
+        assert a == original
+
+    def test_inplace(self, a, b):
+        assert apply_patch(a, diff(a, b), inplace=True) is a
+        assert a == b
+
+    def test_root(self):
+        assert apply_patch([1], diff([1], {"a": 1})) == {"a": 1}
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [
+            ([], [1, 2, 3]),
+            ([1, 2, 3], []),
+            ([{"id": 1}, {"id": 2}, {"id": 3}], [{"id": 0}, {"id": 2}, {"id": 4}, {"id": 5}]),
+            ({"a": [{"id": 1, "x": [1]}]}, {"a": [{"id": 1, "x": [1, 2]}, {"id": 2}]}),
+        ],
+    )
+    def test_lists(self, a, b):
+        assert apply_patch(a, diff(a, b)) == b
+        assert apply_patch(a, diff(a, b, key="id")) == b
+
+    def test_deep_dict(self, a, b):
+        data = DeepDict(a)
+        for op in diff(a, b, key="id"):
+            if op.op == REMOVE:
+                data.delete(op.path)
+        assert "2.b" not in data
@@ -0,0 +1,81 @@
+# Python imports
+import itertools
+import json
+from unittest import mock
+
+# Pip imports
+import pytest
+
+# Internal imports
+from dictdeeper import query
+from dictdeeper.__main__ import main, partial_spec
+from dictdeeper.query import QueryStats, query_jsonl
+
+
+@pytest.fixture
+def events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [
+        json.dumps({"id": index, "type": "paid" if index % 3 == 0 else "open", "data": {"amount": index * 10}})
+        for index in range(100)
+    ]
+    path.write_text("\n".join(lines[:50]) + "\n\n" + "\n".join(lines[50:]))
+    return path
+
+
+class TestQueryJsonl:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_query(self, events, workers):
+        rows = list(query_jsonl(events, ["id", "data.amount"], workers=workers, chunk_size=256))
+        assert rows == [[index, index * 10] for index in range(100)]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_query_with_spec(self, events, workers):
+        stats = QueryStats()
+        rows = query_jsonl(events, ["id"], {"type": "paid", ...: ...}, workers=workers, chunk_size=300, stats=stats)
+        assert list(rows) == [[index] for index in range(0, 100, 3)]
+        assert stats.lines == 100
+        assert stats.matched == 34
+        assert stats.bytes == events.stat().st_size
+        assert stats.seconds > 0
+        assert "34/100 lines matched" in str(stats)
+
+    def test_default(self, events):
+        rows = list(query_jsonl(events, ["id", "missing"], default=0, workers=1))
+        assert rows[:2] == [[0, 0], [1, 0]]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.jsonl"
+        path.write_bytes(b"")
+        assert list(query_jsonl(path, ["id"], workers=1)) == []
+
+    def test_no_trailing_newline(self, tmp_path):
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b'{"id": 1}\n{"id": 2}')
+        assert list(query_jsonl(path, ["id"], workers=1, chunk_size=1)) == [[1], [2]]
+
+    @pytest.mark.parametrize("stop", [None, 1])
+    def test_in_process_files_are_closed(self, events, stop):
+        mappings, _mmap = [], query._mmap
+        with mock.patch.object(query, "_mmap", side_effect=lambda f: mappings.append(_mmap(f)) or mappings[-1]):
+            rows = query_jsonl(events, ["id"], workers=1, chunk_size=256)
+            assert list(itertools.islice(rows, stop))
+            rows.close()
+        assert len(mappings) == 2
+        assert all(mapping.closed for mapping in mappings)
+        assert "files" not in query._worker
+
+
+class TestMain:
+    def test_main(self, events, capsys):
+        main([str(events), "id", "data.amount", "--match", '{"type": "paid"}', "--workers", "1"])
+        out, err = capsys.readouterr()
+        assert out.splitlines()[:2] == ["[0, 0]", "[3, 30]"]
+        assert "34/100 lines matched" in err
+
+    def test_partial_spec(self):
+        assert partial_spec({"a": {"b": 1}, "c": [{"d": 2}]}) == {
+            "a": {"b": 1, ...: ...},
+            "c": [{"d": 2, ...: ...}],
+            ...: ...,
+        }